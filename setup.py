@@ -10,7 +10,7 @@ with open(join(__TOP_LEVEL_DIR, 'requirement.txt')) as f:
 setup(
     name='streamAPI',
     version='1.6',
-    packages=('streamAPI', 'streamAPI.stream', 'streamAPI.utility'),
+    packages=('streamAPI', 'streamAPI.stream', 'streamAPI.utility', 'streamAPI.worker'),
     url='https://github.com/ShivKJ/Basics',
     license='MIT License',
     author='Shiv',
@@ -18,6 +18,7 @@ setup(
     description='basics utility and stream processing functionality',
     long_description='basics utility and stream processing functionality',
     install_requires=dependencies,
+    extras_require={'numpy': ['numpy']},
     python_requires='>=3.6',
     platforms='ubuntu',
     classifiers=(
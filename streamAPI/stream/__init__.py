@@ -1,13 +1,47 @@
 from streamAPI.stream import decos
-from streamAPI.stream.exception import PipelineClosed
+from streamAPI.stream.aggregator import *
+from streamAPI.stream.asyncStream import *
+from streamAPI.stream.auto import *
+from streamAPI.stream.batchStream import *
+from streamAPI.stream.broadcast import *
+from streamAPI.stream.cancel import *
+from streamAPI.stream.columnarStream import *
+from streamAPI.stream.context import *
+from streamAPI.stream.exception import Cancelled, PipelineClosed
+from streamAPI.stream.dispatch import *
+from streamAPI.stream.fusion import fuse
 from streamAPI.stream.optional import EMPTY, Optional
 from streamAPI.stream.parallelStream import *
+from streamAPI.stream.partition import *
+from streamAPI.stream.pool import *
+from streamAPI.stream.remote import *
 from streamAPI.stream.stream import *
+from streamAPI.stream.speculation import *
 from streamAPI.stream.streamHelper import *
+from streamAPI.stream.transport import *
 
+del aggregator
+del asyncStream
+del auto
+del batchStream
+del broadcast
+del cancel
+del columnarStream
+del combiner
+del context
 del decos
+del dispatch
 del exception
+del fusion
+del join
 del optional
 del parallelStream
+del partition
+del plan
+del pool
+del remote
+del speculation
+del spill
 del stream
 del streamHelper
+del transport
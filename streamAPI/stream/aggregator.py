@@ -0,0 +1,273 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Generic, Union
+
+from streamAPI.utility.Types import BiFunction, Function, T, X, Y
+from streamAPI.utility.utils import get_functions_clazz, identity
+
+NIL = object()
+
+
+class Aggregator(ABC, Generic[X, T, Y]):
+    """
+    Incremental aggregation used by Stream.aggregate_by. Only a state
+    per group is kept in memory, instead of every element of group.
+
+    Aggregation is defined by:
+        init   : creates state for new group.
+        update : updates state by value of an element.
+        merge  : merges states of two parts of a group (used for parallel aggregation).
+        result : converts state to output.
+
+    "value" maps element to value to be aggregated.
+
+    Example:
+        Stream(range(10)).aggregate_by(lambda x: x % 2, n=Count(), total=Sum(), avg=Mean(lambda x: x ** 2))
+        -> {0: {'n': 5, 'total': 20, 'avg': 24.0}, 1: {'n': 5, 'total': 25, 'avg': 33.0}}
+    """
+
+    def __init__(self, value: Function[X, Any] = identity):
+        self.value = value
+
+    @abstractmethod
+    def init(self) -> T:
+        pass
+
+    @abstractmethod
+    def update(self, state: T, v) -> T:
+        pass
+
+    @abstractmethod
+    def merge(self, a: T, b: T) -> T:
+        pass
+
+    def result(self, state: T) -> Y:
+        return state
+
+    @property
+    def mergeable(self) -> bool:
+        """
+        True if states can be merged, i.e. aggregation can be done in parallel.
+        """
+
+        return True
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, getattr(self.value, '__name__', self.value))
+
+
+class Count(Aggregator[X, int, int]):
+    """
+    counts elements of group.
+    """
+
+    def init(self) -> int:
+        return 0
+
+    def update(self, state: int, v) -> int:
+        return state + 1
+
+    def merge(self, a: int, b: int) -> int:
+        return a + b
+
+
+class Sum(Aggregator):
+    """
+    sums values of group.
+    """
+
+    def init(self):
+        return 0
+
+    def update(self, state, v):
+        return state + v
+
+    def merge(self, a, b):
+        return a + b
+
+
+class Mean(Aggregator):
+    """
+    finds mean of values of group. State is list of sum and count.
+    """
+
+    def init(self) -> list:
+        return [0, 0]
+
+    def update(self, state: list, v) -> list:
+        state[0] += v
+        state[1] += 1
+        return state
+
+    def merge(self, a: list, b: list) -> list:
+        return [a[0] + b[0], a[1] + b[1]]
+
+    def result(self, state: list):
+        return state[0] / state[1]
+
+
+class Min(Aggregator):
+    """
+    finds minimum of values of group.
+    """
+
+    def init(self):
+        return NIL
+
+    def update(self, state, v):
+        return v if state is NIL or v < state else state
+
+    def merge(self, a, b):
+        if a is NIL:
+            return b
+
+        return a if b is NIL else self.update(a, b)
+
+
+class Max(Aggregator):
+    """
+    finds maximum of values of group.
+    """
+
+    def init(self):
+        return NIL
+
+    def update(self, state, v):
+        return v if state is NIL or state < v else state
+
+    def merge(self, a, b):
+        if a is NIL:
+            return b
+
+        return a if b is NIL else self.update(a, b)
+
+
+class First(Aggregator):
+    """
+    keeps value of first element of group.
+    """
+
+    def init(self):
+        return NIL
+
+    def update(self, state, v):
+        return v if state is NIL else state
+
+    def merge(self, a, b):
+        return b if a is NIL else a
+
+
+class Last(Aggregator):
+    """
+    keeps value of last element of group.
+    """
+
+    def init(self):
+        return NIL
+
+    def update(self, state, v):
+        return v
+
+    def merge(self, a, b):
+        return a if b is NIL else b
+
+
+class Custom(Aggregator):
+    """
+    user defined aggregation. Without "merge", it can not be
+    used for parallel aggregation (aggregate_by_concurrent and
+    PartitionedStream.aggregate_by).
+
+    Example: (collecting distinct values of a group)
+        Custom(init=set, update=lambda s, v: s | {v}, merge=set.union, result=sorted)
+    """
+
+    def __init__(self, init: Callable[[], T], update: BiFunction[T, Any, T],
+                 merge: BiFunction[T, T, T] = None, result: Function[T, Y] = identity,
+                 value: Function[X, Any] = identity):
+        super().__init__(value)
+
+        self._init = init
+        self._update = update
+        self._merge = merge
+        self._result = result
+
+    def init(self) -> T:
+        return self._init()
+
+    def update(self, state: T, v) -> T:
+        return self._update(state, v)
+
+    def merge(self, a: T, b: T) -> T:
+        if self._merge is None:
+            raise NotImplementedError('merge function has not been given.')
+
+        return self._merge(a, b)
+
+    def result(self, state: T) -> Y:
+        return self._result(state)
+
+    @property
+    def mergeable(self) -> bool:
+        return self._merge is not None
+
+
+BUILTIN = dict(count=Count, sum=Sum, mean=Mean, min=Min, max=Max, first=First, last=Last)
+
+
+def as_aggregator(agg: Union[str, Aggregator]) -> Aggregator:
+    """
+    converts name of builtin aggregation (count, sum, mean, min, max, first, last)
+    to Aggregator. Aggregator is returned as it is.
+
+    :param agg:
+    :return:
+    """
+
+    if isinstance(agg, Aggregator):
+        return agg
+
+    if agg not in BUILTIN:
+        raise ValueError('unknown aggregation: {}'.format(agg))
+
+    return BUILTIN[agg]()
+
+
+def merge_groups(a: Dict[Any, list], b: Dict[Any, list], aggs: Dict[str, Aggregator]) -> Dict[Any, list]:
+    """
+    merges states of groups "b" into "a". States of a group are in
+    same order as "aggs".
+
+    :param a:
+    :param b:
+    :param aggs:
+    :return: a
+    """
+
+    aggs = tuple(aggs.values())
+
+    for k, states in b.items():
+        if k in a:
+            a[k] = [agg.merge(x, y) for agg, x, y in zip(aggs, a[k], states)]
+        else:
+            a[k] = states
+
+    return a
+
+
+def group_results(groups: Dict[Any, list], aggs: Dict[str, Aggregator]) -> Dict[Any, Dict[str, Any]]:
+    """
+    converts states of groups to output of aggregations.
+
+    :param groups:
+    :param aggs:
+    :return:
+    """
+
+    items = tuple(aggs.items())
+
+    return {k: {name: agg.result(state) for (name, agg), state in zip(items, states)}
+            for k, states in groups.items()}
+
+
+if __name__ == 'streamAPI.stream.aggregator':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,740 @@
+from asyncio import CancelledError, FIRST_COMPLETED, ensure_future, wait
+from functools import partial, wraps
+from inspect import isawaitable
+from operator import gt, lt
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Generic, Iterable, Sequence, Union
+
+from streamAPI.stream.decos import check_pipeline, close_pipeline
+from streamAPI.stream.optional import EMPTY, Optional
+from streamAPI.stream.stream import NIL, Stream
+from streamAPI.stream.streamHelper import Closable, GroupByValueType, ListType
+from streamAPI.utility.Types import BiFunction, Consumer, Filter, Function, X, Y
+from streamAPI.utility.utils import get_functions_clazz, identity
+
+try:
+    from asyncio import get_running_loop
+except ImportError:  # python < 3.7; called only from coroutines, so event loop is running.
+    from asyncio import get_event_loop as get_running_loop
+
+CONCURRENCY = 64
+REORDER_FACTOR = 16  # size of reorder buffer relative to number of coroutines in flight.
+
+
+async def _resolve(v):
+    """
+    awaits "v" if it is awaitable, so that functions given to
+    AsyncStream can be either plain functions or coroutine functions.
+    """
+
+    return (await v) if isawaitable(v) else v
+
+
+async def _aclose(itr):
+    aclose = getattr(itr, 'aclose', None)
+
+    if aclose is not None:
+        await aclose()
+
+
+async def _next(itr: AsyncIterator[X]):
+    try:
+        return await itr.__anext__()
+    except StopAsyncIteration:
+        return NIL
+
+
+def _stage(func):
+    """
+    decorator for async generator function taking upstream iterator as first
+    argument; upstream iterator is closed along with generator, so that early
+    exit (for example limit or find_first) cancels pending work of upstream.
+    """
+
+    @wraps(func)
+    async def f(itr, *args):
+        gen = func(itr, *args)
+
+        try:
+            async for e in gen:
+                yield e
+        finally:
+            await gen.aclose()
+            await _aclose(itr)
+
+    return f
+
+
+def _closing(terminal):
+    """
+    decorator for terminal operations, closing pipeline iterator
+    once terminal operation is done.
+    """
+
+    @wraps(terminal)
+    async def f(self: 'AsyncStream', *args, **kwargs):
+        try:
+            return await terminal(self, *args, **kwargs)
+        finally:
+            await _aclose(self._pointer)
+
+    return f
+
+
+async def _from_iterable(itr: Iterable[X]) -> AsyncIterator[X]:
+    for e in itr:
+        yield e
+
+
+@_stage
+async def _map(itr, func):
+    async for e in itr:
+        yield await _resolve(func(e))
+
+
+@_stage
+async def _filter(itr, predicate):
+    async for e in itr:
+        if await _resolve(predicate(e)):
+            yield e
+
+
+@_stage
+async def _peek(itr, consumer):
+    async for e in itr:
+        await _resolve(consumer(e))
+        yield e
+
+
+@_stage
+async def _limit(itr, n):
+    if n <= 0:
+        return
+
+    async for e in itr:
+        yield e
+        n -= 1
+
+        if n == 0:
+            return
+
+
+@_stage
+async def _skip(itr, n):
+    async for e in itr:
+        if n > 0:
+            n -= 1
+        else:
+            yield e
+
+
+@_stage
+async def _take_while(itr, predicate):
+    async for e in itr:
+        if not await _resolve(predicate(e)):
+            return
+
+        yield e
+
+
+@_stage
+async def _drop_while(itr, predicate):
+    dropping = True
+
+    async for e in itr:
+        if dropping and await _resolve(predicate(e)):
+            continue
+
+        dropping = False
+        yield e
+
+
+@_stage
+async def _flat_map(itr):
+    async for e in itr:
+        if hasattr(e, '__aiter__'):
+            async for x in e:
+                yield x
+        else:
+            for x in e:
+                yield x
+
+
+@_stage
+async def _enumerate(itr, start):
+    async for e in itr:
+        yield start, e
+        start += 1
+
+
+@_stage
+async def _distinct(itr):
+    seen = set()
+
+    async for e in itr:
+        if e not in seen:
+            seen.add(e)
+            yield e
+
+
+@_stage
+async def _batch(itr, n, timeout):
+    """
+    yields batch once it has "n" elements or "timeout" seconds have
+    passed since first element of batch was received.
+    """
+
+    loop = get_running_loop()
+    batch, pending, deadline = [], None, None
+
+    try:
+        while True:
+            if pending is None:
+                pending = ensure_future(_next(itr))
+
+            if batch and timeout is not None:
+                done, _ = await wait((pending,), timeout=max(deadline - loop.time(), 0))
+
+                if not done:  # element is kept pending for next batch.
+                    yield batch
+                    batch = []
+                    continue
+
+            e = await pending
+            pending = None
+
+            if e is NIL:
+                break
+
+            if not batch and timeout is not None:
+                deadline = loop.time() + timeout
+
+            batch.append(e)
+
+            if len(batch) == n:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+    finally:
+        if pending is not None:  # upstream can be closed only after pending read is done.
+            pending.cancel()
+
+            try:
+                await pending
+            except CancelledError:
+                pass
+
+
+@_stage
+async def _map_async(itr, coro_fn, concurrency, ordered):
+    """
+    runs "coro_fn" on elements keeping at most "concurrency" coroutines in flight.
+    Reading of next element of upstream races with coroutines in flight, so that
+    results are yielded as soon as they are done even if upstream is slow.
+    """
+
+    in_flight = {}  # task -> sequence number of element
+    finished = {}  # reorder buffer
+    seq = next_seq = 0
+    pending, exhausted = None, False  # read of next element of upstream
+    buffer_size = REORDER_FACTOR * concurrency
+
+    try:
+        while True:
+            if next_seq in finished:
+                yield finished.pop(next_seq).result()
+                next_seq += 1
+                continue
+
+            if pending is None and not exhausted and len(in_flight) < concurrency and len(finished) < buffer_size:
+                pending = ensure_future(_next(itr))
+
+            if pending is None and not in_flight:
+                return
+
+            done, _ = await wait((*in_flight, pending) if pending is not None else in_flight,
+                                 return_when=FIRST_COMPLETED)
+
+            if pending in done:
+                done.discard(pending)
+                e = pending.result()
+                pending = None
+
+                if e is NIL:
+                    exhausted = True
+                else:
+                    in_flight[ensure_future(coro_fn(e))] = seq
+                    seq += 1
+
+            for task in done:
+                s = in_flight.pop(task)
+
+                if ordered:
+                    finished[s] = task
+
+            if not ordered:
+                for task in done:
+                    yield task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+        if pending is not None:  # upstream can be closed only after pending read is done.
+            pending.cancel()
+
+            try:
+                await pending
+            except CancelledError:
+                pass
+
+
+async def _checked(predicate, e):
+    return await _resolve(predicate(e)), e
+
+
+class AsyncStream(Closable, Generic[X]):
+    """
+    asyncio native Stream. Source can be an async iterable or a plain iterable,
+    functions can be plain functions or coroutine functions, and terminal
+    operations are awaitable. Like Stream, intermediate operations are lazy.
+
+    I/O bound work can be done concurrently by "map_async" in a single thread,
+    keeping thousands of coroutines in flight.
+
+    Example:
+        async def enrich(user):
+            async with session.get(URL.format(user['id'])) as r:
+                return dict(user, profile=await r.json())
+
+        await (AsyncStream(users)
+               .map_async(enrich, concurrency=1000)
+               .filter(lambda u: u['profile']['active'])
+               .batch(100, timeout=0.5)
+               .for_each(save_batch))
+    """
+
+    def __init__(self, data: Union[AsyncIterable[X], Iterable[X]]):
+        """
+        :param data: async iterable or iterable; note that plain iterable
+                     is iterated in event loop, so it should not block.
+        """
+
+        super().__init__()
+
+        if hasattr(data, '__aiter__'):
+            self._pointer: AsyncIterator[X] = data.__aiter__()
+        else:
+            self._pointer: AsyncIterator[X] = _from_iterable(data)
+
+    @check_pipeline
+    def map(self, func: Function[X, Y]) -> 'AsyncStream[Y]':
+        """
+        maps elements one at a time; "func" can be a coroutine function.
+
+        :param func:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _map(self._pointer, func)
+        return self
+
+    @check_pipeline
+    def map_async(self, coro_fn: Callable[[X], Any], concurrency: int = CONCURRENCY,
+                  ordered: bool = True) -> 'AsyncStream[Y]':
+        """
+        maps elements concurrently using coroutine function "coro_fn", keeping
+        at most "concurrency" coroutines in flight; a new one is started as soon
+        as one of them is done.
+
+        If "ordered" is True, mapped elements are in order of stream elements (results
+        completed ahead of a slow coroutine are buffered, up to REORDER_FACTOR * concurrency),
+        otherwise in order of completion.
+
+        Example:
+            async def fetch(x):
+                await asyncio.sleep(random())
+                return x * 2
+
+            await AsyncStream(range(5)).map_async(fetch, concurrency=3).as_seq() -> [0, 2, 4, 6, 8]
+
+        :param coro_fn:
+        :param concurrency:
+        :param ordered:
+        :return: AsyncStream itself
+        """
+
+        assert concurrency > 0, 'concurrency must be positive'
+
+        self._pointer = _map_async(self._pointer, coro_fn, concurrency, ordered)
+        return self
+
+    @check_pipeline
+    def filter(self, predicate: Filter[X]) -> 'AsyncStream[X]':
+        """
+        filters elements one at a time; "predicate" can be a coroutine function.
+
+        :param predicate:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _filter(self._pointer, predicate)
+        return self
+
+    @check_pipeline
+    def filter_async(self, predicate: Callable[[X], Any], concurrency: int = CONCURRENCY,
+                     ordered: bool = True) -> 'AsyncStream[X]':
+        """
+        filters elements concurrently using coroutine function "predicate";
+        see "map_async".
+
+        :param predicate:
+        :param concurrency:
+        :param ordered:
+        :return: AsyncStream itself
+        """
+
+        return (self.map_async(partial(_checked, predicate), concurrency, ordered)
+                .filter(lambda checked: checked[0])
+                .map(lambda checked: checked[1]))
+
+    @check_pipeline
+    def peek(self, consumer: Consumer[X]) -> 'AsyncStream[X]':
+        """
+        consumes each element and passes it on; "consumer" can be a coroutine function.
+
+        :param consumer:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _peek(self._pointer, consumer)
+        return self
+
+    @check_pipeline
+    def limit(self, n: int) -> 'AsyncStream[X]':
+        """
+        keeps first "n" elements; pending work of upstream (for example
+        coroutines of map_async) is cancelled once "n" elements are produced.
+
+        :param n:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _limit(self._pointer, n)
+        return self
+
+    @check_pipeline
+    def skip(self, n: int) -> 'AsyncStream[X]':
+        """
+        skips first "n" elements.
+
+        :param n:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _skip(self._pointer, n)
+        return self
+
+    @check_pipeline
+    def take_while(self, predicate: Filter[X]) -> 'AsyncStream[X]':
+        """
+        keeps elements till "predicate" is True.
+
+        :param predicate:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _take_while(self._pointer, predicate)
+        return self
+
+    @check_pipeline
+    def drop_while(self, predicate: Filter[X]) -> 'AsyncStream[X]':
+        """
+        drops elements till "predicate" is True.
+
+        :param predicate:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _drop_while(self._pointer, predicate)
+        return self
+
+    @check_pipeline
+    def flat_map(self) -> 'AsyncStream[X]':
+        """
+        flattens stream if each element is iterable or async iterable.
+
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _flat_map(self._pointer)
+        return self
+
+    @check_pipeline
+    def enumerate(self, start: int = 0) -> 'AsyncStream[tuple]':
+        """
+        pairs each element with its index.
+
+        :param start:
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _enumerate(self._pointer, start)
+        return self
+
+    @check_pipeline
+    def distinct(self) -> 'AsyncStream[X]':
+        """
+        keeps first occurrence of each element; elements must be hashable.
+
+        :return: AsyncStream itself
+        """
+
+        self._pointer = _distinct(self._pointer)
+        return self
+
+    @check_pipeline
+    def batch(self, n: int, timeout: float = None) -> 'AsyncStream[list]':
+        """
+        creates batches of at most "n" elements. If "timeout" is given, a batch
+        is produced once "timeout" seconds have passed since its first element
+        was received, even if it has less than "n" elements; so that slow
+        sources do not hold elements back indefinitely.
+
+        Example:
+            await AsyncStream(range(5)).batch(2).as_seq() -> [[0, 1], [2, 3], [4]]
+
+        :param n:
+        :param timeout:
+        :return: AsyncStream itself
+        """
+
+        assert n > 0, 'batch size must be positive'
+
+        self._pointer = _batch(self._pointer, n, timeout)
+        return self
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def as_seq(self, seq_clazz: Callable[[Iterable[X]], Y] = list, **kwargs) -> Y:
+        """
+        This operation is one of the terminal operations
+        returns elements as sequence, for example as list.
+
+        Example:
+            await AsyncStream(range(5)).as_seq() -> [0, 1, 2, 3, 4]
+
+        :param seq_clazz:
+        :param kwargs:
+        :return:
+        """
+
+        return seq_clazz([e async for e in self._pointer], **kwargs)
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def count(self) -> int:
+        """
+        This operation is one of the terminal operations
+
+        :return: number of elements
+        """
+
+        n = 0
+
+        async for _ in self._pointer:
+            n += 1
+
+        return n
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def for_each(self, consumer: Consumer[X]):
+        """
+        This operation is one of the terminal operations
+        consumes each element; "consumer" can be a coroutine function.
+
+        :param consumer:
+        """
+
+        async for e in self._pointer:
+            await _resolve(consumer(e))
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def done(self):
+        """
+        This operation is one of the terminal operations.
+        consumes all elements.
+        """
+
+        async for _ in self._pointer:
+            pass
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def reduce(self, bi_func: BiFunction[X, X, Y], initial_point: X = NIL) -> Optional[Y]:
+        """
+        This operation is one of the terminal operations
+        reduces elements like Stream.reduce.
+
+        :param bi_func:
+        :param initial_point:
+        :return: EMPTY if there are no elements and "initial_point" is not given.
+        """
+
+        out = initial_point
+
+        async for e in self._pointer:
+            out = e if out is NIL else bi_func(out, e)
+
+        return EMPTY if out is NIL else Optional(out)
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def min(self, comp=None) -> Optional[X]:
+        """
+        This operation is one of the terminal operations
+        finds minimum element.
+
+        :param comp:
+        :return:
+        """
+
+        return await self._select(comp, lt)
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def max(self, comp=None) -> Optional[X]:
+        """
+        This operation is one of the terminal operations
+        finds maximum element.
+
+        :param comp:
+        :return:
+        """
+
+        return await self._select(comp, gt)
+
+    async def _select(self, comp, better: BiFunction[Any, Any, bool]) -> Optional[X]:
+        """
+        finds first element whose key is "better" than keys of all others,
+        holding only current selection.
+
+        :param comp: key of element; if None then element itself.
+        :param better:
+        :return:
+        """
+
+        key = comp or identity
+        out = out_key = NIL
+
+        async for e in self._pointer:
+            k = key(e)
+
+            if out is NIL or better(k, out_key):
+                out, out_key = e, k
+
+        return EMPTY if out is NIL else Optional(out)
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def find_first(self) -> Optional[X]:
+        """
+        This operation is one of the terminal operations
+        finds first element; pending work of upstream is cancelled.
+
+        :return:
+        """
+
+        async for e in self._pointer:
+            return Optional(e)
+
+        return EMPTY
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def all(self, predicate: Filter[X] = identity) -> bool:
+        """
+        This operation is one of the terminal operations
+        returns True if all elements satisfy "predicate" (can be a coroutine
+        function); stops at first element not satisfying it.
+
+        :param predicate:
+        :return:
+        """
+
+        async for e in self._pointer:
+            if not await _resolve(predicate(e)):
+                return False
+
+        return True
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def any(self, predicate: Filter[X] = identity) -> bool:
+        """
+        This operation is one of the terminal operations
+        returns True if any element satisfies "predicate" (can be a coroutine
+        function); stops at first element satisfying it.
+
+        :param predicate:
+        :return:
+        """
+
+        async for e in self._pointer:
+            if await _resolve(predicate(e)):
+                return True
+
+        return False
+
+    @close_pipeline
+    @check_pipeline
+    @_closing
+    async def group_by(self, key_hasher, value_mapper: Function[X, Y] = identity,
+                       value_container_clazz: GroupByValueType = ListType) -> Dict[Any, Sequence[Y]]:
+        """
+        This operation is one of the terminal operations
+        groups elements like Stream.group_by.
+
+        :param key_hasher:
+        :param value_mapper:
+        :param value_container_clazz:
+        :return:
+        """
+
+        out = {}
+
+        async for e in self._pointer:
+            Stream._update(out, key_hasher(e), value_mapper(e), value_container_clazz)
+
+        return out
+
+    @close_pipeline
+    @check_pipeline
+    def __aiter__(self) -> AsyncIterator[X]:
+        """
+        This operation is one of the terminal operations
+
+        Example:
+            async for x in AsyncStream(range(5)).map_async(fetch):
+                print(x)
+
+        :return: async iterator of elements.
+        """
+
+        return self._pointer
+
+
+if __name__ == 'streamAPI.stream.asyncStream':
+    __all__ = get_functions_clazz(__name__, __file__)
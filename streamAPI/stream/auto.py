@@ -0,0 +1,264 @@
+import os
+from itertools import islice
+from math import ceil
+from pickle import HIGHEST_PROTOCOL, dumps
+from time import perf_counter
+from typing import Iterable, List, NamedTuple, Sequence, Tuple
+
+from streamAPI.utility.Types import Consumer, Function, T, X
+from streamAPI.utility.utils import get_functions_clazz
+
+try:
+    from time import thread_time as _cpu_time
+except ImportError:  # python < 3.7
+    from time import process_time as _cpu_time
+
+SERIAL, THREADS, PROCESSES = 'serial', 'threads', 'processes'
+
+SAMPLE_SIZE = 32  # number of elements profiled
+THREAD_OVERHEAD = 50e-6  # seconds spent per job submitted to a thread pool
+PROCESS_OVERHEAD = 200e-6  # seconds spent per job submitted to a process pool
+PICKLE_RATE = 200e6  # bytes per second pickled, sent and unpickled by parent
+MAX_THREADS = 64
+MAX_BATCH = 1024
+MAX_OVERHEAD = 0.05  # fraction of time of a job which can be spent on dispatching it
+MIN_GAIN = 0.8  # parallel mode is chosen only if it takes at most this fraction of time
+
+CGROUP = '/sys/fs/cgroup'
+
+
+class Profile(NamedTuple):
+    """
+    Cost of a function per element, measured on a sample.
+    """
+
+    wall: float  # seconds
+    cpu: float  # seconds of cpu time of calling thread
+    in_size: float  # bytes of pickled input; None if input can not be pickled
+    out_size: float  # bytes of pickled output; None if output can not be pickled
+    samples: int
+    func_size: int = 0  # bytes of pickled function; None if function can not be pickled
+
+    @property
+    def picklable(self) -> bool:
+        """
+        True if function, its input and output can be sent to process workers.
+        """
+
+        return self.in_size is not None and self.out_size is not None and self.func_size is not None
+
+
+class Plan(NamedTuple):
+    """
+    Execution mode chosen for a function (see choose_plan).
+    """
+
+    mode: str  # serial, threads or processes
+    worker: int
+    batch_size: int
+    profile: Profile
+
+
+def cpu_count(cgroup: str = CGROUP) -> int:
+    """
+    number of cpu available to process, considering cpu affinity and cpu quota
+    of cgroup (v2 "cpu.max" or v1 "cpu.cfs_quota_us"), as set by containers.
+
+    :param cgroup: mount point of cgroup file system
+    :return:
+    """
+
+    try:
+        n = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on all platforms
+        n = os.cpu_count() or 1
+
+    quota = _cpu_quota(cgroup)
+
+    if quota is not None:
+        n = min(n, max(ceil(quota), 1))
+
+    return n
+
+
+def _cpu_quota(cgroup: str) -> float:
+    """
+    :return: cpu quota in number of cpu; None if there is no quota.
+    """
+
+    def read(*path) -> str:
+        try:
+            with open(os.path.join(cgroup, *path)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    v2 = read('cpu.max')
+
+    if v2 is not None:
+        quota, _, period = v2.partition(' ')
+        return None if quota == 'max' else int(quota) / int(period or 100000)
+
+    quota, period = read('cpu', 'cpu.cfs_quota_us'), read('cpu', 'cpu.cfs_period_us')
+
+    if quota is None or period is None or int(quota) <= 0:
+        return None
+
+    return int(quota) / int(period)
+
+
+def _pickled_size(obj) -> int:
+    try:
+        return len(dumps(obj, protocol=HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+
+def profile(func: Function[T, X], sample: Sequence[T]) -> Tuple[Profile, List[X]]:
+    """
+    runs "func" on each element of "sample", measuring wall time, cpu time
+    (low cpu time relative to wall time indicates I/O or other work releasing
+    GIL) and size of pickled function, input and output.
+
+    :param func:
+    :param sample: non empty
+    :return: profile and outputs of "func" on "sample"
+    """
+
+    assert sample, 'sample can not be empty'
+
+    outputs = []
+    wall = cpu = 0
+    in_size = out_size = 0
+
+    for g in sample:
+        wall_start, cpu_start = perf_counter(), _cpu_time()
+        out = func(g)
+        wall += perf_counter() - wall_start
+        cpu += _cpu_time() - cpu_start
+
+        outputs.append(out)
+
+        if in_size is not None:
+            size = _pickled_size(g)
+            in_size = None if size is None else in_size + size
+
+        if out_size is not None:
+            size = _pickled_size(out)
+            out_size = None if size is None else out_size + size
+
+    n = len(sample)
+
+    return Profile(wall=wall / n, cpu=min(cpu, wall) / n,
+                   in_size=None if in_size is None else in_size / n,
+                   out_size=None if out_size is None else out_size / n,
+                   samples=n, func_size=_pickled_size(func)), outputs
+
+
+def _batch_size(wall: float, overhead: float) -> int:
+    """
+    :return: number of elements in a job, so that at most MAX_OVERHEAD
+             fraction of time of job is spent on dispatching it.
+    """
+
+    if wall <= 0:
+        return MAX_BATCH
+
+    return min(max(ceil(overhead / (MAX_OVERHEAD * wall)), 1), MAX_BATCH)
+
+
+def choose_plan(prof: Profile, cpus: int = None) -> Plan:
+    """
+    estimates time per element of running serially, in a thread pool (where
+    only part of time not holding GIL runs in parallel) and in a process pool
+    (where parent pickles input and output of each element), and chooses the
+    fastest; parallel mode is chosen only if it is estimated to be faster by
+    a margin.
+
+    Example:
+        choose_plan(Profile(wall=0.01, cpu=0.0001, in_size=50, out_size=2000, samples=32), cpus=4)
+        -> Plan(mode='threads', worker=64, batch_size=1, ...)
+
+    :param prof:
+    :param cpus: number of cpu; if None then cpu_count() is used.
+    :return:
+    """
+
+    cpus = cpus or cpu_count()
+    wall, cpu = prof.wall, prof.cpu
+
+    best = Plan(SERIAL, 1, 1, prof), wall
+
+    threads = MAX_THREADS if cpu * MAX_THREADS <= wall else max(ceil(wall / cpu), 2)
+    threads = min(threads, MAX_THREADS)
+    batch = _batch_size(wall, THREAD_OVERHEAD)
+    cost = max(cpu, wall / threads) + THREAD_OVERHEAD / batch
+
+    if cost < best[1] * MIN_GAIN:
+        best = Plan(THREADS, threads, batch, prof), cost
+
+    if prof.picklable and cpus > 1:
+        batch = _batch_size(wall, PROCESS_OVERHEAD)
+        parent = (prof.in_size + prof.out_size) / PICKLE_RATE + PROCESS_OVERHEAD / batch
+        cost = max(wall / cpus, parent)
+
+        if cost < best[1] * MIN_GAIN:
+            best = Plan(PROCESSES, cpus, batch, prof), cost
+
+    return best[0]
+
+
+def auto_parallel(itr: Iterable[T], func: Function[T, X], sample_size: int = SAMPLE_SIZE,
+                  worker: int = None, on_plan: Consumer[Plan] = None) -> Iterable[X]:
+    """
+    maps elements of "itr" by "func", choosing serial, thread pool or process
+    pool execution (and batch size) by profiling "func" on first "sample_size"
+    elements (see profile and choose_plan). Outputs of profiled elements are
+    reused, and outputs are in order of elements.
+
+    :param itr:
+    :param func:
+    :param sample_size:
+    :param worker: maximum number of worker; if None then it is decided by
+                   number of cpu (see cpu_count).
+    :param on_plan: called with chosen plan.
+    :return: generator of outputs
+    """
+
+    from streamAPI.stream.parallelStream import ParallelStream  # parallelStream depends on this module.
+
+    itr = iter(itr)
+    sample = list(islice(itr, sample_size))
+
+    if not sample:
+        return
+
+    prof, outputs = profile(func, sample)
+    plan = choose_plan(prof, min(cpu_count(), worker) if worker else None)
+
+    if plan.mode != SERIAL and worker:
+        plan = plan._replace(worker=min(plan.worker, worker))
+
+    if on_plan is not None:
+        on_plan(plan)
+
+    yield from outputs
+
+    if plan.mode == SERIAL:
+        yield from map(func, itr)
+        return
+
+    stream = ParallelStream(itr, worker=plan.worker, multiprocessing=plan.mode == PROCESSES)
+
+    try:
+        if plan.batch_size > 1:
+            yield from stream.batch_processor(func, plan.batch_size)
+        else:
+            yield from stream.map_concurrent(func)
+    finally:
+        stream.cancel()
+        stream.shutdown(wait=False)
+
+
+if __name__ == 'streamAPI.stream.auto':
+    __all__ = get_functions_clazz(__name__, __file__)
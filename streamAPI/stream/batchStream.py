@@ -0,0 +1,278 @@
+from itertools import chain
+from typing import Any, Dict, Iterable, Mapping, Sequence, Union
+
+from streamAPI.stream.decos import check_pipeline, close_pipeline
+from streamAPI.stream.optional import EMPTY, Optional
+from streamAPI.stream.stream import NIL, Stream
+from streamAPI.utility.Types import Function, X
+from streamAPI.utility.utils import divide_in_chunk, get_functions_clazz
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency.
+    np = None
+
+Batch = Union['np.ndarray', Dict[str, 'np.ndarray']]
+DType = Union[Any, Dict[str, Any]]
+
+
+def as_batch(chunk: Sequence[X], dtype: DType = None) -> Batch:
+    """
+    Converts chunk of elements to numpy array. If elements are
+    mappings (for example rows of csv_itr) then chunk is converted
+    to dictionary of column name to numpy array of column values.
+
+    Example:
+        as_batch((1, 2, 3)) -> array([1, 2, 3])
+        as_batch(({'a': 1, 'b': 2.0}, {'a': 3, 'b': 4.0}))
+        -> {'a': array([1, 3]), 'b': array([2., 4.])}
+
+    :param chunk:
+    :param dtype: dtype of array; in case of mappings, it can be a dictionary
+                  of column name to dtype.
+    :return:
+    """
+
+    if np is None:
+        raise ImportError('numpy is required for batch processing.')
+
+    if chunk and isinstance(chunk[0], Mapping):
+        return {col: np.asarray([row[col] for row in chunk],
+                                dtype=dtype.get(col) if isinstance(dtype, dict) else dtype)
+                for col in chunk[0]}
+
+    return np.asarray(chunk, dtype=dtype)
+
+
+def batch_len(batch: Batch) -> int:
+    """
+    number of rows in batch.
+
+    :param batch:
+    :return:
+    """
+
+    if isinstance(batch, dict):
+        return len(next(iter(batch.values()))) if batch else 0
+
+    return len(batch)
+
+
+class BatchStream(Stream[Batch]):
+    """
+    Stream whose elements are batches of data points, each batch being a numpy
+    array or a dictionary of column name to numpy array. Functions are applied
+    on whole batches, so that vectorized numpy operations can be used.
+
+    BatchStream is usually created using Stream.map_batches.
+
+    Example:
+        from numpy import sqrt
+
+        Stream(range(10)).map_batches(sqrt, 4).sum() -> 19.306...
+
+        Stream(range(10)).map_batches(lambda a: a * 2, 4).map_batches(lambda a: a + 1).rows().as_seq()
+        -> [1, 3, 5, 7, 9, 11, 13, 15, 17, 19]
+
+        rows = [dict(x=1, y=2.0), dict(x=3, y=5.0), dict(x=5, y=8.0)]
+        Stream(rows).map_batches(lambda b: dict(b, z=b['x'] * b['y']), 2).mean()
+        -> Optional[{'x': 3.0, 'y': 5.0, 'z': 19.0}]
+    """
+
+    def __init__(self, data: Iterable[Batch]):
+        if np is None:
+            raise ImportError('numpy is required for BatchStream.')
+
+        super().__init__(data)
+
+    @classmethod
+    def from_elements(cls, data: Iterable[X], size: int, dtype: DType = None) -> 'BatchStream':
+        """
+        creates BatchStream by dividing "data" in chunks of size "size".
+
+        :param data:
+        :param size: number of elements in a batch.
+        :param dtype:
+        :return:
+        """
+
+        assert size > 0, 'batch size must be positive'
+
+        return cls(as_batch(chunk, dtype) for chunk in divide_in_chunk(data, size))
+
+    @check_pipeline
+    def map_batches(self, func: Function[Batch, Batch]) -> 'BatchStream':
+        """
+        maps each batch using vectorized function "func".
+        "func" may return batch of different length, for example
+        after applying a boolean mask.
+
+        :param func:
+        :return: BatchStream itself
+        """
+
+        return self.map(func)
+
+    @check_pipeline
+    def rows(self) -> Stream[X]:
+        """
+        flattens batches to Stream of python objects. Rows of batch
+        having columns are returned as dictionaries. Returned stream is
+        a plain Stream, so its operations work on rows.
+
+        :return:
+        """
+
+        return Stream(chain.from_iterable(map(BatchStream._rows, self._pointer)))
+
+    @staticmethod
+    def _rows(batch: Batch) -> Iterable:
+        if isinstance(batch, dict):
+            cols = list(batch)
+            return (dict(zip(cols, row)) for row in zip(*(batch[c].tolist() for c in cols)))
+
+        return batch.tolist()
+
+    def _reduce(self, batch_op, combine):
+        """
+        reduces each batch using "batch_op" and then combines
+        reduced batches using "combine".
+
+        :param batch_op: numpy reduction, applied along first axis.
+        :param combine: numpy element-wise binary function
+        :return: NIL if there are no rows.
+        """
+
+        out = NIL
+
+        for batch in self._pointer:
+            if batch_len(batch) == 0:
+                continue
+
+            if isinstance(batch, dict):
+                part = {col: batch_op(values, axis=0) for col, values in batch.items()}
+            else:
+                part = batch_op(batch, axis=0)
+
+            if out is NIL:
+                out = part
+            elif isinstance(part, dict):
+                out = {col: combine(out[col], value) for col, value in part.items()}
+            else:
+                out = combine(out, part)
+
+        return out
+
+    @close_pipeline
+    @check_pipeline
+    def sum(self):
+        """
+        This operation is one of the terminal operations
+        sums rows of all batches. In case of batches having columns,
+        dictionary of column name to sum is returned.
+
+        Example:
+            Stream(range(10)).map_batches(lambda a: a ** 2, 3).sum() -> 285
+
+        :return: 0 if there are no rows.
+        """
+
+        out = self._reduce(np.sum, np.add)
+
+        return 0 if out is NIL else out
+
+    @close_pipeline
+    @check_pipeline
+    def mean(self) -> Optional[Any]:
+        """
+        This operation is one of the terminal operations
+        finds mean of rows of all batches.
+
+        Example:
+            Stream(range(10)).map_batches(lambda a: a ** 2, 3).mean() -> Optional[28.5]
+
+        :return: EMPTY if there are no rows.
+        """
+
+        total, count = NIL, 0
+
+        for batch in self._pointer:
+            n = batch_len(batch)
+
+            if n == 0:
+                continue
+
+            if isinstance(batch, dict):
+                part = {col: np.sum(values, axis=0) for col, values in batch.items()}
+                total = part if total is NIL else {col: total[col] + v for col, v in part.items()}
+            else:
+                part = np.sum(batch, axis=0)
+                total = part if total is NIL else total + part
+
+            count += n
+
+        if total is NIL:
+            return EMPTY
+
+        if isinstance(total, dict):
+            return Optional({col: v / count for col, v in total.items()})
+
+        return Optional(total / count)
+
+    @close_pipeline
+    @check_pipeline
+    def min(self, comp=None) -> Optional[Any]:
+        """
+        This operation is one of the terminal operations
+        finds minimum of rows of all batches. In case of batches having
+        columns, minimum of each column is found.
+
+        If "comp" is given, minimum row by "comp" is found, as Stream.min does.
+
+        Example:
+            Stream([3, 1, 5, 4]).map_batches(lambda a: -a, 3).min() -> Optional[-5]
+
+        :param comp:
+        :return: EMPTY if there are no rows.
+        """
+
+        if comp is not None:
+            try:
+                return Optional(min(chain.from_iterable(map(BatchStream._rows, self._pointer)), key=comp))
+            except ValueError:
+                return EMPTY
+
+        out = self._reduce(np.min, np.minimum)
+
+        return EMPTY if out is NIL else Optional(out)
+
+    @close_pipeline
+    @check_pipeline
+    def max(self, comp=None) -> Optional[Any]:
+        """
+        This operation is one of the terminal operations
+        finds maximum of rows of all batches. In case of batches having
+        columns, maximum of each column is found.
+
+        If "comp" is given, maximum row by "comp" is found, as Stream.max does.
+
+        Example:
+            Stream([3, 1, 5, 4]).map_batches(lambda a: -a, 3).max() -> Optional[-1]
+
+        :param comp:
+        :return: EMPTY if there are no rows.
+        """
+
+        if comp is not None:
+            try:
+                return Optional(max(chain.from_iterable(map(BatchStream._rows, self._pointer)), key=comp))
+            except ValueError:
+                return EMPTY
+
+        out = self._reduce(np.max, np.maximum)
+
+        return EMPTY if out is NIL else Optional(out)
+
+
+if __name__ == 'streamAPI.stream.batchStream':
+    __all__ = get_functions_clazz(__name__, __file__)
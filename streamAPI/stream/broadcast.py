@@ -0,0 +1,160 @@
+import os
+from collections import OrderedDict
+from pickle import HIGHEST_PROTOCOL, dump, load
+from tempfile import mkstemp
+from threading import Lock
+from typing import Any, Dict, Generic, Tuple
+from uuid import uuid4
+from weakref import finalize
+
+from streamAPI.utility.Types import X
+from streamAPI.utility.utils import get_functions_clazz
+
+SHM_DIR = '/dev/shm'  # memory backed file system, if available.
+CACHED = 16  # number of broadcast objects kept by a worker process.
+
+_cache: Dict[str, Any] = {}  # key of broadcast -> value, in process having created it.
+_loaded: Dict[str, Tuple[str, Any]] = OrderedDict()  # key -> (path, value), in worker process.
+_lock = Lock()
+
+
+def _remove(key: str, path: str):
+    _cache.pop(key, None)
+
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+
+def _evict():
+    """
+    drops objects, loaded by worker process, of destroyed broadcasts (whose
+    file has been removed) and least recently used ones beyond CACHED.
+    """
+
+    for key in [key for key, (path, _) in _loaded.items() if not os.path.exists(path)]:
+        del _loaded[key]
+
+    while len(_loaded) > CACHED:
+        _loaded.popitem(last=False)
+
+
+class Broadcast(Generic[X]):
+    """
+    Handle to an object which is sent to each worker once, instead of
+    with every job. Handle pickles as a key and a path only; on first access
+    of "value" in a worker, object is loaded from the file (written once, in
+    memory backed /dev/shm if available) and is cached in worker. Workers
+    forked after creation of handle inherit object (copy on write) and do
+    not load it at all.
+
+    A worker keeps at most CACHED objects, dropping least recently used ones;
+    objects of destroyed handles are dropped by worker on its next load.
+
+    Example:
+        def lookup(table: Broadcast, key):
+            return table.value.get(key)
+
+        stream = ParallelStream(keys, worker=8)
+        table = stream.broadcast(big_dict)
+        stream.map_concurrent(partial(lookup, table)).as_seq()
+
+    File is removed by "destroy", when handle is garbage collected in parent,
+    or when stream having created the handle is done.
+    """
+
+    def __init__(self, obj: X):
+        self._key = uuid4().hex
+        self._path = None
+        self._owner = True  # handle of parent process
+        self._pid = os.getpid()  # process having created handle
+        self._lock = Lock()
+
+        _cache[self._key] = obj
+        self._finalizer = finalize(self, _remove, self._key, None)
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def value(self) -> X:
+        key = self._key
+
+        if self._owner or self._pid == os.getpid():
+            try:
+                return _cache[key]
+            except KeyError:
+                raise RuntimeError('broadcast has been destroyed.') from None
+
+        with _lock:
+            entry = _loaded.get(key)
+
+            if entry is not None:
+                _loaded.move_to_end(key)
+                return entry[1]
+
+            try:
+                obj = _cache.pop(key)  # inherited by forked worker
+            except KeyError:
+                _evict()
+
+                try:
+                    with open(self._path, 'rb') as f:
+                        obj = load(f)
+                except FileNotFoundError:
+                    raise RuntimeError('broadcast has been destroyed.') from None
+
+            _loaded[key] = self._path, obj
+            _evict()
+
+            return obj
+
+    def _persist(self) -> str:
+        """
+        writes object to file, once.
+
+        :return: path of file
+        """
+
+        with self._lock:
+            if self._path is None:
+                fd, path = mkstemp(prefix='broadcast-', dir=SHM_DIR if os.path.isdir(SHM_DIR) else None)
+
+                with os.fdopen(fd, 'wb') as f:
+                    dump(self.value, f, protocol=HIGHEST_PROTOCOL)
+
+                self._path = path
+                self._finalizer.detach()
+                self._finalizer = finalize(self, _remove, self._key, path)
+
+            return self._path
+
+    def destroy(self):
+        """
+        removes object from parent and file of object. Workers drop their
+        copy on loading another broadcast (or as least recently used one).
+        """
+
+        if self._owner:
+            self._finalizer()
+            self._path = None
+
+    def __getstate__(self):
+        if not self._owner:
+            return self._key, self._path, self._pid
+
+        return self._key, self._persist(), self._pid
+
+    def __setstate__(self, state):
+        self._key, self._path, self._pid = state
+        self._owner = False
+
+    def __str__(self):
+        return '{}({})'.format(type(self).__name__, self._key)
+
+    def __repr__(self):
+        return str(self)
+
+
+if __name__ == 'streamAPI.stream.broadcast':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,271 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Event, Lock, local
+from typing import Callable, Iterable
+
+from streamAPI.stream.exception import Cancelled
+from streamAPI.utility.Types import T, X
+from streamAPI.utility.utils import get_functions_clazz
+
+try:
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # python < 3.8; process workers are then cancelled only by cancelling their futures.
+    resource_tracker = SharedMemory = None
+
+ATTACHED = 16  # number of flags of process tokens kept attached in a worker.
+CLOSED = 2  # value of flag once token is closed by stream; workers detach on seeing it.
+
+_current = local()  # token of job being run by thread of worker.
+_attached = OrderedDict()  # name of segment -> SharedMemory, in worker process.
+_lock = Lock()
+
+
+class CancelToken:
+    """
+    Flag shared by a stream with its workers, which is set once result of
+    terminal operation is known; running jobs can check it (see "cancelled")
+    to stop early, and jobs not yet started are skipped.
+
+    For process workers, flag is a one byte shared memory segment (python >= 3.8)
+    and only its name is pickled; flag of a removed segment reads as set. For
+    thread workers, flag is a threading.Event.
+    """
+
+    def __init__(self, processes: bool):
+        self._event = self._shm = self._name = None
+
+        if not processes:
+            self._event = Event()
+        elif SharedMemory is not None:
+            self._shm = SharedMemory(create=True, size=1)
+            self._shm.buf[0] = 0
+            self._name = self._shm.name
+
+    def set(self):
+        if self._event is not None:
+            self._event.set()
+        elif self._shm is not None:
+            self._shm.buf[0] = 1
+
+    def is_set(self) -> bool:
+        if self._event is not None:
+            return self._event.is_set()
+
+        if self._name is None:
+            return False
+
+        if self._shm is not None:
+            return self._shm.buf[0] != 0
+
+        shm = _attach(self._name)
+
+        if shm is None:
+            return True
+
+        try:
+            flag = shm.buf[0]
+        except (TypeError, ValueError):  # released by another thread on seeing CLOSED.
+            return True
+
+        if flag == CLOSED:
+            _detach(self._name)
+
+        return flag != 0
+
+    def close(self):
+        """
+        removes shared memory segment of token (in parent); flag is marked
+        closed first, so that workers holding it attached release it on
+        their next check. Can be called more than once.
+        """
+
+        shm, self._shm = self._shm, None
+
+        if shm is not None:
+            shm.buf[0] = CLOSED
+            shm.close()
+
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def close_after(self, jobs: Iterable[Future]):
+        """
+        closes token once all "jobs" are done; a job still running may attach
+        flag, and segment must not be removed before that attachment has been
+        registered with resource tracker (see "_share_tracker").
+
+        :param jobs: jobs which have been given token.
+        """
+
+        _when_done(jobs, self.close)
+
+    def __getstate__(self):
+        if self._event is not None:
+            raise TypeError('thread cancel token can not be pickled.')
+
+        return self._name
+
+    def __setstate__(self, name):
+        self._event = self._shm = None
+        self._name = name
+
+
+def _when_done(jobs: Iterable[Future], func: Callable[[], None]):
+    """
+    calls "func" once all "jobs" are done; immediately if there is no job.
+
+    :param jobs:
+    :param func:
+    """
+
+    jobs = list(jobs)
+
+    if not jobs:
+        func()
+        return
+
+    remaining = [len(jobs)]
+    lock = Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+
+        if last:
+            func()
+
+    for job in jobs:
+        job.add_done_callback(done)
+
+
+def _share_tracker():
+    """
+    starts resource tracker of this process, if not yet running, so that
+    process workers started afterwards (by fork, forkserver or spawn) share
+    it instead of starting their own.
+
+    Segment attached by a worker is then registered with tracker of stream,
+    which already holds it, and is unregistered by stream on removing it.
+    A worker having its own tracker would keep every flag it ever attached
+    registered (reporting them as leaked at exit); unregistering it from a
+    shared tracker, on the other hand, would drop entry of stream.
+    """
+
+    if resource_tracker is not None:
+        resource_tracker.ensure_running()
+
+
+def _open(name: str) -> SharedMemory:
+    """
+    attaches existing segment "name"; it is owned (and removed) by stream.
+    """
+
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # python < 3.13; see "_share_tracker".
+        return SharedMemory(name=name)
+
+
+def _attach(name: str):
+    """
+    attaches flag segment "name" in worker, keeping at most ATTACHED
+    segments attached.
+
+    :param name: name of segment.
+    :return: None if segment has been removed.
+    """
+
+    with _lock:
+        shm = _attached.get(name)
+
+        if shm is not None:
+            _attached.move_to_end(name)
+            return shm
+
+        try:
+            shm = _attached[name] = _open(name)
+        except FileNotFoundError:
+            return None
+
+        if len(_attached) > ATTACHED:
+            _, old = _attached.popitem(last=False)
+            old.close()
+
+        return shm
+
+
+def _detach(name: str):
+    """
+    releases flag segment "name" attached in worker, if any.
+    """
+
+    with _lock:
+        shm = _attached.pop(name, None)
+
+    if shm is not None:
+        shm.close()
+
+
+def run_cancellable(token: CancelToken, func: Callable[[T], X], g: T) -> X:
+    """
+    runs "func(g)" in worker, unless "token" has been set already;
+    "token" is visible to "func" through "cancelled".
+
+    :param token:
+    :param func:
+    :param g:
+    :return:
+    """
+
+    if token.is_set():
+        raise Cancelled()
+
+    _current.token = token
+
+    try:
+        return func(g)
+    finally:
+        _current.token = None
+
+
+def cancelled() -> bool:
+    """
+    can be called by functions run by ParallelStream workers; returns True if
+    result of terminal operation is already known, so that long running function
+    can stop early. Only short-circuiting operations (find_first, any, all,
+    none_match, any_concurrent, all_concurrent and limit) cancel stream; for
+    others it is always False.
+
+    Example:
+        def expensive_check(item):
+            for step in steps(item):
+                if cancelled():
+                    return False
+
+                ...
+
+        ParallelStream(items, worker=8).any_concurrent(expensive_check)
+
+    :return:
+    """
+
+    token = getattr(_current, 'token', None)
+
+    return token is not None and token.is_set()
+
+
+def raise_if_cancelled():
+    """
+    raises Cancelled if result of terminal operation is already known (see "cancelled").
+    """
+
+    if cancelled():
+        raise Cancelled()
+
+
+if __name__ == 'streamAPI.stream.cancel':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,390 @@
+from itertools import chain, compress
+from operator import add
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+from streamAPI.stream.aggregator import Aggregator, Custom, as_aggregator, group_results
+from streamAPI.stream.decos import check_pipeline, close_pipeline
+from streamAPI.stream.stream import Stream
+from streamAPI.utility.Types import Function
+from streamAPI.utility.utils import csv_ListReader, divide_in_chunk, get_functions_clazz
+
+RecordBatch = Dict[str, List[Any]]  # column name -> column values
+Columns = Union[str, Sequence[str]]
+Aggregation = Union[str, Aggregator, Function[List, Any]]
+BATCH_SIZE = 1024
+
+
+def batch_length(batch: RecordBatch) -> int:
+    """
+    number of rows in record batch.
+
+    :param batch:
+    :return:
+    """
+
+    for values in batch.values():
+        return len(values)
+
+    return 0
+
+
+def _append(values: list, v) -> list:
+    values.append(v)
+    return values
+
+
+def _as_aggregator(agg: Aggregation) -> Aggregator:
+    """
+    converts aggregation of ColumnarStream.aggregate to Aggregator; function
+    of list of values is applied on values collected for group.
+
+    :param agg:
+    :return:
+    """
+
+    if isinstance(agg, (str, Aggregator)):
+        return as_aggregator(agg)
+
+    return Custom(init=list, update=_append, merge=add, result=agg)
+
+
+def _as_tuple(cols: Columns) -> Tuple[str, ...]:
+    return (cols,) if isinstance(cols, str) else tuple(cols)
+
+
+def _keys(batch: RecordBatch, by: Columns) -> Iterable:
+    """
+    group by keys of rows of batch. If "by" is a column name then
+    key is column value otherwise tuple of column values.
+    """
+
+    if isinstance(by, str):
+        return batch[by]
+
+    return zip(*(batch[c] for c in by))
+
+
+def _row_op(name: str):
+    """
+    creates operation of ColumnarStream for operation "name" of Stream which
+    compares, hashes or adds elements; it would act on whole record batches,
+    so it raises TypeError instead.
+
+    :param name:
+    :return:
+    """
+
+    def op(self, *args, **kwargs):
+        raise TypeError("'{0}' would act on record batches; use rows().{0}(...) "
+                        "to apply it on rows.".format(name))
+
+    op.__name__ = name
+    op.__doc__ = 'not supported on record batches; use rows().{}(...).'.format(name)
+
+    return op
+
+
+class ColumnarStream(Stream[RecordBatch]):
+    """
+    Stream of record batches for tabular data. Each record batch is a dictionary
+    of column name to list of column values, so operations work on columns
+    rather than on a dictionary per row.
+
+    Example:
+        (ColumnarStream.from_csv('sales.csv', columns=('city', 'amount'))
+         .with_column('amount', float, 'amount')
+         .where(lambda amount: amount > 10, 'amount')
+         .aggregate('city', total=('amount', 'sum'), n=('amount', 'count')))
+        -> {'delhi': {'total': 1520.5, 'n': 31}, 'pune': {'total': 340.0, 'n': 12}}
+
+        ColumnarStream.from_rows([dict(a=1, b=2), dict(a=3, b=4)]).select('b').rows().as_seq()
+        -> [{'b': 2}, {'b': 4}]
+
+    Inherited operations work on record batches; operations comparing, hashing
+    or adding elements (distinct, sort, min, max ...) raise TypeError, they are
+    applied on rows by "rows".
+    """
+
+    @classmethod
+    def from_csv(cls, file: str, batch_size: int = BATCH_SIZE,
+                 columns: Columns = None) -> 'ColumnarStream':
+        """
+        Reads csv file (first row being header) in record batches. Rows are
+        read as lists (see csv_ListReader), hence no dictionary is created per row.
+
+        :param file:
+        :param batch_size: number of rows in a record batch.
+        :param columns: if given, only these columns are kept.
+        :return:
+        """
+
+        return cls(ColumnarStream._csv_batches(csv_ListReader(file), batch_size, columns))
+
+    @staticmethod
+    def _csv_batches(rows: Iterable[List[str]], batch_size: int, columns: Columns):
+        rows = iter(rows)
+        header = next(rows, None)
+
+        if header is None:
+            return
+
+        if columns is None:
+            columns = header
+
+        columns = _as_tuple(columns)
+        idx = [header.index(c) for c in columns]
+
+        # like DictReader, blank rows are skipped and missing fields of short rows are None.
+        for chunk in divide_in_chunk(filter(None, rows), batch_size):
+            yield {c: [row[i] if i < len(row) else None for row in chunk] for c, i in zip(columns, idx)}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]],
+                  batch_size: int = BATCH_SIZE) -> 'ColumnarStream':
+        """
+        Creates record batches from rows, each row being dictionary,
+        for example rows read by csv_itr. Columns are taken from
+        first row of each batch.
+
+        :param rows:
+        :param batch_size:
+        :return:
+        """
+
+        def to_batch(chunk: Sequence[Mapping[str, Any]]) -> RecordBatch:
+            return {c: [row[c] for row in chunk] for c in chunk[0]}
+
+        return cls(map(to_batch, divide_in_chunk(rows, batch_size)))
+
+    @check_pipeline
+    def select(self, *cols: str) -> 'ColumnarStream':
+        """
+        keeps only columns "cols".
+
+        Example:
+            ColumnarStream.from_rows([dict(a=1, b=2, c=3)]).select('c', 'a').rows().as_seq()
+            -> [{'c': 3, 'a': 1}]
+
+        :param cols:
+        :return: ColumnarStream itself
+        """
+
+        return self.map(lambda batch: {c: batch[c] for c in cols})
+
+    @check_pipeline
+    def where(self, predicate: Callable[..., bool], *cols: str) -> 'ColumnarStream':
+        """
+        keeps rows for which "predicate" returns True. Predicate takes
+        values of columns "cols" of a row as positional arguments.
+
+        Example:
+            (ColumnarStream.from_rows([dict(a=1, b=2), dict(a=3, b=1)])
+             .where(lambda a, b: a < b, 'a', 'b').rows().as_seq())
+            -> [{'a': 1, 'b': 2}]
+
+        :param predicate:
+        :param cols:
+        :return: ColumnarStream itself
+        """
+
+        assert cols, 'at least one column is required'
+
+        def _where(batch: RecordBatch) -> RecordBatch:
+            mask = list(map(predicate, *(batch[c] for c in cols)))
+            return {c: list(compress(values, mask)) for c, values in batch.items()}
+
+        return self.map(_where)
+
+    @check_pipeline
+    def with_column(self, name: str, func: Callable, *cols: str) -> 'ColumnarStream':
+        """
+        adds (or replaces) column "name" having values computed by "func"
+        on values of columns "cols" of each row.
+
+        Example:
+            (ColumnarStream.from_rows([dict(a='1', b='2')])
+             .with_column('a', int, 'a')
+             .with_column('c', lambda a, b: a * int(b), 'a', 'b')
+             .rows().as_seq())
+            -> [{'a': 1, 'b': '2', 'c': 2}]
+
+        :param name:
+        :param func:
+        :param cols:
+        :return: ColumnarStream itself
+        """
+
+        assert cols, 'at least one column is required'
+
+        def _with_column(batch: RecordBatch) -> RecordBatch:
+            out = dict(batch)
+            out[name] = list(map(func, *(batch[c] for c in cols)))
+            return out
+
+        return self.map(_with_column)
+
+    @check_pipeline
+    def rows(self) -> Stream[Dict[str, Any]]:
+        """
+        converts record batches to Stream of rows, each row being a dictionary.
+        Returned stream is a plain Stream, so its operations work on rows.
+
+        :return:
+        """
+
+        return Stream(chain.from_iterable(map(ColumnarStream._rows, self._pointer)))
+
+    @staticmethod
+    def _rows(batch: RecordBatch) -> Iterable[Dict[str, Any]]:
+        cols = tuple(batch)
+        return (dict(zip(cols, row)) for row in zip(*batch.values()))
+
+    @close_pipeline
+    @check_pipeline
+    def count(self) -> int:
+        """
+        This operation is one of the terminal operations
+
+        :return: number of rows in all record batches.
+        """
+
+        return sum(map(batch_length, self._pointer))
+
+    @close_pipeline
+    @check_pipeline
+    def as_columns(self) -> RecordBatch:
+        """
+        This operation is one of the terminal operations
+        concatenates all record batches.
+
+        :return:
+        """
+
+        out = {}
+
+        for batch in self._pointer:
+            for c, values in batch.items():
+                out.setdefault(c, []).extend(values)
+
+        return out
+
+    @close_pipeline
+    @check_pipeline
+    def group_by_columns(self, by: Columns, columns: Columns = None) -> Dict[Any, RecordBatch]:
+        """
+        This operation is one of the terminal operations
+        groups rows by values of column(s) "by". Inherited "group_by" (and
+        "partition") groups record batches themselves.
+
+        Example:
+            rows = [dict(a=1, b=2), dict(a=2, b=3), dict(a=1, b=4)]
+            ColumnarStream.from_rows(rows).group_by_columns('a')
+            -> {1: {'a': [1, 1], 'b': [2, 4]}, 2: {'a': [2], 'b': [3]}}
+
+            ColumnarStream.from_rows(rows).group_by_columns(('a', 'b'), columns='b')
+            -> {(1, 2): {'b': [2]}, (2, 3): {'b': [3]}, (1, 4): {'b': [4]}}
+
+        :param by: column name or sequence of column names.
+        :param columns: columns to be kept in groups; if None, all columns are kept.
+        :return: dictionary of key to record batch.
+        """
+
+        out = {}
+
+        for batch in self._pointer:
+            cols = batch if columns is None else _as_tuple(columns)
+            indices = ColumnarStream._group_indices(batch, by)
+
+            for k, idx in indices.items():
+                group = out.get(k)
+
+                if group is None:
+                    group = out[k] = {c: [] for c in cols}
+
+                for c in cols:
+                    values = batch[c]
+                    group[c].extend(values[i] for i in idx)
+
+        return out
+
+    @staticmethod
+    def _group_indices(batch: RecordBatch, by: Columns) -> Dict[Any, List[int]]:
+        indices = {}
+
+        for i, k in enumerate(_keys(batch, by)):
+            idx = indices.get(k)
+
+            if idx is None:
+                indices[k] = [i]
+            else:
+                idx.append(i)
+
+        return indices
+
+    @close_pipeline
+    @check_pipeline
+    def aggregate(self, by: Columns, **aggs: Tuple[str, Aggregation]) -> Dict[Any, Dict[str, Any]]:
+        """
+        This operation is one of the terminal operations
+        groups rows by values of column(s) "by" and aggregates
+        columns of each group.
+
+        Each aggregation is given as name=(column, agg), where "agg" is an
+        Aggregator or name of builtin aggregation (see Stream.aggregate_by);
+        values of "column" are folded into a state per group, so rows of
+        groups are not kept. "agg" can also be a function taking list of
+        values of "column" of a group, in which case values of that column
+        are kept for groups.
+
+        Example:
+            rows = [dict(a=1, b=2), dict(a=2, b=3), dict(a=1, b=4)]
+            ColumnarStream.from_rows(rows).aggregate('a', total=('b', 'sum'), n=('b', 'count'), top=('b', max))
+            -> {1: {'total': 6, 'n': 2, 'top': 4}, 2: {'total': 3, 'n': 1, 'top': 3}}
+
+        :param by: column name or sequence of column names.
+        :param aggs:
+        :return: dictionary of key to dictionary of aggregation name to value.
+        """
+
+        columns = tuple(col for col, _ in aggs.values())
+        aggs = {name: _as_aggregator(agg) for name, (_, agg) in aggs.items()}
+
+        inits = tuple(agg.init for agg in aggs.values())
+        updates = tuple((agg.update, agg.value) for agg in aggs.values())
+        groups: Dict[Any, list] = {}
+
+        for batch in self._pointer:
+            values = tuple(batch[c] for c in columns)
+
+            for k, idx in ColumnarStream._group_indices(batch, by).items():
+                states = groups.get(k)
+
+                if states is None:
+                    states = groups[k] = [init() for init in inits]
+
+                for j, (update, value) in enumerate(updates):
+                    state, col = states[j], values[j]
+
+                    for i in idx:
+                        state = update(state, value(col[i]))
+
+                    states[j] = state
+
+        return group_results(groups, aggs)
+
+    # operations on elements, meaningless for record batches.
+    distinct = _row_op('distinct')
+    sort = _row_op('sort')
+    top_k = _row_op('top_k')
+    rolling_sum = _row_op('rolling_sum')
+    rolling_mean = _row_op('rolling_mean')
+    rolling_min = _row_op('rolling_min')
+    rolling_max = _row_op('rolling_max')
+    min = _row_op('min')
+    max = _row_op('max')
+    nsmallest = _row_op('nsmallest')
+    nlargest = _row_op('nlargest')
+
+
+if __name__ == 'streamAPI.stream.columnarStream':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,125 @@
+from functools import reduce
+from typing import Any, Dict, Iterable, Sequence
+
+from streamAPI.stream.aggregator import Aggregator
+from streamAPI.stream.stream import NIL, Stream
+from streamAPI.stream.streamHelper import GroupByValueType
+from streamAPI.utility.Types import BiFunction, Filter, Function, T, X, Y
+from streamAPI.utility.utils import get_functions_clazz
+
+# partial_* functions aggregate a chunk of stream elements in a worker of
+# ParallelStream; partial results are merged by parent.
+
+
+def partial_reduce(bi_func: BiFunction[X, X, X], mapper: Function[T, X], chunk: Sequence[T]) -> X:
+    return reduce(bi_func, chunk if mapper is None else map(mapper, chunk))
+
+
+def partial_count(predicate: Filter[T], chunk: Sequence[T]) -> int:
+    if predicate is None:
+        return len(chunk)
+
+    return sum(1 for e in chunk if predicate(e))
+
+
+def partial_min(comp, mapper: Function[T, X], chunk: Sequence[T]) -> X:
+    itr = chunk if mapper is None else map(mapper, chunk)
+    return min(itr, key=comp) if comp else min(itr)
+
+
+def partial_max(comp, mapper: Function[T, X], chunk: Sequence[T]) -> X:
+    itr = chunk if mapper is None else map(mapper, chunk)
+    return max(itr, key=comp) if comp else max(itr)
+
+
+def partial_group_by(key_hasher: Function[T, Any], value_mapper: Function[T, Y],
+                     value_container_clazz: GroupByValueType, chunk: Sequence[T]) -> Dict[Any, Iterable[Y]]:
+    return Stream(chunk).group_by(key_hasher, value_mapper, value_container_clazz)
+
+
+def partial_mapping(key_mapper: Function[T, Any], value_mapper: Function[T, Y],
+                    resolve: BiFunction[Y, Y, Y], chunk: Sequence[T]) -> Dict[Any, Y]:
+    return Stream(chunk).mapping(key_mapper, value_mapper, resolve)
+
+
+def partial_aggregate(key_hasher: Function[T, Any], aggs: Dict[str, Aggregator],
+                      chunk: Sequence[T]) -> Dict[Any, list]:
+    return Stream._aggregate_states(chunk, key_hasher, aggs)
+
+
+def tree_reduce(bi_func: BiFunction[X, X, X], itr: Iterable[X]):
+    """
+    reduces elements of "itr" pairwise, like a balanced binary tree, keeping
+    order of operands; so "bi_func" has to be associative. Only O(log(n))
+    elements are held at a time.
+
+    Example:
+        tree_reduce(operator.add, 'abcde') -> ((ab)(cd))e = 'abcde'
+
+    :param bi_func:
+    :param itr:
+    :return: NIL if "itr" is empty.
+    """
+
+    stack = []  # (level, value); levels are strictly decreasing.
+
+    for e in itr:
+        level = 0
+
+        while stack and stack[-1][0] == level:
+            e = bi_func(stack.pop()[1], e)
+            level += 1
+
+        stack.append((level, e))
+
+    if not stack:
+        return NIL
+
+    out = stack.pop()[1]
+
+    while stack:
+        out = bi_func(stack.pop()[1], out)
+
+    return out
+
+
+def merge_group_by(a: Dict[Any, Any], b: Dict[Any, Any]) -> Dict[Any, Any]:
+    """
+    merges partial groups "b" (of later elements) into "a".
+
+    :return: a
+    """
+
+    for k, values in b.items():
+        container = a.get(k)
+
+        if container is None:
+            a[k] = values
+        else:
+            for v in values:
+                container.add(v)
+
+    return a
+
+
+def merge_mapping(a: Dict[Any, Y], b: Dict[Any, Y], resolve: BiFunction[Y, Y, Y] = None) -> Dict[Any, Y]:
+    """
+    merges partial mapping "b" (of later elements) into "a".
+
+    :return: a
+    """
+
+    for k, v in b.items():
+        if k in a:
+            if resolve is None:
+                raise ValueError('key {} is already present in map'.format(k))
+
+            a[k] = resolve(a[k], v)
+        else:
+            a[k] = v
+
+    return a
+
+
+if __name__ == 'streamAPI.stream.combiner':
+    __all__ = get_functions_clazz(__name__, __file__)
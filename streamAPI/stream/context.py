@@ -0,0 +1,117 @@
+from multiprocessing.util import Finalize
+from threading import Lock, local
+from typing import Any, Callable, Generic, List
+from uuid import uuid4
+
+from streamAPI.utility.Types import Function, T, X
+from streamAPI.utility.utils import get_functions_clazz
+
+_remote = local()  # key of context -> value, for each thread of worker process.
+
+
+class WorkerContext(Generic[X]):
+    """
+    Context (for example a database connection or a model) created by
+    "init" once per worker thread or process, on first job of that worker,
+    and reused by rest of the jobs.
+
+    For thread workers, contexts are torn down (by "close") once stream is done,
+    i.e. after terminal operation, once iteration is over or on shutdown of stream.
+    For process workers, handle pickles as a key only; contexts are torn down
+    when worker process exits, i.e. after terminal operation or iteration if
+    executor is created by stream, or when pool is shut down if it is borrowed.
+
+    Example:
+        context = WorkerContext(lambda: DB(dsn).conn, teardown=lambda conn: conn.close())
+        context.get() -> connection of current worker
+    """
+
+    def __init__(self, init: Callable[[], X], teardown: Function[X, Any] = None):
+        """
+        :param init: creates context, called once per worker.
+        :param teardown: if given, called with context once it is not needed anymore.
+        """
+
+        self._key = uuid4().hex
+        self._init = init
+        self._teardown = teardown
+
+        self._local = local()  # context of each thread (parent process only).
+        self._created: List[X] = []
+        self._lock = Lock()
+        self._remote = False
+
+    def get(self) -> X:
+        """
+        :return: context of current worker, creating it if required.
+        """
+
+        if self._remote:
+            contexts = getattr(_remote, 'contexts', None)
+
+            if contexts is None:
+                contexts = _remote.contexts = {}
+
+            if self._key not in contexts:
+                ctx = contexts[self._key] = self._init()
+
+                if self._teardown is not None:
+                    Finalize(None, self._teardown, args=(ctx,), exitpriority=0)
+
+            return contexts[self._key]
+
+        try:
+            return self._local.ctx
+        except AttributeError:
+            pass
+
+        ctx = self._local.ctx = self._init()
+
+        with self._lock:
+            self._created.append(ctx)
+
+        return ctx
+
+    def close(self):
+        """
+        tears down contexts created by thread workers; contexts of process
+        workers are torn down on exit of worker.
+        """
+
+        with self._lock:
+            created, self._created = self._created, []
+            self._local = local()
+
+        if self._teardown is not None:
+            for ctx in created:
+                self._teardown(ctx)
+
+    def __getstate__(self):
+        return self._key, self._init, self._teardown
+
+    def __setstate__(self, state):
+        self._key, self._init, self._teardown = state
+        self._remote = True
+
+    def __str__(self):
+        return '{}({})'.format(type(self).__name__, self._key)
+
+    def __repr__(self):
+        return str(self)
+
+
+def run_with_context(context: WorkerContext[X], func: Callable[[X, T], Any], g: T):
+    """
+    runs "func(ctx, g)" in worker, "ctx" being context of that worker.
+
+    :param context:
+    :param func:
+    :param g:
+    :return:
+    """
+
+    return func(context.get(), g)
+
+
+if __name__ == 'streamAPI.stream.context':
+    __all__ = get_functions_clazz(__name__, __file__)
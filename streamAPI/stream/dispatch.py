@@ -0,0 +1,185 @@
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from itertools import islice
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Iterable, Tuple
+
+from streamAPI.utility.Types import Function, T, X
+from streamAPI.utility.utils import get_functions_clazz
+
+TARGET = 0.1  # seconds
+MAX_OVERHEAD = 0.1  # maximum fraction of dispatch time spent in overhead.
+GROWTH = 4  # maximum factor by which dispatch size changes at a time.
+SMOOTHING = 0.3
+HISTORY = 1024
+
+
+def timed_batch_process(func: Function[T, X], gs: Iterable[T]) -> Tuple[Tuple[X, ...], float]:
+    """
+    Applies function "func" on data points "gs".
+
+    :param func:
+    :param gs:
+    :return: transformed data points and time (in seconds) taken to compute them.
+    """
+
+    start = perf_counter()
+    out = tuple(func(g) for g in gs)
+
+    return out, perf_counter() - start
+
+
+class AdaptiveDispatch:
+    """
+    Chooses number of stream elements to be dispatched to a worker in one go
+    (see ParallelStream.batch_processor), while stream is being processed.
+
+    Workers time computation of each dispatch; time of round trip not spent in
+    computation is counted as overhead (pickling, IPC and queueing). Dispatch
+    size is then moved toward size whose computation takes "target" seconds,
+    or longer if overhead would be more than "max_overhead" fraction of it.
+    Both timings are smoothed, so dispatch size follows drifting data.
+
+    Example:
+        dispatch = AdaptiveDispatch(target=0.05)
+        ParallelStream(data, worker=4).batch_processor(func, dispatch).done()
+        dispatch.sizes -> deque([1, 1, 1, 1, 4, 16, 64, 212, 208, ...])
+    """
+
+    def __init__(self, target: float = TARGET, initial: int = 1,
+                 min_size: int = 1, max_size: int = None,
+                 max_overhead: float = MAX_OVERHEAD):
+        """
+        :param target: desired computation time (in seconds) of a dispatch.
+        :param initial: dispatch size to start with.
+        :param min_size:
+        :param max_size: if None then dispatch size is not bounded above.
+        :param max_overhead:
+        """
+
+        assert target > 0, 'target must be positive'
+        assert 0 < min_size <= initial, 'dispatch sizes must be positive'
+        assert max_size is None or max_size >= initial, "'max_size' can not be less than 'initial'"
+        assert 0 < max_overhead < 1, "'max_overhead' must be in (0, 1)"
+
+        self._target = target
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_overhead = max_overhead
+
+        self._size = initial
+        self._element_time = None  # seconds of computation per element
+        self._overhead = None  # seconds of overhead per dispatch
+        self._sizes = deque(maxlen=HISTORY)
+        self._lock = Lock()
+
+    @property
+    def size(self) -> int:
+        """
+        dispatch size for next dispatch.
+        """
+
+        return self._size
+
+    @property
+    def sizes(self) -> deque:
+        """
+        sizes of recent dispatches (at most HISTORY), oldest first.
+        """
+
+        return self._sizes
+
+    @property
+    def element_time(self) -> float:
+        """
+        smoothed computation time per element; None until first dispatch is done.
+        """
+
+        return self._element_time
+
+    @property
+    def overhead(self) -> float:
+        """
+        smoothed overhead per dispatch; None until first dispatch is done.
+        """
+
+        return self._overhead
+
+    def chunks(self, itr: Iterable[T]) -> Iterable[Tuple[T, ...]]:
+        """
+        divides "itr" in chunks of current dispatch size.
+
+        :param itr:
+        :return:
+        """
+
+        itr = iter(itr)
+
+        while True:
+            chunk = tuple(islice(itr, self._size))
+
+            if not chunk:
+                return
+
+            self._sizes.append(len(chunk))
+            yield chunk
+
+    def submit(self, submit_job: Callable[..., Future], func: Function[T, X], chunk: Tuple[T, ...]) -> Future:
+        """
+        submits "chunk" using "submit_job", timing its round trip. Result of
+        job is tuple of transformed elements and computation time.
+
+        :param submit_job: takes function and its argument, returns Future.
+        :param func:
+        :param chunk:
+        :return:
+        """
+
+        start = perf_counter()
+        job = submit_job(partial(timed_batch_process, func), chunk)
+        job.add_done_callback(partial(self._observe, len(chunk), start))
+
+        return job
+
+    def _observe(self, n: int, start: float, job: Future):
+        if job.cancelled() or job.exception() is not None:
+            return
+
+        round_trip = perf_counter() - start
+        _, elapsed = job.result()
+
+        with self._lock:
+            self._element_time = _smooth(self._element_time, elapsed / n)
+            self._overhead = _smooth(self._overhead, max(round_trip - elapsed, 0))
+            self._size = self._next_size()
+
+    def _next_size(self) -> int:
+        duration = max(self._target, self._overhead * (1 - self._max_overhead) / self._max_overhead)
+        size = self._size
+
+        if self._element_time > 0:
+            size = duration / self._element_time
+            size = int(min(max(size, self._size / GROWTH), self._size * GROWTH))
+        else:
+            size *= GROWTH
+
+        size = max(size, self._min_size)
+
+        return size if self._max_size is None else min(size, self._max_size)
+
+    def __str__(self):
+        return '{}(size={}, element_time={}, overhead={})'.format(type(self).__name__, self._size,
+                                                                  self._element_time, self._overhead)
+
+    def __repr__(self):
+        return str(self)
+
+
+def _smooth(old: float, new: float) -> float:
+    return new if old is None else old + SMOOTHING * (new - old)
+
+
+if __name__ == 'streamAPI.stream.dispatch':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -10,3 +10,11 @@ class PipelineNOTClosed(Exception):
     Exception thrown in case PipeLine is not closed.
     """
     pass
+
+
+class Cancelled(Exception):
+    """
+    Exception thrown in worker of ParallelStream in case job is not
+    required anymore, as result of terminal operation is known.
+    """
+    pass
@@ -0,0 +1,97 @@
+from functools import lru_cache
+from typing import Callable, Iterable, Sequence, Tuple
+
+from streamAPI.utility.Types import X, Y
+from streamAPI.utility.utils import get_functions_clazz
+
+# kinds of element-wise stages which can be fused together.
+MAP = 'map'
+FILTER = 'filter'
+PEEK = 'peek'
+_TRUTH = 'truth'  # filter stage without predicate, keeping truthy elements like filter(None, itr).
+
+_STATEMENTS = {
+    MAP: 'e = f{idx}(e)',
+    FILTER: 'if not f{idx}(e): continue',
+    PEEK: 'f{idx}(e)',
+    _TRUTH: 'if not e: continue'
+}
+
+Stage = Tuple[str, Callable]
+
+
+@lru_cache(maxsize=256)
+def _compile(kinds: Tuple[str, ...]) -> Callable:
+    """
+    Generates a generator function which applies stages of given
+    "kinds" on each element in a single loop.
+
+    For kinds ('map', 'filter', 'peek') generated function is:
+
+        def fused(itr, f0, f1, f2):
+            for e in itr:
+                e = f0(e)
+                if not f1(e): continue
+                f2(e)
+                yield e
+
+    Generated functions are cached on "kinds", so pipelines having same
+    shape are compiled only once.
+
+    :param kinds:
+    :return:
+    """
+
+    args = ', '.join('f{}'.format(idx) for idx in range(len(kinds)))
+    body = '\n'.join('        ' + _STATEMENTS[kind].format(idx=idx)
+                     for idx, kind in enumerate(kinds))
+
+    src = ('def fused(itr, {args}):\n'
+           '    for e in itr:\n'
+           '{body}\n'
+           '        yield e\n').format(args=args, body=body)
+
+    namespace = {}
+    exec(compile(src, '<fused {}>'.format('-'.join(kinds)), 'exec'), namespace)
+
+    return namespace['fused']
+
+
+def fuse(itr: Iterable[X], stages: Sequence[Stage]) -> Iterable[Y]:
+    """
+    Applies element-wise "stages" on iterable "itr", so that each
+    element crosses a single python frame irrespective of number of
+    stages.
+
+    A stage is tuple of kind (one of MAP, FILTER, PEEK) and callable; callable
+    of FILTER can be None, keeping truthy elements as builtin filter does.
+    Single map or filter stage is delegated to builtin map/filter.
+
+    Example:
+        list(fuse(range(5), [(MAP, lambda x: x + 1), (FILTER, lambda x: x % 2)]))
+        -> [1, 3, 5]
+
+    :param itr:
+    :param stages:
+    :return:
+    """
+
+    if not stages:
+        return iter(itr)
+
+    if len(stages) == 1:
+        kind, func = stages[0]
+
+        if kind == MAP:
+            return map(func, itr)
+
+        if kind == FILTER:
+            return filter(func, itr)
+
+    kinds = tuple(_TRUTH if kind == FILTER and func is None else kind for kind, func in stages)
+
+    return _compile(kinds)(itr, *(func for _, func in stages))
+
+
+if __name__ == 'streamAPI.stream.fusion':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,250 @@
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Tuple
+
+from streamAPI.stream.spill import SpillFile, size_of
+from streamAPI.utility.Types import Function, X, Y
+from streamAPI.utility.utils import get_functions_clazz, identity
+
+INNER = 'inner'
+LEFT = 'left'
+SEMI = 'semi'
+ANTI = 'anti'
+
+JOINS = (INNER, LEFT, SEMI, ANTI)
+PARTITIONS = 16
+MAX_DEPTH = 8  # partitions overflowing even after these many re-partitionings are joined in memory.
+_MASK = (1 << 64) - 1
+
+
+def hash_join(left: Iterable[X], right: Iterable[Y],
+              left_key: Function[X, Any], right_key: Function[Y, Any],
+              how: str = INNER, memory_limit: int = None,
+              partitions: int = PARTITIONS) -> Iterable:
+    """
+    Joins "left" with "right" by building hash table of one side and lazily
+    streaming other side (probe side) through it.
+
+    how:
+        inner : (l, r) for every pair of matching elements.
+        left  : as inner, but (l, None) for "l" not matching any "r".
+        semi  : "l" having at least one match.
+        anti  : "l" not having any match.
+
+    For left, semi and anti joins, hash table is built from "right". For inner join,
+    both sides are read alternately until one is exhausted, and hash table is built
+    from that (smaller) side; so order of output follows the other side.
+
+    For semi and anti joins only keys of "right" are kept in memory.
+
+    If "memory_limit" (in bytes, approximated by size_of) is given and hash table
+    outgrows it, both sides are hash partitioned in "partitions" temporary files
+    and partitions are joined one by one (grace hash join); in this case "right" is
+    always used to build hash table and output is ordered partition wise. A partition
+    whose hash table outgrows "memory_limit" too is partitioned again, with a different
+    hash, up to MAX_DEPTH times; so only elements of a single key (which can not be
+    split) may be held beyond "memory_limit".
+
+    :param left:
+    :param right:
+    :param left_key:
+    :param right_key:
+    :param how:
+    :param memory_limit:
+    :param partitions:
+    :return:
+    """
+
+    if how not in JOINS:
+        raise ValueError("'how' must be one of {}".format(JOINS))
+
+    left, right = iter(left), iter(right)
+    swapped = False
+
+    if how == INNER and memory_limit is None:
+        right, left, swapped = _smaller_side(left, right)
+
+    build_key, probe_key = (left_key, right_key) if swapped else (right_key, left_key)
+    keep_values = how in (INNER, LEFT)
+
+    table, overflow = _build(right, build_key, keep_values, memory_limit)
+
+    if overflow is None:
+        yield from _probe(table, left, probe_key, how, swapped)
+    else:
+        # "table" does not hold all elements, rest are in overflow.
+        if keep_values:
+            build = chain(chain.from_iterable(table.values()), overflow)
+        else:
+            build = chain(table, map(build_key, overflow))
+
+        yield from _grace_join(build, left, build_key, probe_key, how, keep_values, partitions, memory_limit)
+
+
+def _smaller_side(left, right) -> Tuple[Iterable, Iterable, bool]:
+    """
+    reads both sides alternately till one of them is exhausted.
+
+    :param left:
+    :param right:
+    :return: build side, probe side and True if left is build side.
+    """
+
+    buffer_l, buffer_r = [], []
+
+    for l in left:
+        buffer_l.append(l)
+
+        for r in right:
+            buffer_r.append(r)
+            break
+        else:
+            return iter(buffer_r), chain(buffer_l, left), False
+
+    return iter(buffer_l), chain(buffer_r, right), True
+
+
+def _build(build: Iterable, key, keep_values: bool, memory_limit: int = None):
+    """
+    builds hash table of key to list of elements; if "keep_values" is False
+    then value is None.
+
+    :param build:
+    :param key:
+    :param keep_values:
+    :param memory_limit:
+    :return: hash table and None if all elements are in hash table otherwise
+             iterator to elements not in table.
+    """
+
+    build = iter(build)
+    table: Dict[Any, List] = {}
+    size = 0
+
+    for e in build:
+        k = key(e)
+
+        if keep_values:
+            values = table.get(k)
+
+            if values is None:
+                table[k] = [e]
+            else:
+                values.append(e)
+        else:
+            table[k] = None
+
+        if memory_limit is not None:
+            size += size_of(e if keep_values else k)
+
+            if size > memory_limit:
+                return table, build
+
+    return table, None
+
+
+def _probe(table: Dict[Any, List], probe: Iterable, key, how: str, swapped: bool):
+    if how == INNER:
+        if swapped:
+            for p in probe:
+                for b in table.get(key(p), ()):
+                    yield b, p
+        else:
+            for p in probe:
+                for b in table.get(key(p), ()):
+                    yield p, b
+
+    elif how == LEFT:
+        for p in probe:
+            matches = table.get(key(p))
+
+            if matches is None:
+                yield p, None
+            else:
+                for b in matches:
+                    yield p, b
+
+    elif how == SEMI:
+        for p in probe:
+            if key(p) in table:
+                yield p
+
+    else:
+        for p in probe:
+            if key(p) not in table:
+                yield p
+
+
+def _grace_join(build: Iterable, probe: Iterable, build_key, probe_key,
+                how: str, keep_values: bool, partitions: int, memory_limit: int, depth: int = 0):
+    """
+    partitions both sides by hash of key and joins partitions one by one;
+    partition whose hash table outgrows "memory_limit" is joined by
+    partitioning it again with hash salted by "depth".
+    If "keep_values" is False then "build" is iterable of keys.
+    """
+
+    build_parts = [SpillFile() for _ in range(partitions)]
+    probe_parts = [SpillFile() for _ in range(partitions)]
+    limit = memory_limit if depth < MAX_DEPTH else None
+    table_key = build_key if keep_values else identity
+
+    try:
+        _partition(build, build_key if keep_values else None, build_parts, depth)
+        _partition(probe, probe_key, probe_parts, depth)
+
+        for build_part, probe_part in zip(build_parts, probe_parts):
+            table, overflow = _build(build_part, table_key, keep_values, limit)
+
+            if overflow is None:
+                yield from _probe(table, probe_part, probe_key, how, False)
+            else:
+                build_part = chain(chain.from_iterable(table.values()) if keep_values else table, overflow)
+                del table
+
+                yield from _grace_join(build_part, probe_part, build_key, probe_key, how,
+                                       keep_values, partitions, memory_limit, depth + 1)
+    finally:
+        for f in chain(build_parts, probe_parts):
+            f.close()
+
+
+def _salted_hash(k, seed: int) -> int:
+    """
+    hash of "k" mixed with "seed" (splitmix64 finalizer), so that keys
+    in same partition are spread over all partitions when partitioned
+    again with another seed; "hash((seed, k))" would not do, as bits
+    of tuple hash are correlated with those of "hash(k)".
+    """
+
+    z = (hash(k) + seed * 0x9E3779B97F4A7C15) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+
+    return z ^ (z >> 31)
+
+
+def _partition(itr: Iterable, key, parts: List[SpillFile], seed: int = 0, frame: int = 1024):
+    """
+    writes elements to part decided by hash of their key salted by "seed"
+    (plain hash if "seed" is 0). If "key" is None, elements are themselves keys.
+    """
+
+    n = len(parts)
+    buffers = [[] for _ in range(n)]
+
+    for e in itr:
+        k = e if key is None else key(e)
+        idx = (_salted_hash(k, seed) if seed else hash(k)) % n
+        buffer = buffers[idx]
+        buffer.append(e)
+
+        if len(buffer) == frame:
+            parts[idx].write(buffer)
+            buffer.clear()
+
+    for part, buffer in zip(parts, buffers):
+        part.write(buffer)
+
+
+if __name__ == 'streamAPI.stream.join':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -1,106 +1,414 @@
-from collections import deque
-from concurrent.futures import (Executor, Future, ProcessPoolExecutor as PPE,
-                                ThreadPoolExecutor as TPE, as_completed)
+from concurrent.futures import (Executor, FIRST_COMPLETED, Future, ProcessPoolExecutor as PPE,
+                                ThreadPoolExecutor as TPE, TimeoutError, wait)
 from functools import partial, wraps
 from operator import itemgetter
-from typing import Deque, Iterable
-
-from streamAPI.stream.decos import check_pipeline
-from streamAPI.stream.stream import Stream
-from streamAPI.utility.Types import (Filter, Function, T, X)
-from streamAPI.utility.utils import get_functions_clazz
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+from streamAPI.stream import combiner
+from streamAPI.stream.aggregator import Aggregator, as_aggregator, group_results, merge_groups
+from streamAPI.stream.broadcast import Broadcast
+from streamAPI.stream.cancel import CancelToken, _share_tracker, _when_done, run_cancellable
+from streamAPI.stream.context import WorkerContext, run_with_context
+from streamAPI.stream.decos import check_pipeline, close_pipeline
+from streamAPI.stream.dispatch import AdaptiveDispatch
+from streamAPI.stream.fusion import fuse
+from streamAPI.stream.optional import EMPTY, Optional
+from streamAPI.stream.partition import PartitionedStream
+from streamAPI.stream.pool import WorkerPool
+from streamAPI.stream.speculation import Speculation, speculative_window
+from streamAPI.stream.stream import NIL, Stream
+from streamAPI.stream.streamHelper import GroupByValueType, ListType
+from streamAPI.stream.transport import SharedMemoryTransport
+from streamAPI.utility.Types import (BiFunction, Filter, Function, T, X, Y)
+from streamAPI.utility.utils import divide_in_chunk, get_functions_clazz, identity
+
+REORDER_FACTOR = 16  # size of reorder buffer relative to number of jobs in flight.
+CHUNK_SIZE = 1024  # number of elements aggregated by a worker in one go.
 
 
 class Exec(Stream[T]):
     def __init__(self, data: Iterable[T],
-                 worker: int,
-                 multiprocessing: bool = True):
+                 worker: int = None,
+                 multiprocessing: bool = True,
+                 pool: WorkerPool = None,
+                 transport: SharedMemoryTransport = None,
+                 executor: Executor = None):
         """
         :param data:
         :param worker: number of worker
         :param multiprocessing: it True then multiprocessing is used else multiThreading.
+        :param pool: if given, executor of pool is borrowed instead of
+                     creating one; "worker" defaults to worker of pool.
+        :param transport: if given, large buffers are sent to process workers
+                          through it; ignored for multiThreading.
+        :param executor: if given, it is borrowed instead of creating one (for
+                         example RemoteExecutor); "worker" defaults to its
+                         "worker" attribute.
         """
 
         super().__init__(data)
 
-        self._registered_jobs: Deque[Future] = deque()
-        self._exec: Executor = (PPE if multiprocessing else TPE)(max_workers=worker)
+        self._registered_jobs: Set[Future] = set()  # jobs submitted but not yet done
+
+        if executor is not None:
+            self._exec: Executor = executor
+            self._processes = not isinstance(executor, TPE)
+            worker = worker or getattr(executor, 'worker', None)
+        elif pool is not None:
+            self._exec: Executor = pool.executor
+            self._processes = pool.multiprocessing
+            worker = worker or pool.worker
+        else:
+            assert worker is not None, "either 'worker', 'pool' or 'executor' is required."
+
+            self._exec: Executor = (PPE if multiprocessing else TPE)(max_workers=worker)
+            self._processes = multiprocessing
+
+        assert worker is not None, "'worker' is required for executor."
+
+        self._owns_exec = pool is None and executor is None  # borrowed executor is not shut down by stream.
+        self._local = isinstance(self._exec, (PPE, TPE))  # workers share memory of host
+
+        if self._processes and self._local:
+            _share_tracker()  # before workers are started, see cancel.py
+        self._transport = transport if self._processes and self._local else None
+        self._cancel_token: CancelToken = None  # created on first submission of short-circuiting operation.
+        self._short_circuit = False  # True if result can be known before all jobs are done.
+        self._broadcasts: List[Broadcast] = []  # destroyed once stream is done.
+        self._contexts: List[WorkerContext] = []  # torn down by terminal operation.
+        self._dispatcher: AdaptiveDispatch = None
         self._worker = worker
 
-    def _parallel_processor(self: 'ParallelStream[T]', func, timeout=None, batch_size=None) -> Stream[T]:
+    def shutdown(self, wait: bool = True):
+        """
+        shuts down executor, if it was created by stream, and releases cancel
+        token and worker contexts of stream. Executor created by stream is shut
+        down by terminal operations (and once iteration is over) anyway, or on
+        exit of "with" block.
+
+        :param wait: if True, waits for submitted jobs to be completed.
+        """
+
+        self._shutdown(list(self._registered_jobs), wait)
+
+    def _shutdown(self, running: Iterable[Future], wait_jobs: bool):
+        """
+        :param running: jobs of stream in flight.
+        :param wait_jobs: if True, waits for "running" jobs to be completed.
+        """
+
+        if self._owns_exec:
+            self._exec.shutdown(wait=wait_jobs)
+
+        if wait_jobs:
+            wait(running)  # executor may be borrowed.
+
+        self._release(running)
+
+    def _release(self, running: Iterable[Future]):
+        """
+        removes cancel token (shared memory segment, for process workers),
+        destroys broadcasts and tears down worker contexts of stream.
+
+        :param running: jobs which may still be using token, broadcasts and contexts.
+        """
+
+        if self._cancel_token is not None:
+            self._cancel_token.close_after(running)
+
+        if self._broadcasts:
+            _when_done(running, partial(self._destroy, list(self._broadcasts)))
+            self._broadcasts.clear()
+
+        if self._contexts:
+            self._close_contexts(running)
+
+    @staticmethod
+    def _destroy(broadcasts: List[Broadcast]):
+        for b in broadcasts:
+            b.destroy()
+
+    def broadcast(self, obj: X) -> Broadcast[X]:
+        """
+        creates handle to "obj", through which workers get "obj" once and
+        cache it, instead of receiving it with every job (see Broadcast).
+        "obj" is removed once stream is done (and its jobs using handle
+        are done), whether or not executor has been created by stream.
+
+        Example:
+            def lookup(table: Broadcast, key):
+                return table.value[key]
+
+            stream = ParallelStream(keys, worker=8)
+            table = stream.broadcast(big_dict)
+            stream.batch_processor(partial(lookup, table), 100).as_seq()
+
+        :param obj:
+        :return:
+        """
+
+        b = Broadcast(obj)
+        self._broadcasts.append(b)
+
+        return b
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def _parallel_processor(self: 'ParallelStream[T]', func, timeout=None,
+                            batch_size=None, ordered: bool = True) -> Stream[T]:
         """
-        processes data points concurrently. Elements are processed in batches of size "batch_size".
+        processes data points concurrently, keeping at most "batch_size" jobs
+        in flight; a new job is submitted as soon as a job completes, so a slow
+        job does not stall rest of the workers.
+
+        If "ordered" is True, results are produced in order of data points; results
+        of jobs completed ahead of a slow job are held in a reorder buffer (of at most
+        REORDER_FACTOR * batch_size results, after which submission waits for slow job).
+        Otherwise results are produced in order of completion.
 
         :param self:
         :param func:
-        :param timeout: time to wait for task to be done, if None then there is no
-                        limit on execution time.
-        :param batch_size: If it is None then number of worker is used.
+        :param timeout: time to wait for any in-flight job to be done, if None then
+                        there is no limit on execution time. concurrent.futures.TimeoutError
+                        is raised if no job completes in time.
+        :param batch_size: maximum number of jobs in flight. If it is None then number
+                           of worker is used.
+        :param ordered:
         :return:
         """
 
         batch_size = batch_size or self._worker
         assert batch_size > 0, 'Batch size must be positive.'
 
-        stream = (Stream(iter(self._pointer))
-                  .map(partial(self._submit_job, func))
-                  .peek(self._registered_jobs.append)
-                  .batch(batch_size)
-                  .map(as_completed)
-                  .flat_map())
+        return Stream(self._sliding_window(partial(self._submit_job, func), iter(self._pointer),
+                                           batch_size, timeout, ordered))
 
-        if timeout is not None:
-            result_extractor = partial(Future.result, timeout=timeout)
-        else:
-            result_extractor = Future.result
+    def _sliding_window(self, submit: Function[T, Future], itr: Iterable[T],
+                        window: int, timeout, ordered: bool, keep: bool = False) -> Iterable:
+        """
+        Submits elements of "itr" using "submit" keeping at most "window"
+        jobs in flight and yields their results.
+
+        :param submit:
+        :param itr:
+        :param window:
+        :param timeout:
+        :param ordered:
+        :param keep: if True, (element, result) is yielded; element is held
+                     by parent while its job is in flight, so that worker
+                     does not have to send it back.
+        :return:
+        """
 
-        return stream.map(result_extractor)
+        in_flight: Dict[Future, Tuple[int, T]] = {}  # job -> (sequence number, element)
+        finished: Dict[int, Tuple[T, Future]] = {}  # reorder buffer
+        registered = self._registered_jobs
+        elements = enumerate(itr)
+        next_seq = 0
+
+        buffer_size = REORDER_FACTOR * window
+
+        def fill():
+            while len(in_flight) < window and len(finished) < buffer_size:
+                for seq, g in elements:
+                    job = submit(g)
+                    in_flight[job] = seq, g
+                    registered.add(job)
+                    break
+                else:
+                    return
+
+        def result(g, job: Future):
+            return (g, job.result()) if keep else job.result()
+
+        fill()
+
+        while in_flight or finished:
+            if next_seq in finished:
+                out = result(*finished.pop(next_seq))
+                next_seq += 1
+                fill()
+                yield out
+                continue
+
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                raise TimeoutError('no job completed in {} seconds'.format(timeout))
+
+            out = []
+
+            for job in done:
+                seq, g = in_flight.pop(job)
+                registered.discard(job)
+
+                if ordered:
+                    finished[seq] = g, job
+                else:
+                    out.append((g, job))
+
+            fill()
+
+            for g, job in out:
+                yield result(g, job)
 
     def _submit_job(self, func, g) -> Future:
         """
-        Submits job to executor.
+        Submits job to executor. For short-circuiting operations, job is run
+        only if stream has not been cancelled (see "cancel") by the time a
+        worker picks it.
 
         :param func:
         :param g:
         :return:
         """
 
-        return self._exec.submit(func, g)
+        if self._local and self._short_circuit:
+            if self._cancel_token is None:
+                self._cancel_token = CancelToken(self._processes)
+
+            func = partial(run_cancellable, self._cancel_token, func)
+
+        if self._transport is None:
+            return self._exec.submit(func, g)
+
+        return self._transport.submit(self._exec, func, g)
+
+    def cancel(self):
+        """
+        cancels jobs of stream: submission stops as stream is not consumed further,
+        jobs waiting in executor are cancelled (or skipped, if already handed to a
+        worker) and running jobs can stop early by checking "cancelled" (see
+        streamAPI.stream.cancel). It is done by terminal operations once their
+        result is known.
+        """
+
+        if self._cancel_token is not None:
+            self._cancel_token.set()
+
+        for worker in self._registered_jobs:
+            worker.cancel()
+
+        if self._cancel_token is not None:
+            self._cancel_token.close_after(self._registered_jobs)
+
+        self._registered_jobs.clear()
+
+    def _close_contexts(self, running: Iterable[Future]):
+        """
+        tears down contexts of thread workers, once jobs which may still
+        be using them are done.
+
+        :param running: jobs in flight when stream got cancelled.
+        """
+
+        if not self._processes:
+            wait(running)
+
+        for context in self._contexts:
+            context.close()
+
+        self._contexts.clear()
 
     @staticmethod
-    def _stop_all_jobs(terminal_op):
+    def _stop_all_jobs(terminal_op, lazy: bool = False):
         """
-        creates decorator, to terminate all waiting or redundant running jobs.
+        creates decorator, to terminate all waiting or redundant running jobs,
+        and to shut down executor created by stream.
 
         :param terminal_op:
+        :param lazy: True if "terminal_op" returns iterator, in which case
+                     jobs are cancelled and executor is shut down once iterator
+                     is exhausted or closed.
         :return:
         """
 
         @wraps(terminal_op)
         def f(self: 'Exec', *args, **kwargs):
-            out = terminal_op(self, *args, **kwargs)
+            if lazy:
+                return self._iterate(terminal_op(self, *args, **kwargs))
 
-            for worker in self._registered_jobs:
-                worker.cancel()
+            try:
+                return terminal_op(self, *args, **kwargs)
+            finally:
+                running = list(self._registered_jobs)
 
-            return out
+                self.cancel()
+                self._shutdown(running, wait_jobs=False)
 
         return f
 
+    @staticmethod
+    def _short_circuiting(op):
+        """
+        decorator for operations (find_first, any, all, limit ...) whose result can
+        be known before all jobs are done; jobs of stream are then given cancel
+        token, so that running jobs can stop early and pending ones are skipped.
+        """
+
+        @wraps(op)
+        def f(self: 'Exec', *args, **kwargs):
+            self._short_circuit = True
+            return op(self, *args, **kwargs)
+
+        return f
+
+    def _iterate(self, itr: Iterable[T]) -> Iterable[T]:
+        """
+        yields elements of "itr"; once it is exhausted or closed, jobs
+        still in flight are cancelled and stream is shut down (see "_shutdown").
+
+        :param itr:
+        :return:
+        """
+
+        try:
+            yield from itr
+        finally:
+            running = list(self._registered_jobs)
+
+            self.cancel()
+            self._shutdown(running, wait_jobs=False)
+
 
 class ParallelStream(Exec[T]):
     def __init__(self, data: Iterable[T],
-                 worker: int,
-                 multiprocessing: bool = True):
+                 worker: int = None,
+                 multiprocessing: bool = True,
+                 pool: WorkerPool = None,
+                 transport: SharedMemoryTransport = None,
+                 executor: Executor = None):
         """
         Creates a parallel stream.
 
+        Executor is created per stream, unless "pool" or "executor" is given; pools
+        are long lived and can be shared by many streams (see WorkerPool and get_pool).
+        Jobs can be run on worker daemons of other machines by RemoteExecutor.
+
+        Example:
+            with WorkerPool(4, preload=('numpy',)) as pool:
+                ParallelStream(range(100), pool=pool).map_concurrent(func).as_seq()
+
+            with RemoteExecutor(['host1:7000', 'host2:7000']) as executor:
+                ParallelStream(range(100), executor=executor).map_concurrent(func).as_seq()
+
         :param data:
         :param worker: number of worker
         :param multiprocessing: it True then multiprocessing is used else multiThreading.
+                                Ignored if "pool" is given.
+        :param pool:
+        :param transport: if given, large buffers (bytes, numpy arrays) of elements
+                          and results are sent to process workers through shared
+                          memory instead of pickling them (see SharedMemoryTransport).
+        :param executor: borrowed executor, for example RemoteExecutor.
         """
 
-        super().__init__(data=data, worker=worker, multiprocessing=multiprocessing)
+        super().__init__(data=data, worker=worker, multiprocessing=multiprocessing, pool=pool,
+                         transport=transport, executor=executor)
 
     @staticmethod
     def _batch_process(func: Function[T, X], gs: Iterable[T]) -> Iterable[X]:
@@ -116,8 +424,18 @@ class ParallelStream(Exec[T]):
 
         return tuple(func(g) for g in gs)
 
+    @property
+    def dispatcher(self) -> AdaptiveDispatch:
+        """
+        AdaptiveDispatch used by batch_processor, if dispatch size is chosen
+        automatically; it can be used to inspect chosen dispatch sizes.
+        """
+
+        return self._dispatcher
+
     @check_pipeline
-    def batch_processor(self, func: Function[T, X], dispatch_size: int, timeout=None):
+    def batch_processor(self, func: Function[T, X], dispatch_size: Union[int, str, AdaptiveDispatch],
+                        timeout=None, ordered: bool = True):
         """
         This method is advised to be invoked when using MultiProcessing.
 
@@ -127,69 +445,545 @@ class ParallelStream(Exec[T]):
         of stream elements will be sent to each processor(worker) in one go.
         Note that number of worker used will be same as "_worker".
 
+        If "dispatch_size" is 'auto' (or an AdaptiveDispatch), dispatch size is
+        adjusted while processing, so that each dispatch takes about target time
+        (see AdaptiveDispatch); chosen sizes can be inspected using "dispatcher".
+
+        Example:
+            stream = ParallelStream(range(10 ** 5), worker=4).batch_processor(func, 'auto')
+            stream.done()
+            stream.dispatcher.sizes -> deque([1, 1, 1, 1, 4, 16, 64, ...])
+
         :param func:
         :param dispatch_size: number of stream elements to be given to each worker
                               in one go.
         :param timeout: time to wait for task to be done, if None then there is no
                         limit on execution time.
+        :param ordered: if True, results are in order of stream elements.
+        :return:
+        """
+
+        if dispatch_size == 'auto':
+            dispatch_size = AdaptiveDispatch()
+
+        if not isinstance(dispatch_size, AdaptiveDispatch):
+            return (self.batch(dispatch_size)
+                    .map_concurrent(partial(ParallelStream._batch_process, func), timeout=timeout, ordered=ordered)
+                    .flat_map())
+
+        self._dispatcher = dispatch_size
+        submit = partial(dispatch_size.submit, self._submit_job, func)
+
+        self._pointer = (Stream(self._sliding_window(submit, dispatch_size.chunks(self._pointer),
+                                                     self._worker, timeout, ordered))
+                         .map(itemgetter(0)))
+
+        return self.flat_map()
+
+    @staticmethod
+    def _section(builder: Function[Stream, Stream]):
+        """
+        records section built by "builder" on an empty Stream. If section
+        consists only of element-wise operations (map, filter, peek), their
+        fused stages are returned, so that only functions of operations (not
+        "builder") have to be sent to workers; otherwise "builder" is returned.
+
+        :param builder:
+        :return:
+        """
+
+        source = iter(())
+        record = builder(Stream(source))
+
+        if (isinstance(record, Stream) and record._source is source
+                and all(node.element_wise for node in record._plan)):
+            return tuple((node.kind, node.func) for node in record._plan)
+
+        return builder
+
+    @staticmethod
+    def _run_section(section, chunk: Sequence[T]) -> list:
+        """
+        runs section on a chunk of stream elements in worker.
+
+        :param section: fused stages or builder (see "_section").
+        :param chunk:
+        :return:
+        """
+
+        if isinstance(section, tuple):
+            return list(fuse(iter(chunk), section))
+
+        return section(Stream(chunk)).as_seq()
+
+    @check_pipeline
+    def parallel_section(self, builder: Function[Stream, Stream], chunk_size: int = CHUNK_SIZE,
+                         timeout=None, ordered: bool = True) -> 'ParallelStream':
+        """
+        runs a section of pipeline, built by "builder" on a Stream, inside workers.
+        Each worker runs whole section on a chunk of "chunk_size" elements and sends
+        back only final elements of section; so an element is sent to a worker once,
+        instead of once per concurrent operation.
+
+        Example:
+            (ParallelStream(docs, worker=4)
+             .parallel_section(lambda s: s.map(parse).filter(is_valid).map(featurize))
+             .as_seq())
+
+        Section is applied on each chunk independently, so it should consist of
+        element-wise operations; operations like limit, sort or distinct work per chunk.
+
+        For multiprocessing, functions used in section have to be picklable. If
+        section has only map, filter and peek, "builder" itself is run in parent
+        (and can be a lambda); otherwise "builder" is sent to workers.
+
+        :param builder: takes a Stream and returns Stream after adding operations of section.
+        :param chunk_size: number of elements processed by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :param ordered: if True, results are in order of stream elements.
+        :return: ParallelStream itself
+        """
+
+        assert chunk_size > 0, 'chunk size must be positive'
+
+        func = partial(ParallelStream._run_section, ParallelStream._section(builder))
+
+        self._pointer = Stream(self._sliding_window(partial(self._submit_job, func),
+                                                    divide_in_chunk(self._pointer, chunk_size),
+                                                    self._worker, timeout, ordered))
+
+        return self.flat_map()
+
+    @check_pipeline
+    def map_concurrent(self, func: Function[T, X], timeout=None, batch_size=None,
+                       ordered: bool = True, speculation: Speculation = None) -> 'ParallelStream[T]':
+        """
+        maps elements concurrently. At most "batch_size" elements are processed
+        at a time; next element is submitted as soon as one of them is done.
+
+        If "speculation" is given, straggling jobs get duplicates and failed elements
+        are retried; elements failing even then are dropped and collected by
+        "speculation" instead of being raised (see Speculation).
+
+        Example:
+            spec = Speculation(percentile=95, retries=2, backoff=0.5)
+            ParallelStream(tiles, worker=8).map_concurrent(render, speculation=spec).for_each(save)
+            spec.failed -> [(tile, exception), ...]
+
+        :param func:
+        :param timeout: time to wait for task to be done, if None then there is no
+                        limit on execution time.
+        :param batch_size: If it is None then number of worker is used.
+        :param ordered: if True, mapped elements are in order of stream elements
+                        otherwise in order of completion.
+        :param speculation:
         :return:
         """
 
-        return (self.batch(dispatch_size)
-                .map_concurrent(partial(ParallelStream._batch_process, func), timeout=timeout)
-                .flat_map())
+        if speculation is None:
+            self._pointer = self._parallel_processor(func, timeout=timeout, batch_size=batch_size, ordered=ordered)
+            return self
+
+        batch_size = batch_size or self._worker
+        assert batch_size > 0, 'Batch size must be positive.'
+
+        self._pointer = speculative_window(partial(self._submit_job, func), iter(self._pointer), batch_size,
+                                           timeout, ordered, speculation, self._registered_jobs)
+        return self
 
     @check_pipeline
-    def map_concurrent(self, func: Function[T, X], timeout=None, batch_size=None) -> 'ParallelStream[T]':
+    def map_with_context(self, func: Callable[[X, T], Y], init: Callable[[], X],
+                         teardown: Function[X, Any] = None, timeout=None, batch_size=None,
+                         ordered: bool = True) -> 'ParallelStream[Y]':
         """
-        maps elements concurrently. Elements are processed in batches of size "batch_size".
+        maps elements concurrently like "map_concurrent", calling "func(ctx, element)";
+        "ctx" is created by "init" once per worker thread or process (on its first
+        job) and reused for rest of the elements handled by that worker.
+
+        "teardown" is called with each context once it is not needed: for thread
+        workers, after terminal operation (once running jobs are done); for process
+        workers, on exit of worker process (see WorkerContext).
+
+        Example:
+            def insert(conn, row):
+                conn.execute(INSERT, row)
+                return row.id
+
+            (ParallelStream(rows, worker=8, multiprocessing=False)
+             .map_with_context(insert, init=lambda: DB(dsn).conn, teardown=lambda conn: conn.close())
+             .as_seq())
 
         :param func:
+        :param init:
+        :param teardown:
         :param timeout: time to wait for task to be done, if None then there is no
                         limit on execution time.
         :param batch_size: If it is None then number of worker is used.
+        :param ordered: if True, mapped elements are in order of stream elements
+                        otherwise in order of completion.
         :return:
         """
 
-        self._pointer = self._parallel_processor(func, timeout=timeout, batch_size=batch_size)
+        context = WorkerContext(init, teardown)
+        self._contexts.append(context)
+
+        self._pointer = self._parallel_processor(partial(run_with_context, context, func), timeout=timeout,
+                                                 batch_size=batch_size, ordered=ordered)
         return self
 
+    @staticmethod
+    def _test(predicate: Filter[T], g: T) -> bool:
+        return bool(predicate(g))
+
+    @staticmethod
+    def _survivors(predicate: Filter[T], gs: Sequence[T]) -> List[int]:
+        """
+        :return: indices of elements of "gs" satisfying "predicate".
+        """
+
+        return [i for i, g in enumerate(gs) if predicate(g)]
+
     @check_pipeline
-    def filter_concurrent(self, predicate: Filter[T], timeout=None, batch_size=None) -> 'ParallelStream[T]':
+    def filter_concurrent(self, predicate: Filter[T], timeout=None, batch_size=None,
+                          ordered: bool = True, chunk_size: int = None) -> 'ParallelStream[T]':
         """
-        filters elements concurrently. Elements are processed in batches of size "batch_size".
+        filters elements concurrently. At most "batch_size" elements are processed
+        at a time; next element is submitted as soon as one of them is done.
+
+        Elements are held by parent while they are being tested; workers send
+        back only outcome of "predicate" (or indices of surviving elements of a
+        chunk), not elements.
 
         :param predicate:
         :param timeout: time to wait for task to be done, if None then there is no
                         limit on execution time.
         :param batch_size: If it is None then number of worker is used.
+        :param ordered: if True, filtered elements are in order of stream elements
+                        otherwise in order of completion.
+        :param chunk_size: if given, elements are sent to workers in chunks of
+                           "chunk_size" elements.
         :return:
         """
 
-        def _predicate(g):
-            return predicate(g), g
+        batch_size = batch_size or self._worker
+        assert batch_size > 0, 'Batch size must be positive.'
+
+        if chunk_size is None:
+            submit = partial(self._submit_job, partial(self._test, predicate))
+            self._pointer = (Stream(self._sliding_window(submit, iter(self._pointer), batch_size,
+                                                         timeout, ordered, keep=True))
+                             .filter(itemgetter(1))
+                             .map(itemgetter(0)))
+        else:
+            submit = partial(self._submit_job, partial(self._survivors, predicate))
+            chunks = self._sliding_window(submit, divide_in_chunk(self._pointer, chunk_size),
+                                          batch_size, timeout, ordered, keep=True)
+            self._pointer = Stream(chunk[i] for chunk, survivors in chunks for i in survivors)
 
-        self._pointer = (self._parallel_processor(_predicate, timeout=timeout, batch_size=batch_size)
-                         .filter(itemgetter(0))
-                         .map(itemgetter(1)))
         return self
 
+    @check_pipeline
+    def partition_by(self, key: Function[T, Any], shards: int = None,
+                     chunk_size: int = CHUNK_SIZE, timeout=None) -> PartitionedStream[T]:
+        """
+        routes elements to "shards" shards by hash of their key, so that keyed
+        stateful operations (distinct, group_by, mapping, aggregate_by and
+        window_function per key) run on shards in parallel (see PartitionedStream).
+
+        Example:
+            (ParallelStream(events, worker=8)
+             .partition_by(itemgetter('user'), shards=32)
+             .aggregate_by(clicks='count', first='first'))
+
+        :param key:
+        :param shards: number of shards; if None then number of worker is used.
+        :param chunk_size: number of elements of a shard sent to a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done, for operations
+                        of PartitionedStream not given "timeout".
+        :return:
+        """
+
+        return PartitionedStream(self, key, shards or self._worker, chunk_size, timeout)
+
+    def _partials(self, func: Function[Sequence[T], Any], chunk_size: int, timeout) -> Iterable:
+        """
+        applies "func" on chunks of stream elements concurrently.
+
+        :param func: partial aggregation of a chunk.
+        :param chunk_size:
+        :param timeout:
+        :return: partial results in order of chunks.
+        """
+
+        assert chunk_size > 0, 'chunk size must be positive'
+
+        return self._sliding_window(partial(self._submit_job, func), divide_in_chunk(self._pointer, chunk_size),
+                                    self._worker, timeout, ordered=True)
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def reduce_concurrent(self, bi_func: BiFunction[X, X, X], initial_point: X = NIL,
+                          mapper: Function[T, X] = None, chunk_size: int = CHUNK_SIZE,
+                          timeout=None) -> Optional[X]:
+        """
+        This operation is one of the terminal operations
+        reduces stream elements like "reduce", but each worker reduces
+        a chunk of elements and parent reduces partial results pairwise
+        (tree reduce). Hence "bi_func" must be associative; order of elements is kept.
+
+        If "mapper" is given, elements are mapped by workers before reducing,
+        so that only partial results are sent back to parent.
+
+        Example:
+            ParallelStream(range(1, 6), worker=2).reduce_concurrent(operator.mul, chunk_size=2) -> Optional[120]
+            ParallelStream(words, worker=4).reduce_concurrent(operator.add, 0, mapper=len) -> Optional[total length]
+
+        :param bi_func:
+        :param initial_point:
+        :param mapper:
+        :param chunk_size: number of elements reduced by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :return: EMPTY if there are no elements and "initial_point" is not given.
+        """
+
+        out = combiner.tree_reduce(bi_func, self._partials(partial(combiner.partial_reduce, bi_func, mapper),
+                                                           chunk_size, timeout))
+
+        if initial_point is not NIL:
+            return Optional(initial_point if out is NIL else bi_func(initial_point, out))
+
+        return EMPTY if out is NIL else Optional(out)
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def count_concurrent(self, predicate: Filter[T] = None, chunk_size: int = CHUNK_SIZE, timeout=None) -> int:
+        """
+        This operation is one of the terminal operations
+        counts stream elements satisfying "predicate" (all elements if None);
+        predicate is evaluated by workers, which send back only counts.
+
+        Example:
+            ParallelStream(range(10), worker=2, multiprocessing=False).count_concurrent(lambda x: x % 3 == 0) -> 4
+
+        :param predicate:
+        :param chunk_size: number of elements counted by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :return:
+        """
+
+        return sum(self._partials(partial(combiner.partial_count, predicate), chunk_size, timeout))
+
+    @Exec._stop_all_jobs
+    @Exec._short_circuiting
+    @close_pipeline
+    @check_pipeline
+    def any_concurrent(self, predicate: Filter[T] = identity, timeout=None, batch_size=None) -> bool:
+        """
+        This operation is one of the terminal operations
+        returns True if any element satisfies "predicate", evaluated by workers.
+        Results are checked in order of completion, so a slow evaluation does not
+        delay the answer once another element satisfies "predicate"; then rest of
+        the jobs are cancelled (see "cancel").
+
+        Example:
+            ParallelStream(items, worker=8).any_concurrent(expensive_check)
+
+        :param predicate:
+        :param timeout: time to wait for any in-flight job to be done.
+        :param batch_size: maximum number of jobs in flight. If it is None then number
+                           of worker is used.
+        :return:
+        """
+
+        return any(self._parallel_processor(predicate, timeout=timeout, batch_size=batch_size, ordered=False))
+
+    @Exec._stop_all_jobs
+    @Exec._short_circuiting
+    @close_pipeline
+    @check_pipeline
+    def all_concurrent(self, predicate: Filter[T] = identity, timeout=None, batch_size=None) -> bool:
+        """
+        This operation is one of the terminal operations
+        returns True if all elements satisfy "predicate", evaluated by workers.
+        Like "any_concurrent", answer is known as soon as any element does not
+        satisfy "predicate"; then rest of the jobs are cancelled.
+
+        :param predicate:
+        :param timeout: time to wait for any in-flight job to be done.
+        :param batch_size: maximum number of jobs in flight. If it is None then number
+                           of worker is used.
+        :return:
+        """
+
+        return all(self._parallel_processor(predicate, timeout=timeout, batch_size=batch_size, ordered=False))
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def min_concurrent(self, comp=None, mapper: Function[T, X] = None,
+                       chunk_size: int = CHUNK_SIZE, timeout=None) -> Optional[X]:
+        """
+        This operation is one of the terminal operations
+        finds minimum element like "min"; each worker finds minimum of
+        a chunk of elements (mapped by "mapper", if given).
+
+        :param comp:
+        :param mapper:
+        :param chunk_size: number of elements processed by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :return:
+        """
+
+        partials = self._partials(partial(combiner.partial_min, comp, mapper), chunk_size, timeout)
+
+        try:
+            return Optional(min(partials, key=comp) if comp else min(partials))
+        except ValueError:
+            return EMPTY
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def max_concurrent(self, comp=None, mapper: Function[T, X] = None,
+                       chunk_size: int = CHUNK_SIZE, timeout=None) -> Optional[X]:
+        """
+        This operation is one of the terminal operations
+        finds maximum element like "max"; each worker finds maximum of
+        a chunk of elements (mapped by "mapper", if given).
+
+        :param comp:
+        :param mapper:
+        :param chunk_size: number of elements processed by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :return:
+        """
+
+        partials = self._partials(partial(combiner.partial_max, comp, mapper), chunk_size, timeout)
+
+        try:
+            return Optional(max(partials, key=comp) if comp else max(partials))
+        except ValueError:
+            return EMPTY
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def group_by_concurrent(self, key_hasher, value_mapper: Function[T, Y] = identity,
+                            value_container_clazz: GroupByValueType = ListType,
+                            chunk_size: int = CHUNK_SIZE, timeout=None) -> Dict[Any, Sequence[Y]]:
+        """
+        This operation is one of the terminal operations
+        groups stream elements like "group_by"; each worker groups a chunk of
+        elements and parent merges groups of chunks. Order of values in groups
+        is same as that of "group_by".
+
+        Example:
+            (ParallelStream(range(10), worker=2, multiprocessing=False)
+             .group_by_concurrent(lambda x: x % 3, chunk_size=4))
+            -> {0: [0, 3, 6, 9], 1: [1, 4, 7], 2: [2, 5, 8]}
+
+        :param key_hasher:
+        :param value_mapper:
+        :param value_container_clazz:
+        :param chunk_size: number of elements grouped by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :return:
+        """
+
+        func = partial(combiner.partial_group_by, key_hasher, value_mapper, value_container_clazz)
+        out = {}
+
+        for groups in self._partials(func, chunk_size, timeout):
+            combiner.merge_group_by(out, groups)
+
+        return out
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def mapping_concurrent(self, key_mapper: Function[T, Any], value_mapper: Function[T, Y] = identity,
+                           resolve: BiFunction[Y, Y, Y] = None,
+                           chunk_size: int = CHUNK_SIZE, timeout=None) -> Dict[Any, Y]:
+        """
+        This operation is one of the terminal operations
+        creates mapping like "mapping"; each worker creates mapping of a chunk
+        of elements and parent merges them. "resolve" must be associative.
+
+        :param key_mapper:
+        :param value_mapper:
+        :param resolve:
+        :param chunk_size: number of elements mapped by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :return:
+        """
+
+        func = partial(combiner.partial_mapping, key_mapper, value_mapper, resolve)
+        out = {}
+
+        for mapping in self._partials(func, chunk_size, timeout):
+            combiner.merge_mapping(out, mapping, resolve)
+
+        return out
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def aggregate_by_concurrent(self, key_hasher: Function[T, Any], chunk_size: int = CHUNK_SIZE,
+                                timeout=None, **aggs: Union[str, Aggregator]) -> Dict[Any, Dict[str, Any]]:
+        """
+        This operation is one of the terminal operations
+        aggregates groups like "aggregate_by"; each worker finds states of
+        aggregations for a chunk of elements and parent merges them
+        (using Aggregator.merge), so Custom aggregations require "merge".
+
+        Example:
+            (ParallelStream(range(10), worker=2, multiprocessing=False)
+             .aggregate_by_concurrent(lambda x: x % 2, n='count', total='sum'))
+            -> {0: {'n': 5, 'total': 20}, 1: {'n': 5, 'total': 25}}
+
+        :param key_hasher:
+        :param chunk_size: number of elements aggregated by a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done.
+        :param aggs: name of output -> aggregation
+        :return:
+        """
+
+        aggs = {name: as_aggregator(agg) for name, agg in aggs.items()}
+
+        for name, agg in aggs.items():
+            if not agg.mergeable:
+                raise ValueError("aggregation '{}' can not be merged; 'merge' is required "
+                                 "for parallel aggregation.".format(name))
+
+        out = {}
+
+        for groups in self._partials(partial(combiner.partial_aggregate, key_hasher, aggs), chunk_size, timeout):
+            merge_groups(out, groups, aggs)
+
+        return group_results(out, aggs)
+
     # terminal operation will trigger cancelling of submitted unnecessary jobs.
     partition = Exec._stop_all_jobs(Stream.partition)
     count = Exec._stop_all_jobs(Stream.count)
     min = Exec._stop_all_jobs(Stream.min)
     max = Exec._stop_all_jobs(Stream.max)
+    nsmallest = Exec._stop_all_jobs(Stream.nsmallest)
+    nlargest = Exec._stop_all_jobs(Stream.nlargest)
     group_by = Exec._stop_all_jobs(Stream.group_by)
+    aggregate_by = Exec._stop_all_jobs(Stream.aggregate_by)
     mapping = Exec._stop_all_jobs(Stream.mapping)
     as_seq = Exec._stop_all_jobs(Stream.as_seq)
-    all = Exec._stop_all_jobs(Stream.all)
-    any = Exec._stop_all_jobs(Stream.any)
-    none_match = Exec._stop_all_jobs(Stream.none_match)
-    find_first = Exec._stop_all_jobs(Stream.find_first)
+    all = Exec._stop_all_jobs(Exec._short_circuiting(Stream.all))
+    any = Exec._stop_all_jobs(Exec._short_circuiting(Stream.any))
+    none_match = Exec._stop_all_jobs(Exec._short_circuiting(Stream.none_match))
+    find_first = Exec._stop_all_jobs(Exec._short_circuiting(Stream.find_first))
+    limit = Exec._short_circuiting(Stream.limit)
     reduce = Exec._stop_all_jobs(Stream.reduce)
     done = Exec._stop_all_jobs(Stream.done)
     for_each = Exec._stop_all_jobs(Stream.for_each)
-    __iter__ = Exec._stop_all_jobs(Stream.__iter__)
+    __iter__ = Exec._stop_all_jobs(Stream.__iter__, lazy=True)
 
 
 if __name__ == 'streamAPI.stream.parallelStream':
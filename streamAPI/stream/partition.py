@@ -0,0 +1,454 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor as PPE, ThreadPoolExecutor as TPE
+from functools import partial
+from itertools import chain
+from typing import Any, Callable, Deque, Dict, Generic, Iterable, List, Sequence, Tuple, Union
+from uuid import uuid4
+
+from streamAPI.stream import combiner
+from streamAPI.stream.aggregator import Aggregator, as_aggregator, group_results, merge_groups
+from streamAPI.stream.cancel import _share_tracker
+from streamAPI.stream.stream import Stream
+from streamAPI.stream.streamHelper import GroupByValueType, ListType
+from streamAPI.utility.Types import BiFunction, Function, T, X, Y
+from streamAPI.utility.utils import get_functions_clazz, identity
+
+_state: Dict[Tuple[str, int], Any] = {}  # (key of run, shard) -> state of shard, in worker of its lane.
+
+
+def _run_builder(builder: Function[Stream, Stream], key: Function[T, Any],
+                 per_key: bool, shard: Sequence[T]) -> list:
+    """
+    runs "builder" on elements of a shard in worker, either on whole shard
+    or on elements of each key separately.
+
+    :param builder:
+    :param key:
+    :param per_key:
+    :param shard:
+    :return:
+    """
+
+    if not per_key:
+        return builder(Stream(shard)).as_seq()
+
+    return [out for group in _group(key, shard).values() for out in builder(Stream(group)).as_seq()]
+
+
+def _dedup(run: str, shard: int, chunk: Sequence[T]) -> List[T]:
+    """
+    drops elements of chunk seen earlier in shard; elements seen are kept
+    in worker of lane of shard.
+
+    :param run:
+    :param shard:
+    :param chunk:
+    :return: elements of chunk not seen earlier, in order.
+    """
+
+    seen = _state.setdefault((run, shard), set())
+    out = []
+
+    for g in chunk:
+        if g not in seen:
+            seen.add(g)
+            out.append(g)
+
+    return out
+
+
+def _hold(run: str, shard: int, chunk: Sequence[T]) -> list:
+    """
+    keeps chunk in worker of lane of shard, till shard is flushed.
+
+    :param run:
+    :param shard:
+    :param chunk:
+    :return: empty list
+    """
+
+    _state.setdefault((run, shard), []).extend(chunk)
+    return []
+
+
+def _flush(builder: Function[Stream, Stream], key: Function[T, Any], per_key: bool,
+           run: str, shard: int, _) -> list:
+    """
+    runs "builder" on elements of shard held by worker of lane (see "_run_builder").
+
+    :param builder:
+    :param key:
+    :param per_key:
+    :param run:
+    :param shard:
+    :return:
+    """
+
+    return _run_builder(builder, key, per_key, _state.pop((run, shard), []))
+
+
+def _drop(run: str, shards: Iterable[int]):
+    for shard in shards:
+        _state.pop((run, shard), None)
+
+
+def _run_window(func, n: int, key: Function[T, Any], job: Tuple[Dict[Any, tuple], Sequence[T]]) -> list:
+    """
+    applies "func" on sliding windows of "n" elements of each key of a chunk
+    of shard in worker. Windows start with last "n-1" elements of key in
+    earlier chunks ("tails"), so only windows ending in this chunk are made;
+    keys having less than "n" elements so far have no window.
+
+    :param func:
+    :param n:
+    :param key:
+    :param job: (key -> tail, chunk of shard)
+    :return:
+    """
+
+    tails, chunk = job
+    out = []
+
+    for k, group in _group(key, chunk).items():
+        tail = tails.get(k)
+        group = group if tail is None else [*tail, *group]
+
+        if len(group) >= n:
+            out.extend(Stream(group).window_function(func, n).as_seq())
+
+    return out
+
+
+def _group(key: Function[T, Any], shard: Sequence[T]) -> Dict[Any, List[T]]:
+    groups: Dict[Any, List[T]] = {}
+
+    for g in shard:
+        groups.setdefault(key(g), []).append(g)
+
+    return groups
+
+
+class PartitionedStream(Generic[T]):
+    """
+    Elements of a ParallelStream routed to a fixed number of shards by hash
+    of their key; all elements of a key are in same shard, in order of stream.
+    Keyed stateful operations (distinct, group_by, mapping, aggregate_by,
+    window_function per key) run on each shard in a worker, and outputs of
+    shards are merged in parent.
+
+    Parent holds at most "chunk_size" elements of each shard; a full chunk
+    is sent to a worker as a job right away (keeping as many jobs in flight
+    as ParallelStream does) and results of chunks of a shard are merged in
+    order of stream. So parent holds, apart from results, O(shards * chunk_size)
+    elements; window_function also keeps last "n-1" elements of each key.
+
+    "distinct" and "apply" on whole shards keep state of a shard (elements seen
+    or held) in a worker across chunks; so every chunk of a shard is sent to
+    same worker, of one of "lanes" (min(shards, worker) single worker executors,
+    of kind of stream, created for operation). Outputs of shards are disjoint,
+    and parent only concatenates them.
+
+    Example:
+        sessions = (ParallelStream(events, worker=8)
+                    .partition_by(itemgetter('user'), shards=32)
+                    .apply(sessionize, per_key=True)
+                    .as_seq())
+
+    For multiprocessing, functions given to operations have to be picklable.
+    """
+
+    def __init__(self, stream, key: Function[T, Any], shards: int, chunk_size: int, timeout=None):
+        """
+        :param stream: ParallelStream whose elements are partitioned.
+        :param key:
+        :param shards: number of shards
+        :param chunk_size: number of elements of a shard sent to a worker in one go.
+        :param timeout: time to wait for any in-flight job to be done, for operations
+                        not given "timeout" (aggregate_by takes none).
+        """
+
+        assert shards > 0, 'number of shards must be positive'
+        assert chunk_size > 0, 'chunk size must be positive'
+
+        self._stream = stream
+        self._key = key
+        self._shards = shards
+        self._chunk_size = chunk_size
+        self._timeout = timeout
+
+    @property
+    def shards(self) -> int:
+        return self._shards
+
+    def _partition(self, itr: Iterable[T], chunk_size: int = None) -> Iterable[Tuple[int, List[T]]]:
+        """
+        routes elements of "itr" to their shards; a shard is yielded as soon
+        as it has "chunk_size" elements, rest of shards once stream is consumed.
+
+        :param itr: elements of stream
+        :param chunk_size: if None then shards are yielded only once stream is consumed.
+        :return: generator of (shard, non empty chunk of shard); chunks of a shard are in order of stream.
+        """
+
+        key, shards = self._key, self._shards
+        out: List[List[T]] = [[] for _ in range(shards)]
+
+        for g in itr:
+            idx = hash(key(g)) % shards
+            shard = out[idx]
+            shard.append(g)
+
+            if len(shard) == chunk_size:
+                yield idx, shard
+                out[idx] = []
+
+        yield from ((idx, shard) for idx, shard in enumerate(out) if shard)
+
+    def _with_tails(self, chunks: Iterable[Tuple[int, List[T]]], n: int) -> Iterable[Tuple[Dict[Any, tuple], List[T]]]:
+        """
+        pairs each chunk with last "n-1" elements of its keys in earlier chunks.
+
+        :param chunks: (shard, chunk)
+        :param n: size of window
+        :return: generator of (key -> tail, chunk)
+        """
+
+        key = self._key
+        tails: Dict[Any, Deque[T]] = {}
+
+        for _, chunk in chunks:
+            carry, seen = {}, set()
+
+            for g in chunk:
+                k = key(g)
+                tail = tails.get(k)
+
+                if tail is None:
+                    tail = tails[k] = deque(maxlen=n - 1)
+
+                if k not in seen:
+                    seen.add(k)
+
+                    if tail:
+                        carry[k] = tuple(tail)
+
+                tail.append(g)
+
+            yield carry, chunk
+
+    def _run(self, func: Function[Sequence[T], X], timeout, jobs: Iterable = None):
+        """
+        sets results of "func" on each job (in order of jobs) as elements of stream.
+
+        :param func:
+        :param timeout: time to wait for any in-flight job to be done.
+        :param jobs: if None then chunks of shards are jobs.
+        :return: ParallelStream
+        """
+
+        stream = self._stream
+        timeout = self._timeout if timeout is None else timeout
+
+        if jobs is None:
+            jobs = (chunk for _, chunk in self._partition(stream._pointer, self._chunk_size))
+
+        stream._pointer = Stream(stream._sliding_window(partial(stream._submit_job, func), jobs,
+                                                        stream._worker, timeout, ordered=True))
+
+        return stream
+
+    def _lanes(self) -> List[Executor]:
+        """
+        :return: single worker executors, of kind of stream; jobs of a lane
+                 run in one worker in order of submission.
+        """
+
+        stream = self._stream
+        lanes = min(self._shards, stream._worker)
+
+        if stream._processes:
+            _share_tracker()  # before workers are started, see cancel.py
+            return [PPE(max_workers=1) for _ in range(lanes)]
+
+        return [TPE(max_workers=1) for _ in range(lanes)]
+
+    def _run_lanes(self, jobs: Iterable[Tuple[Callable, int, Any]], timeout):
+        """
+        sets results of jobs (in order of jobs) as elements of stream; job
+        (func, shard, payload) runs as "func(run, shard, payload)" on lane
+        of shard, so that state of shard is kept in one worker.
+
+        :param jobs:
+        :param timeout: time to wait for any in-flight job to be done.
+        :return: ParallelStream
+        """
+
+        stream = self._stream
+        stream._pointer = Stream(self._on_lanes(jobs, self._timeout if timeout is None else timeout))
+
+        return stream
+
+    def _on_lanes(self, jobs: Iterable[Tuple[Callable, int, Any]], timeout) -> Iterable:
+        lanes = self._lanes()
+        run = uuid4().hex
+
+        def submit(job) -> Future:
+            func, shard, payload = job
+            return lanes[shard % len(lanes)].submit(func, run, shard, payload)
+
+        try:
+            yield from self._stream._sliding_window(submit, jobs, self._stream._worker, timeout, ordered=True)
+        finally:
+            shards = range(self._shards)
+
+            for idx, lane in enumerate(lanes):
+                lane.submit(_drop, run, shards[idx::len(lanes)])  # states left by cancelled jobs.
+                lane.shutdown(wait=False)
+
+    def apply(self, builder: Function[Stream, Stream], per_key: bool = False,
+              chunked: bool = False, timeout=None):
+        """
+        runs section of pipeline, built by "builder" on a Stream, on each shard
+        in workers; outputs of shards are concatenated.
+
+        By default, "builder" sees whole shard (or all elements of a key);
+        chunks of a shard are held by worker of its lane (see PartitionedStream)
+        till stream is exhausted. If "builder" can work on parts of a shard
+        (for example, it only maps and filters), "chunked" should be True, so
+        that chunks of shards are processed by any worker as they fill.
+
+        Example:
+            def latest(events: Stream) -> Stream:
+                return events.sort(itemgetter('ts'), reverse=True).limit(1)
+
+            ParallelStream(events, worker=8).partition_by(itemgetter('user')).apply(latest, per_key=True)
+
+        :param builder: takes a Stream and returns Stream after adding operations.
+        :param per_key: if True, "builder" is run on elements of each key separately,
+                        otherwise on whole shard.
+        :param chunked: if True, "builder" is run on each chunk of shard.
+        :param timeout:
+        :return: ParallelStream having outputs of shards as elements.
+        """
+
+        if chunked:
+            return self._run(partial(_run_builder, builder, self._key, per_key), timeout).flat_map()
+
+        flush = partial(_flush, builder, self._key, per_key)
+        chunks = ((_hold, idx, chunk) for idx, chunk in self._partition(self._stream._pointer, self._chunk_size))
+
+        return self._run_lanes(chain(chunks, ((flush, idx, None) for idx in range(self._shards))), timeout).flat_map()
+
+    def distinct(self, timeout=None):
+        """
+        removes duplicate elements; worker of lane of a shard (see PartitionedStream)
+        keeps elements seen in shard and drops them from later chunks. Equal
+        elements have equal keys, so they are in same shard, and parent only
+        concatenates outputs of shards.
+
+        :param timeout:
+        :return: ParallelStream
+        """
+
+        jobs = ((_dedup, idx, chunk) for idx, chunk in self._partition(self._stream._pointer, self._chunk_size))
+
+        return self._run_lanes(jobs, timeout).flat_map()
+
+    def window_function(self, func, n: int, timeout=None):
+        """
+        applies "func" on sliding windows of "n" elements of each key
+        (see Stream.window_function); keys having less than "n" elements
+        have no window.
+
+        :param func:
+        :param n:
+        :param timeout:
+        :return: ParallelStream
+        """
+
+        assert n > 0, 'window size must be positive'
+
+        jobs = self._with_tails(self._partition(self._stream._pointer, self._chunk_size), n)
+
+        return self._run(partial(_run_window, func, n, self._key), timeout, jobs).flat_map()
+
+    def _merge(self, func: Function[Sequence[T], dict], merge: BiFunction[dict, dict, Any], timeout) -> dict:
+        """
+        runs "func", grouping by partition key, on each chunk of shard in a
+        worker and merges results of chunks in order of stream using "merge".
+
+        :param func: partial result of a chunk.
+        :param merge: merges partial result of later chunk into first argument.
+        :param timeout:
+        :return:
+        """
+
+        out = {}
+        self._run(func, timeout).for_each(partial(merge, out))
+
+        return out
+
+    def group_by(self, value_mapper: Function[T, Y] = identity,
+                 value_container_clazz: GroupByValueType = ListType, timeout=None) -> Dict[Any, Sequence[Y]]:
+        """
+        groups elements by partition key (see Stream.group_by), each shard in a worker.
+
+        :param value_mapper:
+        :param value_container_clazz:
+        :param timeout:
+        :return:
+        """
+
+        return self._merge(partial(combiner.partial_group_by, self._key, value_mapper, value_container_clazz),
+                           combiner.merge_group_by, timeout)
+
+    def mapping(self, value_mapper: Function[T, Y] = identity,
+                resolve: BiFunction[Y, Y, Any] = None, timeout=None) -> Dict[Any, Any]:
+        """
+        maps partition key to value of elements (see Stream.mapping), each shard in
+        a worker; "resolve" must be associative, as chunks are mapped separately.
+
+        :param value_mapper:
+        :param resolve:
+        :param timeout:
+        :return:
+        """
+
+        return self._merge(partial(combiner.partial_mapping, self._key, value_mapper, resolve),
+                           partial(combiner.merge_mapping, resolve=resolve), timeout)
+
+    def aggregate_by(self, **aggs: Union[str, Aggregator]) -> Dict[Any, Dict[str, Any]]:
+        """
+        aggregates elements by partition key (see Stream.aggregate_by), each shard in
+        a worker; states of chunks are merged, so Custom aggregations require "merge".
+        Partition key takes place of "key_hasher", so any output name can be used;
+        timeout is given to "partition_by".
+
+        Example:
+            stream.partition_by(itemgetter('user'), timeout=60).aggregate_by(clicks='count', timeout='max')
+
+        :param aggs: name of output -> aggregation
+        :return:
+        """
+
+        aggs = {name: as_aggregator(agg) for name, agg in aggs.items()}
+
+        for name, agg in aggs.items():
+            if not agg.mergeable:
+                raise ValueError("aggregation '{}' can not be merged; 'merge' is required "
+                                 "for parallel aggregation.".format(name))
+
+        out = self._merge(partial(combiner.partial_aggregate, self._key, aggs),
+                          partial(merge_groups, aggs=aggs), None)
+
+        return group_results(out, aggs)
+
+    def __str__(self):
+        return '{}(shards={})'.format(type(self).__name__, self._shards)
+
+    def __repr__(self):
+        return str(self)
+
+
+if __name__ == 'streamAPI.stream.partition':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,245 @@
+from heapq import nlargest, nsmallest
+from itertools import islice
+from typing import Callable, Iterable, List, Optional as Opt, Sequence
+
+from streamAPI.stream.fusion import FILTER, MAP, PEEK, fuse
+from streamAPI.stream.spill import external_sort
+from streamAPI.utility.Types import X
+from streamAPI.utility.utils import get_functions_clazz
+
+# kinds of node, other than element-wise nodes(map, filter and peek),
+# which are understood by optimizer.
+SKIP = 'skip'
+LIMIT = 'limit'
+SORT = 'sort'
+TOP_K = 'top_k'
+DISTINCT = 'distinct'
+
+ELEMENT_WISE = frozenset((MAP, FILTER, PEEK))
+
+
+class Node:
+    """
+    A node in logical plan of Stream.
+
+    Element-wise nodes (map, filter, peek) carry "func" and are fused together
+    at execution. Rest of the nodes carry "apply" which takes iterator of upstream
+    elements and returns iterator of transformed elements.
+
+    "params" are used by optimizer to rewrite plan and by "explain" to
+    describe the node.
+    """
+
+    def __init__(self, kind: str, func: Callable = None,
+                 apply: Callable[[Iterable], Iterable] = None,
+                 pure: bool = False, **params):
+        self.kind = kind
+        self.func = func
+        self.apply = apply
+        self.pure = pure
+        self.params = params
+
+    @property
+    def element_wise(self) -> bool:
+        return self.kind in ELEMENT_WISE
+
+    def __str__(self):
+        args = ['{}={}'.format(k, _name(v)) for k, v in self.params.items()]
+
+        if self.func is not None:
+            args.insert(0, _name(self.func))
+
+        if self.pure:
+            args.append('pure')
+
+        return '{}({})'.format(self.kind, ', '.join(args))
+
+    def __repr__(self):
+        return str(self)
+
+
+def _name(o) -> str:
+    return getattr(o, '__name__', None) or repr(o)
+
+
+# ------------------------------ node factories ------------------------------
+
+def skip_node(n: int) -> Node:
+    return Node(SKIP, apply=lambda itr: islice(itr, n, None), n=n)
+
+
+def limit_node(n: int) -> Node:
+    return Node(LIMIT, apply=lambda itr: islice(itr, n), n=n)
+
+
+def sort_node(comp=None, reverse: bool = False, memory_limit: int = None) -> Node:
+    if memory_limit is None:
+        return Node(SORT, apply=lambda itr: iter(sorted(itr, key=comp, reverse=reverse)),
+                    comp=comp, reverse=reverse)
+
+    return Node(SORT, apply=lambda itr: external_sort(itr, key=comp, reverse=reverse,
+                                                      memory_limit=memory_limit),
+                comp=comp, reverse=reverse, memory_limit=memory_limit)
+
+
+def top_k_node(k: int, comp=None, reverse: bool = False) -> Node:
+    return Node(TOP_K, apply=lambda itr: iter(top_k(itr, k, comp=comp, reverse=reverse)),
+                k=k, comp=comp, reverse=reverse)
+
+
+def top_k(itr: Iterable[X], k: int, comp=None, reverse: bool = False) -> List[X]:
+    """
+    Finds first "k" elements of sorted(itr, key=comp, reverse=reverse)
+    using a heap of size "k", that is in O(n log k) time and O(k) memory.
+
+    :param itr:
+    :param k:
+    :param comp:
+    :param reverse:
+    :return:
+    """
+
+    return (nlargest if reverse else nsmallest)(k, itr, key=comp)
+
+
+# -------------------------------- optimizer ---------------------------------
+
+def _slice_before_pure_map(nodes: List[Node]) -> Opt[List[Node]]:
+    """
+    map(f).skip(n) -> skip(n).map(f) and map(f).limit(n) -> limit(n).map(f)
+    provided "f" is pure; skipped elements are not mapped at all.
+    """
+
+    for idx in range(len(nodes) - 1):
+        a, b = nodes[idx], nodes[idx + 1]
+
+        if a.kind == MAP and a.pure and b.kind in (SKIP, LIMIT):
+            return nodes[:idx] + [b, a] + nodes[idx + 2:]
+
+
+def _sort_limit_to_top_k(nodes: List[Node]) -> Opt[List[Node]]:
+    """
+    sort(comp, reverse).limit(k) -> top_k(k, comp, reverse)
+    """
+
+    for idx in range(len(nodes) - 1):
+        a, b = nodes[idx], nodes[idx + 1]
+
+        if a.kind == SORT and b.kind == LIMIT:
+            node = top_k_node(b.params['n'], a.params['comp'], a.params['reverse'])
+            return nodes[:idx] + [node] + nodes[idx + 2:]
+
+
+RULES = (_slice_before_pure_map, _sort_limit_to_top_k)
+
+
+def optimize(nodes: Sequence[Node]) -> List[Node]:
+    """
+    Rewrites logical plan by applying RULES till none of them
+    can be applied.
+
+    :param nodes:
+    :return: optimized plan
+    """
+
+    nodes = list(nodes)
+    rewritten = True
+
+    while rewritten:
+        rewritten = False
+
+        for rule in RULES:
+            out = rule(nodes)
+
+            if out is not None:
+                nodes, rewritten = out, True
+
+    return nodes
+
+
+def distinct_count(nodes: Sequence[Node]) -> bool:
+    """
+    Checks if terminal operation "count" can be answered as cardinality
+    of a set, i.e. plan ends with distinct node.
+
+    :param nodes:
+    :return:
+    """
+
+    return bool(nodes) and nodes[-1].kind == DISTINCT and not nodes[-1].params
+
+
+def execute(itr: Iterable[X], nodes: Sequence[Node]) -> Iterable:
+    """
+    Builds iterator from "itr" using "nodes". Consecutive element-wise
+    nodes are fused together.
+
+    :param itr:
+    :param nodes:
+    :return:
+    """
+
+    stages = []
+
+    for node in nodes:
+        if node.element_wise:
+            stages.append((node.kind, node.func))
+        else:
+            itr = node.apply(fuse(itr, stages))
+            stages = []
+
+    return fuse(itr, stages)
+
+
+def explain(nodes: Sequence[Node], terminal: str = None) -> str:
+    """
+    Describes logical and optimized plan.
+
+    :param nodes:
+    :param terminal: name of terminal operation, if any.
+    :return:
+    """
+
+    optimized = optimize(nodes)
+    lines = ['== logical plan ==', 'source']
+    lines.extend(map(str, nodes))
+
+    if terminal is not None:
+        lines.append(terminal + '()')
+
+    lines.extend(('== optimized plan ==', 'source'))
+
+    stages = []
+
+    for node in optimized:
+        if node.element_wise:
+            stages.append(node)
+            continue
+
+        if stages:
+            lines.append(_describe_fused(stages))
+            stages = []
+
+        lines.append(str(node))
+
+    if terminal == 'count' and distinct_count(optimized):
+        lines[-1] = 'count(len(set)) # distinct().count() as set cardinality'
+    else:
+        if stages:
+            lines.append(_describe_fused(stages))
+
+        if terminal is not None:
+            lines.append(terminal + '()')
+
+    return '\n'.join(lines)
+
+
+def _describe_fused(stages: Sequence[Node]) -> str:
+    if len(stages) == 1:
+        return str(stages[0])
+
+    return 'fused[{}]'.format(', '.join(map(str, stages)))
+
+
+if __name__ == 'streamAPI.stream.plan':
+    __all__ = get_functions_clazz(__name__, __file__)
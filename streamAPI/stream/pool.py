@@ -0,0 +1,217 @@
+from atexit import register
+from concurrent.futures import Executor, ProcessPoolExecutor as PPE, ThreadPoolExecutor as TPE, wait
+from importlib import import_module
+from multiprocessing import get_context
+from threading import Barrier, BrokenBarrierError, Lock
+from typing import Dict, Iterable, Sequence
+
+from streamAPI.stream.cancel import _share_tracker
+from streamAPI.utility.utils import get_functions_clazz
+
+WARM_UP_TIMEOUT = 60  # seconds to wait for all workers to be started.
+
+_barrier: Barrier = None  # barrier of warm up jobs, in worker process.
+
+
+def _preload(modules: Sequence[str]):
+    """
+    imports modules in worker, so that first job submitted
+    to worker does not have to pay for it.
+
+    :param modules:
+    """
+
+    for module in modules:
+        import_module(module)
+
+
+def _init_process(modules: Sequence[str], barrier: Barrier):
+    """
+    initializer of process worker; barrier can reach process only
+    by inheritance, so it is kept for warm up jobs.
+
+    :param modules:
+    :param barrier:
+    """
+
+    global _barrier
+    _barrier = barrier
+
+    _preload(modules)
+
+
+def _warm_up(barrier: Barrier = None):
+    """
+    blocks worker till every worker has picked a warm up job, so that no
+    worker picks two of them; executor starts a new worker for a job only
+    if no worker is idle.
+
+    :param barrier: barrier of thread workers; process workers use
+                    barrier given by initializer.
+    """
+
+    try:
+        (barrier or _barrier).wait(WARM_UP_TIMEOUT)
+    except BrokenBarrierError:  # a worker could not be started in time.
+        pass
+
+
+class WorkerPool:
+    """
+    Long lived pool of workers which can be shared by many ParallelStream.
+    Unlike executor created by ParallelStream itself, pool is not shut down
+    when stream is consumed; it has to be shut down explicitly, or by
+    using it as context manager.
+
+    Example:
+        with WorkerPool(4, start_method='forkserver', preload=('numpy',)) as pool:
+            for file in files:
+                ParallelStream(csv_itr(file), pool=pool).batch_processor(parse, 100).done()
+
+    Pools can also be shared using registry; see "get_pool".
+    """
+
+    def __init__(self, worker: int, multiprocessing: bool = True,
+                 start_method: str = None, preload: Sequence[str] = (),
+                 warm_up: bool = True):
+        """
+        :param worker: number of worker
+        :param multiprocessing: it True then multiprocessing is used else multiThreading.
+        :param start_method: fork, forkserver or spawn; if None then default
+                             start method of platform is used. Used only for multiprocessing.
+        :param preload: name of modules to be imported in each worker on its start.
+        :param warm_up: if True, workers are started right away rather than on first job.
+        """
+
+        assert worker > 0, 'number of worker must be positive'
+
+        self._worker = worker
+        self._multiprocessing = multiprocessing
+        self._shutdown = False
+
+        if multiprocessing:
+            _share_tracker()  # workers then share resource tracker of process, see cancel.py
+
+            context = get_context(start_method)
+            self._barrier = context.Barrier(worker)
+            self._exec: Executor = PPE(max_workers=worker, mp_context=context,
+                                       initializer=_init_process, initargs=(tuple(preload), self._barrier))
+        else:
+            initializer = dict(initializer=_preload, initargs=(tuple(preload),)) if preload else {}
+
+            self._barrier = Barrier(worker)
+            self._exec: Executor = TPE(max_workers=worker, **initializer)
+
+        if warm_up:
+            self.warm_up()
+
+    @property
+    def worker(self) -> int:
+        return self._worker
+
+    @property
+    def multiprocessing(self) -> bool:
+        return self._multiprocessing
+
+    @property
+    def executor(self) -> Executor:
+        if self._shutdown:
+            raise RuntimeError('pool has been shut down.')
+
+        return self._exec
+
+    @property
+    def closed(self) -> bool:
+        return self._shutdown
+
+    def warm_up(self):
+        """
+        starts all workers (importing "preload" modules) by submitting a
+        warm up job to each of them; warm up jobs wait for each other,
+        so each of them is run by a different worker.
+        """
+
+        self._barrier.reset()
+        args = () if self._multiprocessing else (self._barrier,)
+
+        wait([self.executor.submit(_warm_up, *args) for _ in range(self._worker)])
+
+    def shutdown(self, wait: bool = True):
+        """
+        shuts down workers of pool.
+
+        :param wait: if True, waits for submitted jobs to be completed.
+        """
+
+        self._shutdown = True
+        self._exec.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def __str__(self):
+        return '{}(worker={}, multiprocessing={})'.format(type(self).__name__, self._worker, self._multiprocessing)
+
+    def __repr__(self):
+        return str(self)
+
+
+_POOLS: Dict[str, WorkerPool] = {}
+_LOCK = Lock()
+
+
+def get_pool(name: str = 'default', worker: int = None, multiprocessing: bool = True, **kwargs) -> WorkerPool:
+    """
+    returns shared pool registered with "name"; pool is created if it
+    does not exist (or has been shut down). "worker" is required to create pool.
+
+    Example:
+        pool = get_pool('io', worker=32, multiprocessing=False)
+        ParallelStream(urls, pool=get_pool('io')).map_concurrent(fetch).as_seq()
+
+    Registered pools are shut down on interpreter exit.
+
+    :param name:
+    :param worker:
+    :param multiprocessing:
+    :param kwargs: passed to WorkerPool
+    :return:
+    """
+
+    with _LOCK:
+        pool = _POOLS.get(name)
+
+        if pool is None or pool.closed:
+            if worker is None:
+                raise ValueError("pool '{}' does not exist; 'worker' is required to create it.".format(name))
+
+            pool = _POOLS[name] = WorkerPool(worker, multiprocessing=multiprocessing, **kwargs)
+
+        return pool
+
+
+def shutdown_pools(names: Iterable[str] = None, wait: bool = True):
+    """
+    shuts down registered pools.
+
+    :param names: if None then all registered pools are shut down.
+    :param wait:
+    """
+
+    with _LOCK:
+        names = list(_POOLS) if names is None else list(names)
+
+        for name in names:
+            pool = _POOLS.pop(name, None)
+
+            if pool is not None and not pool.closed:
+                pool.shutdown(wait=wait)
+
+
+register(shutdown_pools)
+
+if __name__ == 'streamAPI.stream.pool':
+    __all__ = get_functions_clazz(__name__, __file__)
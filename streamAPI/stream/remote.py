@@ -0,0 +1,282 @@
+from concurrent.futures import Executor, Future
+from itertools import count
+from multiprocessing.connection import Client, Connection
+from pickle import HIGHEST_PROTOCOL, dumps, loads
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from typing import Dict, List, Sequence, Tuple, Union
+
+from streamAPI.utility.utils import get_functions_clazz
+
+BATCH_SIZE = 64  # maximum number of jobs (or results) in a frame.
+
+Address = Union[str, Tuple[str, int]]
+
+_STOP = object()
+
+
+def parse_address(address: Address) -> Union[str, Tuple[str, int]]:
+    """
+    parses address of a worker daemon.
+
+    Example:
+        parse_address('127.0.0.1:7000') -> ('127.0.0.1', 7000)
+        parse_address('unix:/tmp/worker.sock') -> '/tmp/worker.sock'
+
+    :param address: "host:port", "unix:path" or (host, port)
+    :return: address accepted by multiprocessing.connection
+    """
+
+    if not isinstance(address, str):
+        return tuple(address)
+
+    if address.startswith('unix:'):
+        return address[len('unix:'):]
+
+    host, _, port = address.rpartition(':')
+
+    return host, int(port)
+
+
+def _dump(obj) -> bytes:
+    return dumps(obj, protocol=HIGHEST_PROTOCOL)
+
+
+def execute(payload: bytes) -> bytes:
+    """
+    runs a pickled job (func, args, kwargs) in worker of daemon.
+
+    :param payload:
+    :return: pickled (True, result) or (False, exception)
+    """
+
+    try:
+        func, args, kwargs = loads(payload)
+        out = True, func(*args, **kwargs)
+    except BaseException as e:
+        out = False, e
+
+    try:
+        return _dump(out)
+    except Exception as e:  # result or exception is not picklable
+        return _dump((False, RuntimeError('could not pickle outcome of job: {!r}'.format(e))))
+
+
+class _Connection:
+    """
+    connection to a worker daemon. Jobs are sent by a sender thread, in
+    frames of at most BATCH_SIZE jobs (as many as are waiting), and results
+    are received by a receiver thread.
+    """
+
+    def __init__(self, address: Address, authkey: bytes, batch_size: int):
+        self.conn: Connection = Client(parse_address(address), authkey=authkey)
+        self.worker: int = loads(self.conn.recv_bytes())
+        self.batch_size = batch_size
+
+        self.pending: Dict[int, Future] = {}  # job id -> future, of jobs sent or waiting to be sent
+        self.lock = Lock()
+        self.broken: BaseException = None
+
+        self._queue = SimpleQueue()
+        self._sender = Thread(target=self._send, daemon=True)
+        self._receiver = Thread(target=self._receive, daemon=True)
+        self._sender.start()
+        self._receiver.start()
+
+    def load(self) -> float:
+        return len(self.pending) / self.worker
+
+    def put(self, job_id: int, future: Future, payload: bytes):
+        with self.lock:
+            if self.broken is not None:
+                raise ConnectionError('connection to worker daemon is broken') from self.broken
+
+            self.pending[job_id] = future
+
+        self._queue.put((job_id, future, payload))
+
+    def _send(self):
+        queue = self._queue
+
+        while True:
+            jobs = [queue.get()]
+
+            while len(jobs) < self.batch_size:
+                try:
+                    jobs.append(queue.get_nowait())
+                except Empty:
+                    break
+
+            stop = any(job is _STOP for job in jobs)
+            frame = []
+
+            with self.lock:
+                for job in jobs:
+                    if job is _STOP:
+                        continue
+
+                    job_id, future, payload = job
+
+                    if job_id not in self.pending:  # connection is broken
+                        continue
+
+                    if future.set_running_or_notify_cancel():
+                        frame.append((job_id, payload))
+                    else:
+                        del self.pending[job_id]
+
+            try:
+                if frame:
+                    self.conn.send_bytes(_dump(frame))
+
+                if stop:
+                    self.conn.send_bytes(_dump(None))  # daemon closes connection on it.
+                    return
+            except (OSError, ValueError) as e:
+                self._break(e)
+                return
+
+    def _receive(self):
+        try:
+            while True:
+                for job_id, data in loads(self.conn.recv_bytes()):
+                    future = self._forget(job_id)
+
+                    if future is None:
+                        continue
+
+                    try:
+                        ok, value = loads(data)
+                    except Exception as e:  # for example, exception class not importable here
+                        ok, value = False, RuntimeError('could not unpickle outcome of job: {!r}'.format(e))
+
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+        except BaseException as e:  # connection lost or frame is corrupt; fails pending jobs
+            self._break(e)
+        finally:
+            self.conn.close()
+
+    def _forget(self, job_id: int) -> Future:
+        with self.lock:
+            return self.pending.pop(job_id, None)
+
+    def _break(self, e: BaseException):
+        """
+        fails jobs of connection, once it is broken.
+        """
+
+        with self.lock:
+            if self.broken is None:
+                self.broken = e
+
+            pending, self.pending = self.pending, {}
+
+            for future in pending.values():
+                if future.running() or future.set_running_or_notify_cancel():
+                    future.set_exception(ConnectionError('connection to worker daemon is lost: {}'.format(e)))
+
+    def close(self, wait: bool):
+        """
+        closes connection, once jobs waiting to be sent are sent.
+
+        :param wait: if True, waits for connection to be closed.
+        """
+
+        self._queue.put(_STOP)
+
+        if wait:
+            self._receiver.join()
+
+
+class RemoteExecutor(Executor):
+    """
+    Executor sending jobs to worker daemons (started by "python -m streamAPI.worker")
+    over TCP or Unix domain sockets. Jobs and results are pickled; jobs waiting
+    to be sent to a daemon are sent together in a frame. Each job goes to daemon
+    having least number of pending jobs per worker.
+
+    Functions have to be importable on daemons. Jobs can be cancelled only till
+    they are sent; features relying on shared memory of host (cancel token,
+    SharedMemoryTransport and Broadcast) are not available.
+
+    Example:
+        $ STREAMAPI_AUTHKEY=secret python -m streamAPI.worker --bind 0.0.0.0:7000 --worker 16   # on each machine
+
+        with RemoteExecutor(['host1:7000', 'host2:7000'], authkey=b'secret') as executor:
+            ParallelStream(data, executor=executor).map_concurrent(func).as_seq()
+    """
+
+    def __init__(self, addresses: Sequence[Address], authkey: bytes = None, batch_size: int = BATCH_SIZE):
+        """
+        :param addresses: addresses of worker daemons (see parse_address).
+        :param authkey: shared secret of daemons, used to authenticate connections.
+        :param batch_size: maximum number of jobs in a frame.
+        """
+
+        assert addresses, 'at least one address is required'
+        assert batch_size > 0, 'batch size must be positive'
+
+        self._connections: List[_Connection] = [_Connection(address, authkey, batch_size)
+                                                for address in addresses]
+        self._ids = count()
+        self._closed = False
+
+    @property
+    def worker(self) -> int:
+        """
+        total number of workers of daemons.
+        """
+
+        return sum(c.worker for c in self._connections)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        if self._closed:
+            raise RuntimeError('cannot schedule new futures after shutdown')
+
+        payload = _dump((fn, args, kwargs))
+        future = Future()
+
+        live = [c for c in self._connections if c.broken is None]
+
+        if not live:
+            raise ConnectionError('no worker daemon is reachable')
+
+        min(live, key=_Connection.load).put(next(self._ids), future, payload)
+
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """
+        :param wait: if True, waits for pending jobs to be completed.
+        :param cancel_futures: if True, jobs not yet sent are cancelled.
+        """
+
+        if self._closed:
+            return
+
+        self._closed = True
+
+        for c in self._connections:
+            with c.lock:
+                futures = list(c.pending.values())
+
+            if cancel_futures:
+                for future in futures:
+                    future.cancel()
+
+            if wait:
+                for future in futures:
+                    try:
+                        future.exception()
+                    except BaseException:  # cancelled
+                        pass
+
+            c.close(wait)
+
+
+if __name__ == 'streamAPI.stream.remote':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,286 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, TimeoutError, wait
+from heapq import heappop, heappush
+from math import ceil
+from time import monotonic, sleep
+from typing import Dict, Iterable, List, Set, Tuple
+
+from streamAPI.utility.Types import BiFunction, Function, T
+from streamAPI.utility.utils import get_functions_clazz
+
+REORDER_FACTOR = 16  # size of reorder buffer relative to number of elements in flight.
+HISTORY = 1024
+
+_FAILED = object()
+
+
+class Speculation:
+    """
+    Speculative (hedged) execution for ParallelStream.map_concurrent.
+
+    Once "min_samples" jobs have completed, a job running longer than "percentile"
+    of recent job durations gets a duplicate; the first of them to complete wins
+    and the other one is cancelled. A failed element is retried up to "retries"
+    times, waiting "backoff" seconds before first retry and doubling the wait
+    (up to "max_backoff") for every further retry.
+
+    Elements which still fail are not raised; they are dropped from stream and
+    collected in "failed" as (element, exception), and "on_failure" is called
+    with them, if given.
+
+    Example:
+        spec = Speculation(percentile=90, retries=2)
+        out = ParallelStream(urls, worker=16, multiprocessing=False).map_concurrent(fetch, speculation=spec).as_seq()
+        spec.failed -> [('http://down.example', ConnectionError(...))]
+        spec.duplicates -> 7
+    """
+
+    def __init__(self, percentile: float = 95, min_samples: int = 20,
+                 retries: int = 0, backoff: float = 0.1, max_backoff: float = 10,
+                 on_failure: BiFunction[T, BaseException, None] = None):
+        """
+        :param percentile: in (0, 100]; if None, duplicates are not submitted (only retries).
+        :param min_samples: number of completed jobs required to submit duplicates.
+        :param retries: number of retries of a failed element.
+        :param backoff: seconds to wait before first retry.
+        :param max_backoff:
+        :param on_failure: called with element and exception once element has failed
+                           after all retries.
+        """
+
+        assert percentile is None or 0 < percentile <= 100, "'percentile' must be in (0, 100]"
+        assert min_samples > 0, "'min_samples' must be positive"
+        assert retries >= 0, "'retries' can not be negative"
+
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._on_failure = on_failure
+
+        self._durations = deque(maxlen=HISTORY)
+        self._threshold = None
+
+        self.failed: List[Tuple[T, BaseException]] = []
+        self.duplicates = 0  # number of duplicates submitted
+        self.retried = 0  # number of retries submitted
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    @property
+    def threshold(self) -> float:
+        """
+        duration (in seconds) after which a running job gets a duplicate;
+        None if duplicates are not to be submitted yet.
+        """
+
+        return self._threshold
+
+    def observe(self, duration: float):
+        """
+        records duration of a successful job.
+
+        :param duration:
+        """
+
+        durations = self._durations
+        durations.append(duration)
+
+        if self._percentile is not None and len(durations) >= self._min_samples:
+            ordered = sorted(durations)
+            self._threshold = ordered[max(ceil(self._percentile / 100 * len(ordered)) - 1, 0)]
+
+    def backoff(self, attempt: int) -> float:
+        """
+        :param attempt: number of attempts done so far.
+        :return: seconds to wait before next attempt.
+        """
+
+        return min(self._backoff * 2 ** (attempt - 1), self._max_backoff)
+
+    def fail(self, g: T, e: BaseException):
+        self.failed.append((g, e))
+
+        if self._on_failure is not None:
+            self._on_failure(g, e)
+
+    def __str__(self):
+        return '{}(threshold={}, duplicates={}, retried={}, failed={})'.format(
+            type(self).__name__, self._threshold, self.duplicates, self.retried, len(self.failed))
+
+    def __repr__(self):
+        return str(self)
+
+
+class _Element:
+    __slots__ = ('seq', 'g', 'attempts', 'jobs', 'hedged')
+
+    def __init__(self, seq: int, g):
+        self.seq = seq
+        self.g = g
+        self.attempts = 0
+        self.jobs: Set[Future] = set()
+        self.hedged = False
+
+
+def speculative_window(submit: Function[T, Future], itr: Iterable[T], window: int, timeout,
+                       ordered: bool, spec: Speculation, registered: Set[Future]) -> Iterable:
+    """
+    Like sliding window of ParallelStream, keeps at most "window" elements in
+    flight and yields their results, but submits duplicates of straggling jobs
+    and retries failed elements as per "spec".
+
+    :param submit:
+    :param itr:
+    :param window:
+    :param timeout: TimeoutError is raised if no job completes in "timeout" seconds.
+    :param ordered:
+    :param spec:
+    :param registered: set of jobs in flight, shared with stream for cancellation.
+    :return:
+    """
+
+    elements = enumerate(itr)
+    active: Dict[int, _Element] = {}  # elements in flight, including those waiting for retry
+    owner: Dict[Future, _Element] = {}
+    started: Dict[Future, float] = {}
+    retry: List[Tuple[float, int, _Element]] = []  # heap of (due time, seq, element)
+    finished = {}  # reorder buffer
+    out = []  # results to be yielded in unordered mode
+    next_seq = 0
+    exhausted = False
+    buffer_size = REORDER_FACTOR * window
+    last_progress = monotonic()
+
+    def launch(el: _Element):
+        job = submit(el.g)
+        owner[job] = el
+        started[job] = monotonic()
+        el.jobs.add(job)
+        registered.add(job)
+
+    def forget(job: Future) -> float:
+        owner.pop(job)
+        registered.discard(job)
+        return started.pop(job)
+
+    def complete(el: _Element, value):
+        del active[el.seq]
+
+        if ordered:
+            finished[el.seq] = value
+        elif value is not _FAILED:
+            out.append(value)
+
+    def fill():
+        nonlocal exhausted
+
+        while not exhausted and len(active) < window and len(finished) < buffer_size:
+            for seq, g in elements:
+                el = active[seq] = _Element(seq, g)
+                el.attempts = 1
+                launch(el)
+                break
+            else:
+                exhausted = True
+
+    fill()
+
+    while active or finished:
+        if ordered and next_seq in finished:
+            value = finished.pop(next_seq)
+            next_seq += 1
+            fill()
+
+            if value is not _FAILED:
+                yield value
+
+            continue
+
+        now = monotonic()
+
+        while retry and retry[0][0] <= now:
+            _, _, el = heappop(retry)
+            el.hedged = False
+            launch(el)
+
+        threshold = spec.threshold
+        deadlines = [started[job] + threshold for job, el in owner.items()
+                     if not el.hedged] if threshold is not None else []
+
+        if retry:
+            deadlines.append(retry[0][0])
+
+        if timeout is not None:
+            deadlines.append(last_progress + timeout)
+
+        wake = max(min(deadlines) - now, 0) if deadlines else None
+
+        if owner:
+            done, _ = wait(owner, timeout=wake, return_when=FIRST_COMPLETED)
+        else:  # only retries are pending.
+            sleep(wake)
+            done = ()
+
+        now = monotonic()
+
+        for job in done:
+            if job not in owner:  # losing duplicate, done along with winner
+                continue
+
+            el = owner[job]
+            duration = now - forget(job)
+            el.jobs.discard(job)
+
+            if el.seq not in active or job.cancelled():
+                continue
+
+            last_progress = now
+            e = job.exception()
+
+            if e is None:
+                spec.observe(duration)
+
+                for other in el.jobs:  # losing duplicate
+                    other.cancel()
+                    forget(other)
+
+                el.jobs.clear()
+                complete(el, job.result())
+
+            elif el.jobs:
+                continue  # duplicate is still running.
+
+            elif el.attempts <= spec.retries:
+                heappush(retry, (now + spec.backoff(el.attempts), el.seq, el))
+                el.attempts += 1
+                spec.retried += 1
+
+            else:
+                spec.fail(el.g, e)
+                complete(el, _FAILED)
+
+        if timeout is not None and not done and now - last_progress >= timeout:
+            raise TimeoutError('no job completed in {} seconds'.format(timeout))
+
+        threshold = spec.threshold
+
+        if threshold is not None:
+            for job, el in list(owner.items()):
+                if not el.hedged and now - started[job] >= threshold:
+                    el.hedged = True
+                    spec.duplicates += 1
+                    launch(el)
+
+        fill()
+
+        if out:
+            yield from out
+            out.clear()
+
+
+if __name__ == 'streamAPI.stream.speculation':
+    __all__ = get_functions_clazz(__name__, __file__)
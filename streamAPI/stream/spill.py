@@ -0,0 +1,144 @@
+from heapq import merge
+from os import SEEK_END
+from pickle import HIGHEST_PROTOCOL, dump, load
+from sys import getsizeof
+from tempfile import TemporaryFile
+from typing import Iterable, List
+
+from streamAPI.utility.Types import X
+from streamAPI.utility.utils import divide_in_chunk, get_functions_clazz
+
+FRAME_SIZE = 1024
+
+
+class SpillFile(Iterable[X]):
+    """
+    Temporary file to hold elements which do not fit in memory.
+    Elements are written as pickled frames, each frame being a
+    list of at most "frame_size" elements, and are read back lazily
+    one frame at a time.
+
+    File is removed once it is closed. Note that file can be iterated
+    by only one consumer at a time.
+
+    Example:
+        with SpillFile() as f:
+            f.write(range(10))
+            list(f) -> [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    """
+
+    def __init__(self, frame_size: int = FRAME_SIZE, dir: str = None):
+        assert frame_size > 0, 'frame size must be positive'
+
+        self._file = TemporaryFile(dir=dir)
+        self._frame_size = frame_size
+        self._frames = 0
+        self._size = 0
+
+    def write(self, elements: Iterable[X]) -> 'SpillFile[X]':
+        """
+        appends elements to file.
+
+        :param elements:
+        :return: SpillFile itself
+        """
+
+        self._file.seek(0, SEEK_END)
+
+        for frame in divide_in_chunk(elements, self._frame_size):
+            dump(frame, self._file, protocol=HIGHEST_PROTOCOL)
+            self._frames += 1
+            self._size += len(frame)
+
+        return self
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self) -> Iterable[X]:
+        f = self._file
+        f.flush()
+        f.seek(0)
+
+        for _ in range(self._frames):
+            yield from load(f)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def size_of(o) -> int:
+    """
+    Approximate size of an object in bytes. Containers
+    are accounted along with their items (but not recursively).
+
+    :param o:
+    :return:
+    """
+
+    size = getsizeof(o)
+
+    if isinstance(o, dict):
+        size += sum(map(getsizeof, o.keys())) + sum(map(getsizeof, o.values()))
+    elif isinstance(o, (list, tuple, set, frozenset)):
+        size += sum(map(getsizeof, o))
+
+    return size
+
+
+def external_sort(itr: Iterable[X], key=None, reverse: bool = False,
+                  memory_limit: int = None, frame_size: int = FRAME_SIZE,
+                  dir: str = None) -> Iterable[X]:
+    """
+    Sorts elements holding at most "memory_limit" bytes(approximated by "size_of")
+    of elements in memory. Sorted runs which fit in memory are spilled to temporary
+    files and then lazily merged.
+
+    Sorting is stable, as is the case with builtin "sorted".
+
+    :param itr:
+    :param key:
+    :param reverse:
+    :param memory_limit: in bytes. If None then all elements are sorted in memory.
+    :param frame_size: number of elements written/read from temporary file in one go.
+    :param dir: directory in which temporary files are to be created.
+    :return: iterator to sorted elements.
+    """
+
+    if memory_limit is None:
+        yield from sorted(itr, key=key, reverse=reverse)
+        return
+
+    assert memory_limit > 0, 'memory limit must be positive'
+
+    runs: List[SpillFile] = []
+    run, size = [], 0
+
+    try:
+        for e in itr:
+            run.append(e)
+            size += size_of(e)
+
+            if size >= memory_limit:
+                run.sort(key=key, reverse=reverse)
+                runs.append(SpillFile(frame_size=frame_size, dir=dir).write(run))
+                run, size = [], 0
+
+        run.sort(key=key, reverse=reverse)
+
+        # last run is kept in memory; as it is the last iterable given
+        # to merge, ties among runs are resolved in insertion order.
+        yield from merge(*runs, run, key=key, reverse=reverse)
+    finally:
+        for f in runs:
+            f.close()
+
+
+if __name__ == 'streamAPI.stream.spill':
+    __all__ = get_functions_clazz(__name__, __file__)
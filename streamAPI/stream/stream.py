@@ -1,16 +1,27 @@
+from collections import OrderedDict, deque
 from functools import reduce, wraps
-from itertools import accumulate, chain, cycle, dropwhile, islice, takewhile, zip_longest
-from typing import Any, Dict, Generic, Iterable, Sequence, Tuple, Union
+from itertools import accumulate, chain, cycle, dropwhile, takewhile, zip_longest
+from operator import gt, lt
+from typing import TYPE_CHECKING, Any, Dict, Generic, Iterable, List, Sequence, Tuple, Union
 
+from streamAPI.stream.aggregator import Aggregator, as_aggregator, group_results
+from streamAPI.stream.auto import SAMPLE_SIZE, Plan, auto_parallel
 from streamAPI.stream.decos import check_pipeline, close_pipeline
+from streamAPI.stream.fusion import FILTER, MAP, PEEK
+from streamAPI.stream.join import JOINS, hash_join
+from streamAPI.stream.plan import (DISTINCT, Node, distinct_count, execute, explain, limit_node,
+                                   optimize, skip_node, sort_node, top_k, top_k_node)
 from streamAPI.stream.optional import EMPTY, Optional
-from streamAPI.stream.streamHelper import (ChainedCondition, Closable, GroupByValueType, ListType,
-                                           Supplier)
+from streamAPI.stream.streamHelper import (BloomFilter, ChainedCondition, Closable, GroupByValueType,
+                                           ListType, SlidingWindow, Supplier)
 from streamAPI.utility.Types import (BiFunction, Callable, Consumer,
                                      Function, T, X, Y, Z)
 from streamAPI.utility.utils import (Filter, divide_in_chunk, get_chunk, get_functions_clazz,
                                      identity)
 
+if TYPE_CHECKING:  # batchStream depends on this module.
+    from streamAPI.stream.batchStream import BatchStream
+
 NIL = object()
 
 
@@ -95,9 +106,93 @@ class Stream(Closable, Generic[X]):
     def __init__(self, data: Iterable[X]):
         super().__init__()
 
-        self._pointer = iter(data)
+        self._source = iter(data)
+        self._plan: List[Node] = []  # logical plan of pending intermediate operations
         self._closed = False
 
+    @property
+    def _pointer(self) -> Iterable[X]:
+        """
+        Iterator over elements of Stream.
+
+        Intermediate operations are only recorded in logical plan of Stream;
+        here, pending plan is optimized (see streamAPI.stream.plan) and
+        consecutive element-wise operations (map, filter, peek) are fused
+        into one loop before iterator is returned.
+
+        :return:
+        """
+
+        if self._plan:
+            self._source = execute(self._source, optimize(self._plan))
+            self._plan = []
+
+        return self._source
+
+    @_pointer.setter
+    def _pointer(self, itr: Iterable[X]):
+        self._source = itr
+        self._plan = []
+
+    def _then(self, node: Node) -> 'Stream':
+        """
+        Adds node to logical plan of Stream.
+
+        :param node:
+        :return: Stream itself
+        """
+
+        self._plan.append(node)
+        return self
+
+    def _then_apply(self, kind: str, apply: Callable[[Iterable], Iterable], **params) -> 'Stream':
+        """
+        Adds a node, which is opaque to optimizer, to logical plan of Stream.
+
+        :param kind: name of operation
+        :param apply: transforms iterator of upstream elements.
+        :param params: used to describe operation by "explain".
+        :return: Stream itself
+        """
+
+        return self._then(Node(kind, apply=apply, **params))
+
+    def explain(self, terminal: str = None) -> 'Stream[X]':
+        """
+        Prints logical plan of Stream and plan chosen by optimizer
+        after rewrites.
+
+        Rewrites performed are:
+            sort(comp, reverse).limit(k) -> top_k(k, comp, reverse) (bounded heap)
+            map(f, pure=True).skip(n)    -> skip(n).map(f, pure=True) (same for limit)
+            distinct().count()           -> cardinality of a set
+
+        Example:
+            Stream(range(10)).map(str, pure=True).skip(2).sort().limit(3).explain('as_seq')
+            prints ->
+            == logical plan ==
+            source
+            map(str, pure)
+            skip(n=2)
+            sort(comp=None, reverse=False)
+            limit(n=3)
+            as_seq()
+            == optimized plan ==
+            source
+            skip(n=2)
+            map(str, pure)
+            top_k(k=3, comp=None, reverse=False)
+            as_seq()
+
+        Note that this method is neither intermediate nor terminal operation.
+
+        :param terminal: name of terminal operation to be explained along with plan.
+        :return: Stream itself
+        """
+
+        print(explain(self._plan, terminal=terminal))
+        return self
+
     @classmethod
     def from_supplier(cls, func: Callable[[], X], *args, **kwargs) -> 'Stream[X]':
         """
@@ -112,7 +207,7 @@ class Stream(Closable, Generic[X]):
         return cls(Supplier(func), *args, **kwargs)
 
     @check_pipeline
-    def map(self, func: Function[X, Y]) -> 'Stream[Y]':
+    def map(self, func: Function[X, Y], pure: bool = False) -> 'Stream[Y]':
         """
         maps elements of stream and produces stream of mapped element.
 
@@ -120,12 +215,15 @@ class Stream(Closable, Generic[X]):
             stream = Stream(range(5)).map(lambda x: 2*x)
             print(list(stream)) # prints [0, 2, 4, 6, 8]
 
+        If "func" is pure, i.e. it has no side effect, optimizer is allowed
+        to move skip/limit ahead of this map, so skipped elements are not mapped.
+
         :param func:
+        :param pure: True if func does not have side effect.
         :return: Stream itself
         """
 
-        self._pointer = map(func, self._pointer)
-        return self
+        return self._then(Node(MAP, func=func, pure=pure))
 
     @check_pipeline
     def filter(self, predicate: Filter[X]) -> 'Stream[X]':
@@ -140,11 +238,10 @@ class Stream(Closable, Generic[X]):
         :return: Stream itself
         """
 
-        self._pointer = filter(predicate, self._pointer)
-        return self
+        return self._then(Node(FILTER, func=predicate))
 
     @check_pipeline
-    def sort(self, comp=None, reverse: bool = False) -> 'Stream[X]':
+    def sort(self, comp=None, reverse: bool = False, memory_limit: int = None) -> 'Stream[X]':
         """
         Sorts element of Stream.
 
@@ -174,16 +271,46 @@ class Stream(Closable, Generic[X]):
             Stream(students).sorted(comp=Student.get_age,reverse=True).as_seq()
             -> [[name=D,age=6], [name=C,age=4], [name=A,age=3], [name=B,age=1]]
 
+        Example3: (external sort)
+            If Stream is too big to be sorted in memory then "memory_limit" (in bytes)
+            can be given. Sorted runs of elements fitting in "memory_limit" are spilled
+            to temporary files and then merged lazily.
+
+            Stream(csv_itr('big.csv')).sort(comp=itemgetter('id'), memory_limit=2 ** 28).as_seq()
+
         :param comp:
         :param reverse:
+        :param memory_limit: if None, stream is sorted in memory.
         :return: Stream itself
         """
 
-        self._pointer = sorted(self._pointer, key=comp, reverse=reverse)
-        return self
+        return self._then(sort_node(comp, reverse, memory_limit))
 
     @check_pipeline
-    def distinct(self) -> 'Stream[X]':
+    def top_k(self, k: int, comp=None, reverse: bool = False) -> 'Stream[X]':
+        """
+        Keeps first "k" elements of sorted Stream; it is equivalent to
+        sort(comp, reverse).limit(k) but uses a heap of size "k", so
+        it requires O(n log k) time and O(k) memory.
+
+        Example:
+            Stream([5, 1, 4, 2, 3]).top_k(2).as_seq() -> [1, 2]
+            Stream([5, 1, 4, 2, 3]).top_k(2, reverse=True).as_seq() -> [5, 4]
+
+        :param k:
+        :param comp:
+        :param reverse:
+        :return: Stream itself
+        """
+
+        assert k >= 0, 'k must be non negative'
+
+        return self._then(top_k_node(k, comp, reverse))
+
+    @check_pipeline
+    def distinct(self, key: Function[X, Y] = None, window: int = None,
+                 approximate: bool = False, capacity: int = 10 ** 6,
+                 error_rate: float = 0.01) -> 'Stream[X]':
         """
         uses distinct element of for further processing.
 
@@ -194,26 +321,115 @@ class Stream(Closable, Generic[X]):
         Note that, sorting is not guaranteed.
         Elements must be hashable and define equal logic(__eq__)
 
+        If "key" is given, elements are considered same if their keys are same;
+        first of such elements is kept.
+
+            Stream(['a', 'bb', 'c', 'dd']).distinct(key=len).as_seq() -> ['a', 'bb']
+
+        By default, every key seen is kept in memory. Memory can be bounded by:
+
+        1) window: only last "window" keys (in least recently seen order) are remembered,
+           so duplicates farther apart than "window" distinct keys are not removed.
+
+            Stream([1, 2, 3, 1, 2, 1]).distinct(window=2).as_seq() -> [1, 2, 3, 1, 2]
+
+        2) approximate: keys are remembered in a Bloom filter sized for "capacity"
+           keys having "error_rate" false positive rate. A false positive drops an
+           element which has not been seen before.
+
+        :param key: elements must be hashable if key is None otherwise key of elements.
+        :param window: number of recently seen keys to remember.
+        :param approximate: if True then Bloom filter is used to remember keys.
+        :param capacity: expected number of distinct keys (used only if approximate is True)
+        :param error_rate: false positive rate (used only if approximate is True)
         :return:  Stream itself
         """
 
-        self._pointer = Stream._yield_distinct(self._pointer)
-        return self
+        if window is not None and approximate:
+            raise ValueError("'window' and 'approximate' can not be used together.")
+
+        if window is not None:
+            assert window > 0, 'window must be positive'
+
+            return self._then_apply(DISTINCT, lambda itr: Stream._yield_window_distinct(itr, key, window),
+                                    key=key, window=window)
+
+        if approximate:
+            return self._then_apply(DISTINCT,
+                                    lambda itr: Stream._yield_approx_distinct(itr, key,
+                                                                              BloomFilter(capacity, error_rate)),
+                                    key=key, capacity=capacity, error_rate=error_rate)
+
+        if key is not None:
+            return self._then_apply(DISTINCT, lambda itr: Stream._yield_distinct(itr, key), key=key)
+
+        return self._then_apply(DISTINCT, Stream._yield_distinct)
 
     @staticmethod
-    def _yield_distinct(itr: Iterable[X]):
+    def _yield_distinct(itr: Iterable[X], key: Function[X, Y] = None):
         """
         yield distinct elements from a given iterable
         :param itr:
+        :param key:
         :return:
         """
 
         consumer_items = set()
 
+        if key is None:
+            for item in itr:
+                if item not in consumer_items:
+                    yield item
+                    consumer_items.add(item)
+        else:
+            for item in itr:
+                k = key(item)
+
+                if k not in consumer_items:
+                    yield item
+                    consumer_items.add(k)
+
+    @staticmethod
+    def _yield_window_distinct(itr: Iterable[X], key: Function[X, Y], window: int):
+        """
+        yield elements whose key is not among last "window" keys seen.
+        Keys are kept in least recently seen order.
+
+        :param itr:
+        :param key:
+        :param window:
+        :return:
+        """
+
+        seen = OrderedDict()
+
         for item in itr:
-            if item not in consumer_items:
+            k = item if key is None else key(item)
+
+            if k in seen:
+                seen.move_to_end(k)
+            else:
+                yield item
+
+                seen[k] = None
+
+                if len(seen) > window:
+                    seen.popitem(last=False)
+
+    @staticmethod
+    def _yield_approx_distinct(itr: Iterable[X], key: Function[X, Y], bloom_filter: BloomFilter):
+        """
+        yield elements whose key has not been added to bloom filter.
+
+        :param itr:
+        :param key:
+        :param bloom_filter:
+        :return:
+        """
+
+        for item in itr:
+            if not bloom_filter.add(item if key is None else key(item)):
                 yield item
-                consumer_items.add(item)
 
     @check_pipeline
     def limit(self, n: int) -> 'Stream[X]':
@@ -228,8 +444,7 @@ class Stream(Closable, Generic[X]):
         :return:
         """
 
-        self._pointer = islice(self._pointer, n)
-        return self
+        return self._then(limit_node(n))
 
     @check_pipeline
     def peek(self, consumer: Consumer[X]) -> 'Stream[X]':
@@ -246,8 +461,7 @@ class Stream(Closable, Generic[X]):
         :return: Stream itself
         """
 
-        self._pointer = Stream._consumer_wrapper(consumer)(self._pointer)
-        return self
+        return self._then(Node(PEEK, func=consumer))
 
     @check_pipeline
     def peek_after_each(self, consumer: Consumer[X], n: int) -> 'Stream[X]':
@@ -267,8 +481,8 @@ class Stream(Closable, Generic[X]):
 
         assert n > 0, 'n should be positive'
 
-        self._pointer = Stream._consumer_wrapper(consumer, n=n)(self._pointer)
-        return self
+        return self._then_apply('peek_after_each', Stream._consumer_wrapper(consumer, n=n),
+                                consumer=consumer, n=n)
 
     @staticmethod
     def _consumer_wrapper(consumer: Consumer[X], n: int = 1):
@@ -305,8 +519,7 @@ class Stream(Closable, Generic[X]):
         :return:  Stream itself
         """
 
-        self._pointer = islice(self._pointer, n, None)
-        return self
+        return self._then(skip_node(n))
 
     @check_pipeline
     def flat_map(self) -> 'Stream[X]':
@@ -320,8 +533,7 @@ class Stream(Closable, Generic[X]):
         :return:Stream itself
         """
 
-        self._pointer = chain.from_iterable(self._pointer)
-        return self
+        return self._then_apply('flat_map', chain.from_iterable)
 
     @check_pipeline
     def batch(self, n: int):
@@ -336,8 +548,69 @@ class Stream(Closable, Generic[X]):
         :return:
         """
 
-        self._pointer = divide_in_chunk(self._pointer, n)
-        return self
+        return self._then_apply('batch', lambda itr: divide_in_chunk(itr, n), n=n)
+
+    @close_pipeline
+    @check_pipeline
+    def map_batches(self, func, size: int, dtype=None) -> 'BatchStream':
+        """
+        Divides stream in batches of size "size", converts each batch to
+        numpy array (or to dictionary of column name to numpy array if elements
+        are dictionaries) and maps batches using vectorized function "func".
+
+        Returned BatchStream provides vectorized terminal operations sum, mean,
+        min and max; "rows" method converts it back to Stream of elements.
+        Note that this Stream is closed after this operation.
+
+        Example:
+            Stream(range(10)).map_batches(lambda a: a ** 2, 4).sum() -> 285
+
+            Stream(range(10)).map_batches(lambda a: a[a % 2 == 0], 4).rows().as_seq()
+            -> [0, 2, 4, 6, 8]
+
+        numpy is required for this operation.
+
+        :param func: takes numpy array (or dictionary of numpy arrays) and returns same.
+        :param size: batch size
+        :param dtype: dtype of array; dictionary of column to dtype can be given
+                      for elements being dictionary.
+        :return: BatchStream
+        """
+
+        from streamAPI.stream.batchStream import BatchStream  # batchStream depends on this module.
+
+        return BatchStream.from_elements(self._pointer, size, dtype).map_batches(func)
+
+    @check_pipeline
+    def auto_parallel(self, func: Function[X, Y], sample_size: int = SAMPLE_SIZE,
+                      worker: int = None, on_plan: Consumer[Plan] = None) -> 'Stream[Y]':
+        """
+        maps elements like "map", choosing between running "func" serially, in
+        a thread pool or in a process pool, along with number of worker and batch
+        size. Choice is made by profiling "func" on first "sample_size" elements:
+        wall time vs cpu time (work releasing GIL, like I/O, scales on threads),
+        and size of pickled input and output (which parent has to pickle for
+        process pool). Number of worker respects cpu quota of cgroup.
+
+        Example:
+            Stream(urls).auto_parallel(fetch, on_plan=print).as_seq()
+            prints -> Plan(mode='threads', worker=64, batch_size=1, profile=Profile(...))
+
+        For process pool, "func" has to be picklable. Mapped elements are in order
+        of stream elements.
+
+        :param func:
+        :param sample_size: number of elements to be profiled.
+        :param worker: maximum number of worker.
+        :param on_plan: called with chosen Plan.
+        :return:
+        """
+
+        assert sample_size > 0, 'sample size must be positive'
+
+        return self._then_apply('auto_parallel',
+                                lambda itr: auto_parallel(itr, func, sample_size, worker, on_plan),
+                                func=func, sample_size=sample_size)
 
     @check_pipeline
     def enumerate(self, start=0):
@@ -356,8 +629,7 @@ class Stream(Closable, Generic[X]):
         :return:
         """
 
-        self._pointer = enumerate(self._pointer, start=start)
-        return self
+        return self._then_apply('enumerate', lambda itr: enumerate(itr, start=start), start=start)
 
     @check_pipeline
     def take_while(self, predicate: Filter[X]) -> 'Stream[X]':
@@ -371,8 +643,8 @@ class Stream(Closable, Generic[X]):
         :return:
         """
 
-        self._pointer = takewhile(predicate, self._pointer)
-        return self
+        return self._then_apply('take_while', lambda itr: takewhile(predicate, itr),
+                                predicate=predicate)
 
     @check_pipeline
     def drop_while(self, predicate: Filter[X]) -> 'Stream[X]':
@@ -385,8 +657,8 @@ class Stream(Closable, Generic[X]):
         :return:
         """
 
-        self._pointer = dropwhile(predicate, self._pointer)
-        return self
+        return self._then_apply('drop_while', lambda itr: dropwhile(predicate, itr),
+                                predicate=predicate)
 
     @check_pipeline
     def zip(self, *itr: Iterable[Y], after=True) -> 'Stream[Tuple]':
@@ -417,11 +689,11 @@ class Stream(Closable, Generic[X]):
         """
 
         if after:
-            self._pointer = zip(self._pointer, *itr)
+            apply = lambda pointer: zip(pointer, *itr)
         else:
-            self._pointer = zip(*itr, self._pointer)
+            apply = lambda pointer: zip(*itr, pointer)
 
-        return self
+        return self._then_apply('zip', apply, after=after)
 
     @check_pipeline
     def zip_longest(self, *itr: Iterable[Y], after=True, fillvalue=None) -> 'Stream[Tuple]':
@@ -444,11 +716,11 @@ class Stream(Closable, Generic[X]):
         """
 
         if after:
-            self._pointer = zip_longest(self._pointer, *itr, fillvalue=fillvalue)
+            apply = lambda pointer: zip_longest(pointer, *itr, fillvalue=fillvalue)
         else:
-            self._pointer = zip_longest(*itr, self._pointer, fillvalue=fillvalue)
+            apply = lambda pointer: zip_longest(*itr, pointer, fillvalue=fillvalue)
 
-        return self
+        return self._then_apply('zip_longest', apply, after=after, fillvalue=fillvalue)
 
     @check_pipeline
     def cycle(self, itr: Iterable[Y], after=True) -> 'Stream[Tuple]':
@@ -466,6 +738,56 @@ class Stream(Closable, Generic[X]):
 
         return self.zip(cycle(itr), after=after)
 
+    @check_pipeline
+    def join(self, other: Iterable[Y], left_key: Function[X, Any], right_key: Function[Y, Any] = None,
+             how: str = 'inner', memory_limit: int = None) -> 'Stream':
+        """
+        Hash joins stream with iterable "other". Hash table is built from one side
+        and other side is streamed lazily. Duplicate keys on both sides are handled
+        as in SQL, i.e. each matching pair is produced.
+
+        how:
+            inner : stream of (element, other element) for each matching pair.
+            left  : as inner, but (element, None) when element has no match.
+            semi  : elements having at least one match.
+            anti  : elements having no match.
+
+        Example:
+            users = [dict(id=1, name='a'), dict(id=2, name='b')]
+            orders = [dict(user=1, item='x'), dict(user=1, item='y'), dict(user=3, item='z')]
+
+            Stream(orders).join(users, itemgetter('user'), itemgetter('id'), how='left').as_seq()
+            -> [({'user': 1, 'item': 'x'}, {'id': 1, 'name': 'a'}),
+                ({'user': 1, 'item': 'y'}, {'id': 1, 'name': 'a'}),
+                ({'user': 3, 'item': 'z'}, None)]
+
+            Stream(orders).join(users, itemgetter('user'), itemgetter('id'), how='anti').as_seq()
+            -> [{'user': 3, 'item': 'z'}]
+
+        For inner join, hash table is built from smaller side, so order of output follows
+        the bigger side. For others, it is built from "other".
+
+        If "memory_limit" (in bytes) is given and hash table outgrows it, both sides are
+        spilled to temporary files in hash partitions which are joined one by one.
+        See streamAPI.stream.join.hash_join.
+
+        :param other:
+        :param left_key: key of stream elements
+        :param right_key: key of elements of "other"; if None then left_key is used.
+        :param how: one of inner, left, semi and anti.
+        :param memory_limit:
+        :return: Stream itself
+        """
+
+        right_key = left_key if right_key is None else right_key
+
+        if how not in JOINS:
+            raise ValueError("'how' must be one of {}".format(JOINS))
+
+        return self._then_apply('join', lambda itr: hash_join(itr, other, left_key, right_key,
+                                                              how=how, memory_limit=memory_limit),
+                                left_key=left_key, right_key=right_key, how=how, memory_limit=memory_limit)
+
     @check_pipeline
     def if_else(self, if_: Filter[X],
                 then: Function[X, Y],
@@ -526,39 +848,78 @@ class Stream(Closable, Generic[X]):
         :return:
         """
 
-        self._pointer = accumulate(self._pointer, bi_func)
-        return self
+        return self._then_apply('accumulate', lambda itr: accumulate(itr, bi_func), bi_func=bi_func)
 
     @check_pipeline
-    def window_function(self, func, n: int) -> 'Stream[X]':
+    def window_function(self, func, n: int, view: bool = False) -> 'Stream[X]':
         """
         Example: Moving average for window size 3
 
         Stream([1,6,2,7,3]).window_function(lambda l:sum(l) / 3 , 3).as_seq()
         -> [3.0, 5.0, 4.0]
 
+        If "view" is True, window is a SlidingWindow, a read-only sequence over
+        a ring buffer which is updated in place for every element, i.e. window
+        is not copied. So window is valid only during call to "func"; it must
+        not be kept (for example by returning it).
 
-        :param func: takes input, at any instant, as a tuple having
-               last "n-1" and current element.
+        For moving sum, mean, min and max use rolling_sum, rolling_mean, rolling_min
+        and rolling_max, which require O(1) amortized time per element.
+
+        :param func: takes input, at any instant, as a tuple (or SlidingWindow,
+                     if "view" is True) having last "n-1" and current element.
         :param n: natural number
+        :param view: if True, window is passed as SlidingWindow instead of
+                     being copied to a new tuple for every element.
         :return:
         """
 
-        self._pointer = map(func, self._fetch_next(self._pointer, n))
-        return self
+        return self._then_apply('window_function', lambda itr: map(func, Stream._fetch_next(itr, n, view)),
+                                func=func, n=n, view=view)
 
     @staticmethod
-    def _fetch_next(itr, n) -> Tuple[X, ...]:
+    def _fetch_next(itr, n, view: bool = False) -> Iterable[Sequence[X]]:
         """
-        Creates generator. Each element is tuple of size "n".
+        Creates generator. Each element is tuple (or SlidingWindow) of size "n".
 
         While iterating, first element will be first "n" elements of
         Stream, next element will be old "n-1" elements appended with
-        next element of Stream and so on.
+        next element of Stream and so on. Note that if "view" is True,
+        same SlidingWindow object is yielded every time.
 
         Note that if in first call to this generator, stream has less
         than "n" element then ValueError will be thrown.
 
+        :param itr:
+        :param n: a positive integer
+        :param view: if True, SlidingWindow is yielded instead of tuple.
+        :return:
+        """
+
+        chunk = Stream._first_chunk(itr, n)
+
+        if view:
+            window = SlidingWindow(chunk)
+            yield window
+
+            for e in itr:
+                window.push(e)
+                yield window
+        else:
+            # fresh tuple for every element; slicing is done in C, so copying
+            # is cheap compared to reading elements through SlidingWindow.
+            window = tuple(chunk)
+            yield window
+
+            for e in itr:
+                window = window[1:] + (e,)
+                yield window
+
+    @staticmethod
+    def _first_chunk(itr, n) -> List[X]:
+        """
+        fetches first "n" elements of itr.
+
         :param itr:
         :param n: a positive integer
         :return:
@@ -567,17 +928,137 @@ class Stream(Closable, Generic[X]):
         if n < 1:
             raise ValueError("'n' must be natural number")
 
-        chunk = get_chunk(itr, n)
+        chunk = get_chunk(itr, n, list)
 
         if len(chunk) < n:
             # first chunk size must be than n
             raise ValueError("Stream has less than '{}' elements ".format(n))
 
-        yield chunk
+        return chunk
+
+    @check_pipeline
+    def rolling_sum(self, n: int) -> 'Stream[X]':
+        """
+        Moving sum over window of size "n" in O(1) amortized time per element.
+
+        Example:
+            Stream([1,6,2,7,3]).rolling_sum(3).as_seq() -> [9, 15, 12]
+
+        Running sum is recomputed from window once after every "n" elements,
+        so that floating point errors do not accumulate.
+
+        Note that if stream has less than "n" element then ValueError will be thrown.
+
+        :param n: natural number
+        :return:
+        """
+
+        return self._then_apply('rolling_sum', lambda itr: Stream._rolling_sum(itr, n), n=n)
+
+    @check_pipeline
+    def rolling_mean(self, n: int) -> 'Stream[X]':
+        """
+        Moving average over window of size "n" in O(1) amortized time per element.
+
+        Example:
+            Stream([1,6,2,7,3]).rolling_mean(3).as_seq() -> [3.0, 5.0, 4.0]
+
+        :param n: natural number
+        :return:
+        """
+
+        return self._then_apply('rolling_mean', lambda itr: (s / n for s in Stream._rolling_sum(itr, n)), n=n)
+
+    @staticmethod
+    def _rolling_sum(itr, n):
+        buffer = Stream._first_chunk(itr, n)
+        total = sum(buffer)
+        idx = 0
+
+        yield total
 
         for e in itr:
-            chunk = chunk[1:] + (e,)
-            yield chunk
+            total += e - buffer[idx]
+            buffer[idx] = e
+            idx += 1
+
+            if idx == n:
+                idx = 0
+                total = sum(buffer)
+
+            yield total
+
+    @check_pipeline
+    def rolling_min(self, n: int, comp=None) -> 'Stream[X]':
+        """
+        Moving minimum over window of size "n" in O(1) amortized time
+        per element, using a monotonic deque.
+
+        Example:
+            Stream([1,6,2,7,3]).rolling_min(3).as_seq() -> [1, 2, 2]
+
+        :param n: natural number
+        :param comp:
+        :return:
+        """
+
+        return self._then_apply('rolling_min', lambda itr: Stream._rolling_extreme(itr, n, comp, gt),
+                                n=n, comp=comp)
+
+    @check_pipeline
+    def rolling_max(self, n: int, comp=None) -> 'Stream[X]':
+        """
+        Moving maximum over window of size "n" in O(1) amortized time
+        per element, using a monotonic deque.
+
+        Example:
+            Stream([1,6,2,7,3]).rolling_max(3).as_seq() -> [6, 7, 7]
+
+        :param n: natural number
+        :param comp:
+        :return:
+        """
+
+        return self._then_apply('rolling_max', lambda itr: Stream._rolling_extreme(itr, n, comp, lt),
+                                n=n, comp=comp)
+
+    @staticmethod
+    def _rolling_extreme(itr, n, comp, dominated: BiFunction[Any, Any, bool]):
+        """
+        yields extreme element of each window of size "n". Deque holds
+        (key, index, element) of candidates; candidate is removed once
+        a new element "dominates" it or it goes out of window.
+
+        :param itr:
+        :param n:
+        :param comp:
+        :param dominated: (key of candidate, key of new element) -> True if candidate
+                          can never be extreme again.
+        :return:
+        """
+
+        if n < 1:
+            raise ValueError("'n' must be natural number")
+
+        candidates = deque()
+        idx = -1
+
+        for idx, e in enumerate(itr):
+            k = e if comp is None else comp(e)
+
+            while candidates and dominated(candidates[-1][0], k):
+                candidates.pop()
+
+            candidates.append((k, idx, e))
+
+            if candidates[0][1] <= idx - n:
+                candidates.popleft()
+
+            if idx >= n - 1:
+                yield candidates[0][2]
+
+        if idx < n - 1:
+            raise ValueError("Stream has less than '{}' elements ".format(n))
 
     def __next__(self) -> X:
         return next(self._pointer)
@@ -611,6 +1092,12 @@ class Stream(Closable, Generic[X]):
         :return: number of elements in Stream
         """
 
+        plan = optimize(self._plan)
+
+        if distinct_count(plan):
+            # distinct().count() is cardinality of set of elements.
+            return len(set(execute(self._source, plan[:-1])))
+
         return sum(1 for _ in self._pointer)
 
     @close_pipeline
@@ -691,6 +1178,41 @@ class Stream(Closable, Generic[X]):
         except ValueError:
             return EMPTY
 
+    @close_pipeline
+    @check_pipeline
+    def nsmallest(self, k: int, comp=None) -> List[X]:
+        """
+        This operation is one of the terminal operations
+        finds "k" smallest elements of Stream using a heap of size "k".
+
+        Example:
+            Stream([5, 1, 4, 2, 3]).nsmallest(3) -> [1, 2, 3]
+            Stream(['aaa', 'b', 'cc']).nsmallest(1, comp=len) -> ['b']
+
+        :param k:
+        :param comp:
+        :return: sorted list having at most "k" elements.
+        """
+
+        return top_k(self._pointer, k, comp=comp)
+
+    @close_pipeline
+    @check_pipeline
+    def nlargest(self, k: int, comp=None) -> List[X]:
+        """
+        This operation is one of the terminal operations
+        finds "k" largest elements of Stream using a heap of size "k".
+
+        Example:
+            Stream([5, 1, 4, 2, 3]).nlargest(3) -> [5, 4, 3]
+
+        :param k:
+        :param comp:
+        :return: list, sorted in descending order, having at most "k" elements.
+        """
+
+        return top_k(self._pointer, k, comp=comp, reverse=True)
+
     @close_pipeline
     @check_pipeline
     def group_by(self, key_hasher, value_mapper: Function[X, Y] = identity,
@@ -715,6 +1237,11 @@ class Stream(Closable, Generic[X]):
             out =Stream([1, 2, 3, 4, 2, 4]).group_by(lambda x:x%2,value_container_type=SetType)
             -> {1: {1, 3}, 0: {2, 4}}
 
+        Example4: (at most 2 largest elements per group are kept in memory)
+            out = Stream([1, 2, 3, 4, 5, 6]).group_by(lambda x:x%2,
+                                                      value_container_clazz=TopKType.of(2, reverse=True))
+            -> {1: [5, 3], 0: [6, 4]}
+
         :param key_hasher:
         :param value_mapper:
         :param value_container_clazz:
@@ -738,6 +1265,64 @@ class Stream(Closable, Generic[X]):
 
         pt.add(v)
 
+    @close_pipeline
+    @check_pipeline
+    def aggregate_by(self, key_hasher: Function[X, T],
+                     **aggs: Union[str, Aggregator]) -> Dict[T, Dict[str, Any]]:
+        """
+        This operation is one of the terminal operations
+        groups stream elements using key_hasher and aggregates each group
+        incrementally, so that only a state per aggregation per group is
+        kept in memory (unlike group_by which keeps every element).
+
+        Builtin aggregations are Count, Sum, Mean, Min, Max, First and Last (see
+        streamAPI.stream.aggregator); they can also be given by their name in lower case.
+        User defined aggregation can be created by Custom or by extending Aggregator.
+
+        Example:
+            Stream(range(10)).aggregate_by(lambda x: x % 2, n='count', total=Sum(lambda x: x ** 2))
+            -> {0: {'n': 5, 'total': 120}, 1: {'n': 5, 'total': 165}}
+
+            Stream(['ab', 'a', 'bcd', 'b']).aggregate_by(lambda x: x[0], first='first', longest=Max(len))
+            -> {'a': {'first': 'ab', 'longest': 2}, 'b': {'first': 'bcd', 'longest': 3}}
+
+        :param key_hasher:
+        :param aggs: name of output -> aggregation
+        :return: dictionary of key to dictionary of name of output to aggregated value.
+        """
+
+        aggs = {name: as_aggregator(agg) for name, agg in aggs.items()}
+
+        return group_results(Stream._aggregate_states(self._pointer, key_hasher, aggs), aggs)
+
+    @staticmethod
+    def _aggregate_states(itr: Iterable[X], key_hasher: Function[X, T],
+                          aggs: Dict[str, Aggregator]) -> Dict[T, list]:
+        """
+        finds states of aggregations for each group.
+
+        :param itr:
+        :param key_hasher:
+        :param aggs:
+        :return: dictionary of key to list of states (in same order as "aggs").
+        """
+
+        inits = tuple(agg.init for agg in aggs.values())
+        updates = tuple(enumerate((agg.update, agg.value) for agg in aggs.values()))
+        groups = {}
+
+        for elem in itr:
+            k = key_hasher(elem)
+            states = groups.get(k)
+
+            if states is None:
+                states = groups[k] = [init() for init in inits]
+
+            for idx, (update, value) in updates:
+                states[idx] = update(states[idx], value(elem))
+
+        return groups
+
     @close_pipeline
     @check_pipeline
     def mapping(self, key_mapper: Function[X, T],
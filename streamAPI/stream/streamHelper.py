@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from collections import deque
-from typing import Callable, Deque, Iterable
+from copyreg import pickle
+from math import ceil, log
+from typing import Callable, Deque, Iterable, Iterator, Sequence
 
 from streamAPI.stream.decos import check_pipeline, close_pipeline
 from streamAPI.stream.exception import PipelineNOTClosed
@@ -67,6 +69,221 @@ class SetType(set, metaclass=GroupByValueType):
     add = set.add
 
 
+class TopKType(list, metaclass=GroupByValueType):
+    """
+    Keeps at most "k" elements which would come first on sorting
+    added elements using "comp" and "reverse". Elements are kept
+    in sorted order, and memory is bounded by "k" per group.
+
+    Container is a sorted list (not a heap), so that it reads as sorted
+    at any time: an element which can not be among top "k" is rejected
+    by a single comparison; otherwise its position is found by binary
+    search (O(log k) comparisons) and it is inserted, shifting up to "k"
+    references (O(k), a memmove). For large "k" over whole stream, use
+    Stream.top_k (or nsmallest/nlargest), which uses a heap.
+
+    As "group_by" instantiates container class without any argument,
+    container class is created using "of" method.
+
+    Stream([1,2,5,1,3,4,2]).group_by(lambda x:x%2,value_container_clazz=TopKType.of(2))
+    -> {1: [1, 1], 0: [2, 2]}
+
+    Stream([1,2,5,1,3,4,2]).group_by(lambda x:x%2,value_container_clazz=TopKType.of(2, reverse=True))
+    -> {1: [5, 3], 0: [4, 2]}
+    """
+
+    k = 1
+    comp = None
+    reverse = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._keys = []
+
+    @classmethod
+    def of(cls, k: int, comp=None, reverse: bool = False) -> GroupByValueType:
+        """
+        creates container class keeping top "k" elements.
+
+        :param k:
+        :param comp:
+        :param reverse:
+        :return:
+        """
+
+        assert k > 0, 'k must be positive'
+
+        return GroupByValueType(cls.__name__, (cls,),
+                                dict(k=k, comp=staticmethod(comp) if comp else None,
+                                     reverse=reverse))
+
+    def add(self, o):
+        key = o if self.comp is None else self.comp(o)
+        keys = self._keys
+
+        if len(keys) == self.k and not self._precedes(key, keys[-1]):
+            return  # "o" can not be among top "k" elements.
+
+        lo, hi = 0, len(keys)
+
+        while lo < hi:  # finding rightmost position, so that sorting is stable.
+            mid = (lo + hi) // 2
+
+            if self._precedes(key, keys[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+
+        keys.insert(lo, key)
+        self.insert(lo, o)
+
+        if len(keys) > self.k:
+            keys.pop()
+            self.pop()
+
+    def _precedes(self, a, b) -> bool:
+        return b < a if self.reverse else a < b
+
+
+def _reduce_value_type(cls: GroupByValueType):
+    """
+    pickles container classes created by TopKType.of using their parameters, so
+    that they can be sent to process workers; other classes are pickled by name.
+    """
+
+    if issubclass(cls, TopKType) and cls is not TopKType:
+        return TopKType.of, (cls.k, cls.comp, cls.reverse)
+
+    return cls.__qualname__
+
+
+pickle(GroupByValueType, _reduce_value_type)
+
+
+class BloomFilter:
+    """
+    Probabilistic set which can tell that an element has not been added
+    for sure, but may wrongly tell that an element has been added with
+    probability "error_rate" when at most "capacity" elements have been added.
+
+    Memory required is about -capacity * ln(error_rate) / ln(2)^2 bits,
+    irrespective of size of elements. Elements must be hashable.
+
+    Example:
+        bf = BloomFilter(capacity=1000, error_rate=0.01)
+        bf.add('a') -> False # 'a' was not present
+        bf.add('a') -> True
+        'a' in bf -> True
+        'b' in bf -> False # (with probability 0.99)
+    """
+
+    _MASK = (1 << 64) - 1
+    _GOLDEN = 0x9E3779B97F4A7C15
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        assert capacity > 0, 'capacity must be positive'
+        assert 0 < error_rate < 1, 'error rate must lie in (0, 1)'
+
+        bits = max(8, ceil(-capacity * log(error_rate) / (log(2) ** 2)))
+
+        self._size = bits
+        self._hashes = max(1, round(bits / capacity * log(2)))
+        self._bits = bytearray((bits + 7) // 8)
+
+    def _positions(self, o) -> Iterable[int]:
+        """
+        bit positions for element "o" using double hashing.
+
+        :param o:
+        :return:
+        """
+
+        x = (hash(o) * BloomFilter._GOLDEN) & BloomFilter._MASK
+        x ^= x >> 29
+        h1, h2 = x & 0xFFFFFFFF, (x >> 32) | 1
+        size = self._size
+
+        return ((h1 + i * h2) % size for i in range(self._hashes))
+
+    def add(self, o) -> bool:
+        """
+        adds element to filter.
+
+        :param o:
+        :return: True if element was (probably) already present.
+        """
+
+        bits = self._bits
+        present = True
+
+        for p in self._positions(o):
+            idx, mask = p >> 3, 1 << (p & 7)
+
+            if not bits[idx] & mask:
+                present = False
+                bits[idx] |= mask
+
+        return present
+
+    def __contains__(self, o) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(o))
+
+
+class SlidingWindow(Sequence[X]):
+    """
+    Read-only view over a fixed size ring buffer. Pushing an element
+    overwrites the oldest element in O(1) time without copying window.
+
+    Example:
+        window = SlidingWindow([1, 2, 3])
+        window.push(4)
+        tuple(window) -> (2, 3, 4)
+        window[0] -> 2
+        window[-1] -> 4
+    """
+
+    def __init__(self, data: list):
+        super().__init__()
+
+        self._buffer = data
+        self._size = len(data)
+        self._start = 0  # index of oldest element in buffer
+
+    def push(self, o: X):
+        """
+        appends element "o" removing oldest element.
+
+        :param o:
+        """
+
+        self._buffer[self._start] = o
+        self._start += 1
+
+        if self._start == self._size:
+            self._start = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return tuple(self)[idx]
+
+        if not -self._size <= idx < self._size:
+            raise IndexError('window index out of range')
+
+        return self._buffer[(self._start + idx) % self._size]
+
+    def __iter__(self) -> Iterator[X]:
+        buffer, start = self._buffer, self._start
+        return iter(buffer[start:] + buffer[:start] if start else buffer[:])
+
+    def __repr__(self):
+        return 'SlidingWindow{}'.format(tuple(self))
+
+
 class Supplier(Iterable[X]):
     """
     This class provide a wrapper around a callable function.
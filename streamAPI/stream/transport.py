@@ -0,0 +1,334 @@
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, List, NamedTuple, Tuple
+
+from streamAPI.utility.Types import Function, T, X
+from streamAPI.utility.utils import get_functions_clazz
+
+try:
+    from concurrent.futures import InvalidStateError
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # python < 3.8
+    SharedMemory = None
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency.
+    np = None
+
+THRESHOLD = 64 * 1024  # bytes
+
+BYTES = 'bytes'
+BYTEARRAY = 'bytearray'
+NDARRAY = 'ndarray'
+
+
+class Handle(NamedTuple):
+    """
+    reference to buffer placed in shared memory segment "name";
+    only handle is pickled while sending buffer to other process.
+    """
+
+    name: str
+    kind: str
+    size: int
+    shape: Tuple[int, ...] = None
+    dtype: str = None
+
+
+def _put(obj, threshold: int):
+    """
+    places "obj" in a new shared memory segment if it is a large buffer.
+
+    :return: Handle or None if "obj" is not to be shared.
+    """
+
+    if isinstance(obj, (bytes, bytearray)):
+        if len(obj) < threshold:
+            return None
+
+        shm = SharedMemory(create=True, size=max(len(obj), 1))
+        shm.buf[:len(obj)] = obj
+        handle = Handle(shm.name, BYTES if isinstance(obj, bytes) else BYTEARRAY, len(obj))
+
+    elif np is not None and isinstance(obj, np.ndarray):
+        if obj.nbytes < threshold or obj.dtype.hasobject:
+            return None
+
+        shm = SharedMemory(create=True, size=max(obj.nbytes, 1))
+        np.ndarray(obj.shape, obj.dtype, buffer=shm.buf)[...] = obj
+        handle = Handle(shm.name, NDARRAY, obj.nbytes, obj.shape, obj.dtype.str)
+
+    else:
+        return None
+
+    shm.close()
+
+    return handle
+
+
+def _map(func, obj):
+    """
+    applies "func" on elements of tuple or list "obj" (or values of dictionary "obj").
+    Container is rebuilt (keeping its type) only if some element is changed.
+    """
+
+    if isinstance(obj, dict):
+        out = {k: func(v) for k, v in obj.items()}
+        changed = any(out[k] is not v for k, v in obj.items())
+    else:
+        out = [func(e) for e in obj]
+        changed = any(x is not y for x, y in zip(out, obj))
+
+    if not changed:
+        return obj
+
+    if isinstance(obj, dict) or type(obj) in (tuple, list):
+        return type(obj)(out)
+
+    return type(obj)(*out)  # namedtuple
+
+
+def encode(obj, threshold: int = THRESHOLD, handles: List[Handle] = None):
+    """
+    replaces large buffers (bytes, bytearray and numpy arrays of at least
+    "threshold" bytes) in "obj" by handles to shared memory segments. Tuples,
+    lists and dictionary values are searched recursively.
+
+    :param obj:
+    :param threshold:
+    :param handles: if given, created handles are appended to it.
+    :return:
+    """
+
+    if isinstance(obj, (tuple, list, dict)):
+        return _map(lambda e: encode(e, threshold, handles), obj)
+
+    handle = _put(obj, threshold)
+
+    if handle is None:
+        return obj
+
+    if handles is not None:
+        handles.append(handle)
+
+    return handle
+
+
+def decode(obj, segments: List[SharedMemory], copy: bool = True):
+    """
+    replaces handles in "obj" by buffers they refer to.
+
+    :param obj:
+    :param segments: attached segments are appended to it; they have to be closed
+                     by caller once buffers are not required.
+    :param copy: if False then numpy arrays are views on shared memory segment
+                 instead of copies.
+    :return:
+    """
+
+    if isinstance(obj, Handle):
+        shm = SharedMemory(name=obj.name)
+        segments.append(shm)
+
+        if obj.kind == NDARRAY:
+            out = np.ndarray(obj.shape, np.dtype(obj.dtype), buffer=shm.buf)
+            return out.copy() if copy else out
+
+        data = shm.buf[:obj.size]
+        out = bytes(data) if obj.kind == BYTES else bytearray(data)
+        data.release()
+
+        return out
+
+    if isinstance(obj, (tuple, list, dict)):
+        return _map(lambda e: decode(e, segments, copy), obj)
+
+    return obj
+
+
+def release(handles: List[Handle]):
+    """
+    removes shared memory segments of "handles".
+
+    :param handles:
+    """
+
+    for handle in handles:
+        try:
+            shm = SharedMemory(name=handle.name)
+        except FileNotFoundError:
+            continue
+
+        shm.close()
+        shm.unlink()
+
+
+def _close(segments: List[SharedMemory]):
+    for shm in segments:
+        try:
+            shm.close()
+        except BufferError:  # buffer is still referenced by function; mapping is freed with it.
+            pass
+
+
+def _find_handles(obj, handles: List[Handle]) -> List[Handle]:
+    if isinstance(obj, Handle):
+        handles.append(obj)
+    elif isinstance(obj, (tuple, list)):
+        for e in obj:
+            _find_handles(e, handles)
+    elif isinstance(obj, dict):
+        for e in obj.values():
+            _find_handles(e, handles)
+
+    return handles
+
+
+def shared_call(func: Function[T, X], threshold: int, payload) -> Any:
+    """
+    runs in worker: applies "func" on decoded "payload"; numpy arrays are
+    given as views on shared memory (no copy). Large buffers of result are
+    placed in new shared memory segments, which are removed by parent.
+
+    :param func:
+    :param threshold:
+    :param payload:
+    :return:
+    """
+
+    segments = []
+
+    try:
+        out = func(decode(payload, segments, copy=False))
+        out = _detach(encode(out, threshold))  # drops views on input segments, closed below.
+    finally:
+        _close(segments)
+
+    return out
+
+
+def _detach(obj):
+    if np is not None and isinstance(obj, np.ndarray):
+        return obj.copy()
+
+    if isinstance(obj, (tuple, list, dict)) and not isinstance(obj, Handle):
+        return _map(_detach, obj)
+
+    return obj
+
+
+class _Relay(Future):
+    """
+    Future of decoded result of a job; cancelling it cancels job.
+    """
+
+    def __init__(self, job: Future):
+        super().__init__()
+        self._job = job
+
+    def cancel(self) -> bool:
+        self._job.cancel()
+        return super().cancel()
+
+
+class SharedMemoryTransport:
+    """
+    Sends large buffers (bytes, bytearray and numpy arrays) between parent and
+    process workers through shared memory segments; only small handles are
+    pickled through executor pipes. Buffers are searched in elements (and in
+    tuples, lists and dictionary values of them, e.g. chunks of batch_processor)
+    and in results.
+
+    Workers get numpy arrays as views on shared memory (they should not be
+    modified); parent gets copies of arrays of results. Segments of a job are
+    removed once job is done, fails or is cancelled.
+
+    Example:
+        ParallelStream(tiles, worker=4, transport=SharedMemoryTransport()).batch_processor(denoise, 8).as_seq()
+    """
+
+    def __init__(self, threshold: int = THRESHOLD):
+        """
+        :param threshold: buffers smaller than it (in bytes) are pickled as usual.
+        """
+
+        if SharedMemory is None:
+            raise ImportError('multiprocessing.shared_memory (python >= 3.8) is required.')
+
+        assert threshold > 0, 'threshold must be positive'
+
+        self._threshold = threshold
+
+    @property
+    def threshold(self) -> int:
+        return self._threshold
+
+    def submit(self, executor: Executor, func: Callable, g) -> Future:
+        """
+        submits job "func(g)" to "executor".
+
+        :param executor:
+        :param func:
+        :param g:
+        :return: Future of result of job.
+        """
+
+        handles = []
+        payload = encode(g, self._threshold, handles)
+
+        try:
+            job = executor.submit(shared_call, func, self._threshold, payload)
+        except BaseException:
+            release(handles)
+            raise
+
+        relay = _Relay(job)
+        job.add_done_callback(lambda j: self._done(j, relay, handles))
+
+        return relay
+
+    @staticmethod
+    def _done(job: Future, relay: _Relay, handles: List[Handle]):
+        release(handles)
+
+        if job.cancelled():
+            relay.cancel()
+            return
+
+        exception = job.exception()
+
+        if exception is not None:
+            try:
+                relay.set_exception(exception)
+            except InvalidStateError:  # relay has been cancelled.
+                pass
+
+            return
+
+        out = job.result()
+
+        if relay.cancelled():
+            release(_find_handles(out, []))
+            return
+
+        segments = []
+
+        try:
+            relay.set_result(decode(out, segments))
+        except InvalidStateError:  # relay has been cancelled meanwhile.
+            pass
+        except BaseException as e:
+            relay.set_exception(e)
+        finally:
+            _close(segments)
+            release(_find_handles(out, []))
+
+    def __str__(self):
+        return '{}(threshold={})'.format(type(self).__name__, self._threshold)
+
+    def __repr__(self):
+        return str(self)
+
+
+if __name__ == 'streamAPI.stream.transport':
+    __all__ = get_functions_clazz(__name__, __file__)
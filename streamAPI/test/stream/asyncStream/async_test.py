@@ -0,0 +1,160 @@
+from asyncio import Event, sleep, wait_for
+from random import random
+from unittest import IsolatedAsyncioTestCase, main
+
+from streamAPI.stream.asyncStream import AsyncStream
+from streamAPI.stream.exception import PipelineClosed
+from streamAPI.stream.optional import EMPTY
+from streamAPI.stream.streamHelper import SetType
+
+
+async def double(x):
+    await sleep(random() / 100)
+    return x * 2
+
+
+async def agen(n, delay=0.0):
+    for i in range(n):
+        await sleep(delay)
+        yield i
+
+
+class AsyncStreamTest(IsolatedAsyncioTestCase):
+    async def test_sources(self):
+        self.assertListEqual(await AsyncStream(range(5)).as_seq(), [0, 1, 2, 3, 4])
+        self.assertListEqual(await AsyncStream(agen(5)).as_seq(), [0, 1, 2, 3, 4])
+
+    async def test_intermediate(self):
+        out = await (AsyncStream(agen(20))
+                     .map(double)
+                     .filter(lambda x: x % 3 == 0)
+                     .skip(1)
+                     .map(lambda x: [x, x])
+                     .flat_map()
+                     .distinct()
+                     .enumerate()
+                     .limit(4)
+                     .as_seq())
+
+        self.assertListEqual(out, [(0, 6), (1, 12), (2, 18), (3, 24)])
+
+        out = await AsyncStream(range(10)).drop_while(lambda x: x < 3).take_while(lambda x: x < 6).as_seq()
+        self.assertListEqual(out, [3, 4, 5])
+
+    async def test_map_async(self):
+        out = await AsyncStream(range(100)).map_async(double, concurrency=10).as_seq()
+        self.assertListEqual(out, [2 * x for x in range(100)])
+
+        out = await AsyncStream(agen(100)).map_async(double, concurrency=10, ordered=False).as_seq()
+        self.assertListEqual(sorted(out), [2 * x for x in range(100)])
+
+        out = await AsyncStream(range(20)).filter_async(lambda x: sleep(0, x % 2), concurrency=4).as_seq()
+        self.assertListEqual(out, list(range(1, 20, 2)))
+
+    async def test_concurrency(self):
+        running = peak = 0
+        full = Event()
+
+        async def f(x):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+
+            if running == 500:
+                full.set()
+
+            # first calls finish only once 500 calls are in flight together.
+            await wait_for(full.wait(), 5)
+            running -= 1
+            return x
+
+        self.assertEqual(await AsyncStream(range(1000)).map_async(f, concurrency=500).count(), 1000)
+        self.assertEqual(peak, 500)
+
+    async def test_slow_source(self):
+        received = [Event() for _ in range(5)]
+
+        async def source():
+            # next element is given only once result of previous one is received,
+            # so results must be yielded while source is being read.
+            for i in range(5):
+                if i:
+                    await received[i - 1].wait()
+
+                yield i
+
+        out = []
+
+        async for x in AsyncStream(source()).map_async(double, concurrency=100):
+            out.append(x)
+            received[x // 2].set()
+
+        self.assertListEqual(out, [0, 2, 4, 6, 8])
+
+    async def test_early_exit(self):
+        started, cancelled = [], []
+        full = Event()
+
+        async def f(x):
+            started.append(x)
+
+            if len(started) == 5:
+                full.set()
+
+            try:
+                await (wait_for(full.wait(), 5) if x == 0 else sleep(10))
+            except BaseException:
+                cancelled.append(x)
+                raise
+
+            return x
+
+        self.assertEqual((await AsyncStream(range(100)).map_async(f, concurrency=5).find_first()).get(), 0)
+        await sleep(0)
+        self.assertListEqual(started, [0, 1, 2, 3, 4])
+        self.assertCountEqual(cancelled, [1, 2, 3, 4])  # tasks which started are cancelled.
+
+    async def test_batch(self):
+        self.assertListEqual(await AsyncStream(range(5)).batch(2).as_seq(), [[0, 1], [2, 3], [4]])
+
+        async def source():
+            for i in range(5):
+                await sleep(0.3 if i == 3 else 0.01)
+                yield i
+
+        out = await AsyncStream(source()).batch(10, timeout=0.1).as_seq()
+        self.assertListEqual(out, [[0, 1, 2], [3, 4]])
+
+    async def test_terminals(self):
+        self.assertEqual(await AsyncStream(range(5)).count(), 5)
+        self.assertEqual((await AsyncStream(range(1, 5)).reduce(lambda x, y: x * y)).get(), 24)
+        self.assertIs(await AsyncStream([]).reduce(lambda x, y: x * y), EMPTY)
+        self.assertEqual((await AsyncStream([3, 1, 2]).min()).get(), 1)
+        self.assertEqual((await AsyncStream([3, 1, 2]).max(lambda x: -x)).get(), 1)
+        self.assertIs(await AsyncStream([]).min(), EMPTY)
+        self.assertEqual((await AsyncStream([(1, 'a'), (0, 'b'), (0, 'c')]).min(lambda x: x[0])).get(), (0, 'b'))
+        self.assertEqual((await AsyncStream([(1, 'a'), (1, 'b')]).max(lambda x: x[0])).get(), (1, 'a'))
+        self.assertTrue(await AsyncStream([2, 4]).all(lambda x: sleep(0, x % 2 == 0)))
+        self.assertFalse(await AsyncStream([2, 4]).any(lambda x: x > 4))
+        self.assertDictEqual(await AsyncStream([1, 2, 3, 1]).group_by(lambda x: x % 2, value_container_clazz=SetType),
+                             {1: {1, 3}, 0: {2}})
+
+        out = []
+        await AsyncStream(range(3)).map_async(double).for_each(out.append)
+        self.assertListEqual(out, [0, 2, 4])
+
+        self.assertListEqual([x async for x in AsyncStream(agen(3))], [0, 1, 2])
+
+    async def test_closed(self):
+        stream = AsyncStream(range(3))
+        await stream.done()
+
+        with self.assertRaises(PipelineClosed):
+            stream.map(double)
+
+        with self.assertRaises(PipelineClosed):
+            await stream.count()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import os
+from functools import partial
+from pickle import dumps, loads
+from time import sleep, time
+from unittest import TestCase, main
+
+from streamAPI.stream import broadcast
+from streamAPI.stream.broadcast import Broadcast
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.pool import WorkerPool
+
+
+def lookup(table: Broadcast, x):
+    return table.value[x]
+
+
+def identity(table: Broadcast, x):
+    return os.getpid(), id(table.value)
+
+
+def loaded(table: Broadcast, x):
+    table.value
+    return list(broadcast._loaded)
+
+
+def path_of(b: Broadcast) -> str:
+    return loads(dumps(b))._path
+
+
+class BroadcastTest(TestCase):
+    def assertRemoved(self, path: str):
+        # file is removed once jobs using broadcast are done.
+        start = time()
+
+        while time() - start < 5:
+            if not os.path.exists(path):
+                return
+
+            sleep(0.01)
+
+        self.fail('broadcast has not been removed.')
+
+    def test_map(self):
+        table = {i: i * i for i in range(100)}
+
+        for multiprocessing in (True, False):
+            stream = ParallelStream(range(100), worker=3, multiprocessing=multiprocessing)
+            b = stream.broadcast(table)
+            out = stream.map_concurrent(partial(lookup, b)).as_seq()
+
+            self.assertListEqual(out, [i * i for i in range(100)])
+
+    def test_pickled_once(self):
+        b = Broadcast(list(range(100000)))
+        job = dumps(partial(lookup, b))
+
+        self.assertLess(len(job), 1000)  # only handle is pickled, not object.
+        self.assertEqual(loads(job)(5), 5)
+        b.destroy()
+
+    def test_cached_in_worker(self):
+        stream = ParallelStream(range(50), worker=2)
+        b = stream.broadcast({'a': 1})
+
+        out = stream.batch_processor(partial(identity, b), 1).as_seq()
+
+        ids = {}
+
+        for pid, i in out:
+            ids.setdefault(pid, set()).add(i)
+
+        for i in ids.values():
+            self.assertEqual(len(i), 1)  # one object per worker
+
+    def test_destroy(self):
+        b = Broadcast([1, 2])
+        path = loads(dumps(b))._path
+
+        self.assertTrue(os.path.exists(path))
+
+        b.destroy()
+
+        self.assertFalse(os.path.exists(path))
+
+        with self.assertRaises(RuntimeError):
+            b.value
+
+    def test_stream_shutdown(self):
+        stream = ParallelStream(range(10), worker=2)
+        b = stream.broadcast(list(range(10)))
+        path = loads(dumps(b))._path
+
+        self.assertListEqual(stream.map_concurrent(partial(lookup, b)).as_seq(), list(range(10)))
+        self.assertRemoved(path)
+
+    def test_borrowed_pool(self):
+        with WorkerPool(2) as pool:
+            stream = ParallelStream(range(10), pool=pool)
+            b = stream.broadcast(list(range(10)))
+            path = path_of(b)
+
+            self.assertListEqual(stream.map_concurrent(partial(lookup, b)).as_seq(), list(range(10)))
+            self.assertRemoved(path)
+
+    def test_evicted_in_worker(self):
+        with WorkerPool(1) as pool:
+            keys = []
+
+            for _ in range(3):
+                stream = ParallelStream(range(1), pool=pool)
+                b = stream.broadcast([1])
+                keys.append(b.key)
+                path = path_of(b)
+                out = stream.map_concurrent(partial(loaded, b)).as_seq()
+                self.assertRemoved(path)
+
+            self.assertListEqual(out[0], keys[-1:])  # objects of destroyed broadcasts are dropped.
+
+    def test_bounded_in_worker(self):
+        with WorkerPool(1) as pool:
+            bs = [Broadcast([i]) for i in range(broadcast.CACHED + 5)]
+
+            for b in bs:
+                out = ParallelStream(range(1), pool=pool).map_concurrent(partial(loaded, b)).as_seq()
+
+            self.assertListEqual(out[0], [b.key for b in bs[-broadcast.CACHED:]])
+
+            for b in bs:
+                b.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import os
+import pickle
+import sys
+from subprocess import run
+from functools import partial
+from tempfile import TemporaryDirectory
+from threading import Event
+from time import sleep, time
+from unittest import TestCase, main, skipIf
+
+from streamAPI.stream.cancel import CancelToken, SharedMemory, _attached, cancelled
+from streamAPI.stream.parallelStream import ParallelStream
+
+
+def is_one(directory, x):
+    # slow for all but 1; gives up (leaving a mark) once answer is known.
+    for _ in range(200 if x != 1 else 1):
+        if cancelled():
+            open(os.path.join(directory, str(x)), 'w').close()
+            return False
+
+        sleep(0.01)
+
+    return x == 1
+
+
+def is_not_one(directory, x):
+    return not is_one(directory, x) or cancelled()
+
+
+def gave_up(directory) -> list:
+    """
+    elements whose jobs stopped early, waiting for stragglers
+    to see cancellation.
+    """
+
+    start = time()
+
+    while not os.listdir(directory) and time() - start < 5:
+        sleep(0.01)
+
+    return [int(f) for f in os.listdir(directory)]
+
+
+class CancelTest(TestCase):
+    def test_any(self):
+        for multiprocessing in (True, False):
+            with TemporaryDirectory() as directory:
+                with ParallelStream(range(20), worker=4, multiprocessing=multiprocessing) as stream:
+                    self.assertTrue(stream.any_concurrent(partial(is_one, directory), batch_size=8))
+
+                # stragglers stop early, instead of running for 2 seconds.
+                self.assertTrue(gave_up(directory))
+                self.assertNotIn(1, gave_up(directory))
+
+        self.assertFalse(ParallelStream(range(4), worker=2, multiprocessing=False).any_concurrent(lambda x: x > 5))
+
+    def test_all(self):
+        with TemporaryDirectory() as directory:
+            with ParallelStream(range(20), worker=4) as stream:
+                self.assertFalse(stream.all_concurrent(partial(is_not_one, directory), batch_size=8))
+
+            self.assertTrue(gave_up(directory))
+
+        self.assertTrue(ParallelStream(range(4), worker=2, multiprocessing=False).all_concurrent(lambda x: x < 5))
+
+    def test_find_first(self):
+        calls = []
+        release = Event()
+
+        def f(x):
+            calls.append(x)
+
+            if x:
+                release.wait(5)
+
+            return x
+
+        with ParallelStream(range(1000), worker=2, multiprocessing=False) as stream:
+            self.assertEqual(stream.map_concurrent(f).find_first().get(), 0)
+            release.set()
+
+        # submission stops with terminal operation: only window (2) and
+        # at most one refill are ever submitted, rest are never run.
+        self.assertLessEqual(set(calls), {0, 1, 2})
+
+    def assertRemoved(self, token: CancelToken):
+        # token is removed once jobs given it are done.
+        start = time()
+
+        while time() - start < 5:
+            try:
+                SharedMemory(name=token._name).close()
+            except FileNotFoundError:
+                return
+
+            sleep(0.01)
+
+        self.fail('token has not been removed.')
+
+    @skipIf(SharedMemory is None, 'shared memory requires python 3.8')
+    def test_token_released(self):
+        stream = ParallelStream(range(10), worker=2)
+        self.assertListEqual(list(iter(stream.map_concurrent(abs).limit(20))), list(range(10)))  # exhausted
+        self.assertRemoved(stream._cancel_token)
+        stream.shutdown()
+
+        stream = ParallelStream(range(10), worker=2)
+        itr = iter(stream.map_concurrent(abs).limit(5))
+        self.assertEqual(next(itr), 0)
+        itr.close()
+        self.assertRemoved(stream._cancel_token)
+        stream.shutdown()
+
+        with ParallelStream(range(10), worker=2) as stream:
+            itr = iter(stream.map_concurrent(abs).limit(5))
+            self.assertEqual(next(itr), 0)
+
+        self.assertRemoved(stream._cancel_token)
+
+        stream = ParallelStream(range(10), worker=2)
+        self.assertEqual(stream.map_concurrent(abs).find_first().get(), 0)
+        self.assertRemoved(stream._cancel_token)
+
+    def test_token_only_for_short_circuit(self):
+        for multiprocessing in (True, False):
+            stream = ParallelStream(range(10), worker=2, multiprocessing=multiprocessing)
+            self.assertListEqual(stream.map_concurrent(abs).as_seq(), list(range(10)))
+            self.assertIsNone(stream._cancel_token)
+
+            with ParallelStream(range(10), worker=2, multiprocessing=multiprocessing) as stream:
+                self.assertListEqual(list(stream.map_concurrent(abs)), list(range(10)))
+                self.assertIsNone(stream._cancel_token)
+
+    @skipIf(SharedMemory is None, 'shared memory requires python 3.8')
+    def test_worker_detaches(self):
+        token = CancelToken(True)
+        copy = pickle.loads(pickle.dumps(token))  # as received by worker.
+
+        self.assertFalse(copy.is_set())
+        self.assertIn(token._name, _attached)
+
+        token.close()
+
+        self.assertTrue(copy.is_set())
+        self.assertNotIn(token._name, _attached)  # released on seeing closed flag.
+        self.assertTrue(copy.is_set())
+
+    @skipIf(SharedMemory is None, 'shared memory requires python 3.8')
+    def test_no_leaked_segments(self):
+        # resource tracker reports segments left registered by workers at exit.
+        script = ('from streamAPI.stream.parallelStream import ParallelStream\n'
+                  'from streamAPI.stream.pool import WorkerPool\n'
+                  'if __name__ == "__main__":\n'
+                  '    for method in ("fork", "spawn"):\n'
+                  '        with WorkerPool(2, start_method=method) as pool:\n'
+                  '            for _ in range(10):\n'
+                  '                ParallelStream(range(10), pool=pool).map_concurrent(abs).find_first()\n')
+
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+        out = run([sys.executable, '-c', script], capture_output=True, text=True, timeout=120,
+                  env=dict(os.environ, PYTHONPATH=root))
+
+        self.assertEqual(out.returncode, 0, out.stderr)
+        self.assertNotIn('leaked', out.stderr)
+        self.assertNotIn('Error', out.stderr)
+
+    def test_token(self):
+        for processes in (True, False):
+            token = CancelToken(processes)
+            self.assertFalse(token.is_set())
+            token.set()
+            self.assertTrue(token.is_set())
+            token.close()
+            self.assertTrue(token.is_set())
+            token.close()  # closing again is harmless.
+
+
+if __name__ == '__main__':
+    main()
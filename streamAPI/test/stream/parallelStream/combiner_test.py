@@ -0,0 +1,107 @@
+from operator import add, mul
+from unittest import TestCase, main
+
+from streamAPI.stream.aggregator import Custom, Mean
+from streamAPI.stream.combiner import tree_reduce
+from streamAPI.stream.optional import EMPTY
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.stream import NIL, Stream
+from streamAPI.stream.streamHelper import SetType, TopKType
+
+
+def mod3(x):
+    return x % 3
+
+
+def square(x):
+    return x * x
+
+
+def is_even(x):
+    return x % 2 == 0
+
+
+class CombinerTest(TestCase):
+    def test_tree_reduce(self):
+        self.assertIs(tree_reduce(add, []), NIL)
+
+        for n in range(1, 20):
+            letters = [chr(ord('a') + i) for i in range(n)]
+            self.assertEqual(tree_reduce(add, letters), ''.join(letters))
+
+    def test_reduce(self):
+        for multiprocessing in (True, False):
+            def stream(data=range(1, 11)):
+                return ParallelStream(data, worker=2, multiprocessing=multiprocessing)
+
+            self.assertEqual(stream().reduce_concurrent(mul, chunk_size=3).get(), 3628800)
+            self.assertEqual(stream().reduce_concurrent(add, 100, mapper=square, chunk_size=4).get(), 485)
+            self.assertEqual(stream(map(str, range(30))).reduce_concurrent(add, chunk_size=7).get(),
+                             ''.join(map(str, range(30))))
+            self.assertIs(stream([]).reduce_concurrent(add), EMPTY)
+            self.assertEqual(stream([]).reduce_concurrent(add, 5).get(), 5)
+
+    def test_count_min_max(self):
+        data = [5, 3, 8, -8, 1, 8]
+
+        for multiprocessing in (True, False):
+            def stream():
+                return ParallelStream(data, worker=2, multiprocessing=multiprocessing)
+
+            self.assertEqual(stream().count_concurrent(chunk_size=4), 6)
+            self.assertEqual(stream().count_concurrent(is_even, chunk_size=4), 3)
+            self.assertEqual(stream().min_concurrent(chunk_size=2).get(), -8)
+            self.assertEqual(stream().max_concurrent(chunk_size=2).get(), 8)
+            self.assertEqual(stream().max_concurrent(mapper=square, chunk_size=2).get(), 64)
+            self.assertEqual(stream().min_concurrent(comp=square, chunk_size=2).get(), 1)
+
+        self.assertIs(ParallelStream([], worker=2).min_concurrent(), EMPTY)
+
+    def test_group_by(self):
+        data = list(range(50))
+
+        for multiprocessing in (True, False):
+            for clazz in (None, SetType, TopKType.of(2, reverse=True)):
+                kwargs = {} if clazz is None else dict(value_container_clazz=clazz)
+
+                out = (ParallelStream(data, worker=3, multiprocessing=multiprocessing)
+                       .group_by_concurrent(mod3, square, chunk_size=7, **kwargs))
+
+                self.assertDictEqual(out, Stream(data).group_by(mod3, square, **kwargs))
+
+    def test_mapping(self):
+        out = ParallelStream(range(10), worker=2).mapping_concurrent(mod3, resolve=add, chunk_size=3)
+        self.assertDictEqual(out, Stream(range(10)).mapping(mod3, resolve=add))
+
+        with self.assertRaises(ValueError):
+            ParallelStream(range(10), worker=2).mapping_concurrent(mod3, chunk_size=2)
+
+    def test_aggregate_by(self):
+        out = (ParallelStream(range(100), worker=3)
+               .aggregate_by_concurrent(mod3, chunk_size=9, n='count', total='sum', avg=Mean(square), low='min'))
+
+        self.assertDictEqual(out, Stream(range(100)).aggregate_by(mod3, n='count', total='sum',
+                                                                  avg=Mean(square), low='min'))
+
+    def test_aggregate_by_without_merge(self):
+        calls = []
+
+        def update(s, v):
+            calls.append(v)
+            return s | {v}
+
+        stream = ParallelStream(range(100), worker=2, multiprocessing=False)
+
+        with self.assertRaises(ValueError):
+            stream.aggregate_by_concurrent(mod3, chunk_size=9, distinct=Custom(init=set, update=update))
+
+        self.assertListEqual(calls, [])  # rejected before any job is submitted.
+
+        out = (ParallelStream(range(100), worker=2, multiprocessing=False)
+               .aggregate_by_concurrent(mod3, chunk_size=9,
+                                        distinct=Custom(init=set, update=update, merge=set.union, result=len)))
+        self.assertDictEqual(out, {0: dict(distinct=34), 1: dict(distinct=33), 2: dict(distinct=33)})
+
+
+if __name__ == '__main__':
+    main()
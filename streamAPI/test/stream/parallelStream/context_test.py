@@ -0,0 +1,150 @@
+import os
+from functools import partial
+from tempfile import mkdtemp
+from threading import Lock
+from time import sleep, time
+from unittest import TestCase, main
+
+from streamAPI.stream.context import WorkerContext
+from streamAPI.stream.parallelStream import ParallelStream
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+
+    def query(self, x):
+        assert not self.closed, 'connection is closed'
+        return x * 2
+
+
+def connect():
+    return os.getpid(), object()
+
+
+def pid_of(ctx, x):
+    pid, obj = ctx
+    return pid, id(obj)
+
+
+def mark(directory, ctx):
+    open(os.path.join(directory, str(ctx[0])), 'w').close()
+
+
+class ContextTest(TestCase):
+    def test_threads(self):
+        lock = Lock()
+        opened, closed = [], []
+
+        def init():
+            conn = Connection()
+
+            with lock:
+                opened.append(conn)
+
+            return conn
+
+        def teardown(conn):
+            conn.closed = True
+            closed.append(conn)
+
+        out = (ParallelStream(range(100), worker=4, multiprocessing=False)
+               .map_with_context(lambda conn, x: conn.query(x), init, teardown)
+               .as_seq())
+
+        self.assertListEqual(out, [x * 2 for x in range(100)])
+        self.assertLessEqual(len(opened), 4)  # once per worker thread, not per element.
+        self.assertCountEqual(opened, closed)
+
+    def test_processes(self):
+        out = ParallelStream(range(50), worker=2).map_with_context(pid_of, connect).as_seq()
+
+        contexts = {}
+
+        for pid, i in out:
+            contexts.setdefault(pid, set()).add(i)
+
+        self.assertLessEqual(len(contexts), 2)
+
+        for i in contexts.values():
+            self.assertEqual(len(i), 1)  # one context per worker process
+
+    def test_process_teardown(self):
+        directory = mkdtemp()
+        out = ParallelStream(range(20), worker=2).map_with_context(pid_of, connect, partial(mark, directory)).as_seq()
+        pids = {pid for pid, _ in out}
+
+        start = time()
+
+        while len(os.listdir(directory)) < len(pids) and time() - start < 5:
+            sleep(0.05)
+
+        # torn down when worker process exits, after executor is shut down.
+        self.assertSetEqual({int(f) for f in os.listdir(directory)}, pids)
+
+    def test_teardown_after_running_jobs(self):
+        lock = Lock()
+        running = [0]
+        busy = []  # number of running jobs seen by teardown
+
+        def slow(conn, x):
+            with lock:
+                running[0] += 1
+
+            sleep(0.2 if x else 0)
+            out = conn.query(x)
+
+            with lock:
+                running[0] -= 1
+
+            return out
+
+        def teardown(conn):
+            conn.closed = True
+            busy.append(running[0])
+
+        out = (ParallelStream(range(4), worker=4, multiprocessing=False)
+               .map_with_context(slow, Connection, teardown, ordered=False)
+               .find_first())
+
+        self.assertEqual(out.get(), 0)
+        self.assertTrue(busy)
+        self.assertListEqual(busy, [0] * len(busy))
+
+    def test_iteration(self):
+        closed = []
+
+        def teardown(conn):
+            conn.closed = True
+            closed.append(conn)
+
+        with ParallelStream(range(20), worker=2, multiprocessing=False) as stream:
+            itr = iter(stream.map_with_context(lambda conn, x: conn.query(x), Connection, teardown))
+            self.assertEqual(next(itr), 0)
+
+        # torn down on exit of "with" block, though iterator is still open.
+        self.assertTrue(closed)
+        self.assertTrue(all(conn.closed for conn in closed))
+
+        stream = ParallelStream(range(20), worker=2, multiprocessing=False)
+        out = list(stream.map_with_context(lambda conn, x: conn.query(x), Connection, teardown))
+        self.assertListEqual(out, [x * 2 for x in range(20)])
+
+        closed.clear()
+        stream.shutdown()
+        self.assertListEqual(closed, [])  # already torn down once iteration is over.
+
+    def test_close(self):
+        context = WorkerContext(Connection, lambda conn: setattr(conn, 'closed', True))
+        conn = context.get()
+
+        self.assertIs(context.get(), conn)
+
+        context.close()
+
+        self.assertTrue(conn.closed)
+        self.assertIsNot(context.get(), conn)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+from time import sleep
+from unittest import TestCase, main
+
+from streamAPI.stream.dispatch import AdaptiveDispatch
+from streamAPI.stream.parallelStream import ParallelStream
+
+
+def square(x):
+    return x * x
+
+
+def slow(x):
+    sleep(0.01)
+    return x
+
+
+class AdaptiveDispatchTest(TestCase):
+    def test_auto(self):
+        stream = ParallelStream(range(10000), worker=2, multiprocessing=False).batch_processor(square, 'auto')
+        self.assertListEqual(stream.as_seq(), [x * x for x in range(10000)])
+
+        sizes = stream.dispatcher.sizes
+        self.assertEqual(sum(sizes), 10000)
+        self.assertEqual(sizes[0], 1)
+        self.assertGreater(max(sizes), 1)  # cheap elements are dispatched in larger chunks.
+
+    def test_target(self):
+        dispatch = AdaptiveDispatch(target=0.05, max_size=100)
+
+        out = (ParallelStream(range(100), worker=2)
+               .batch_processor(slow, dispatch, ordered=False)
+               .as_seq())
+
+        self.assertListEqual(sorted(out), list(range(100)))
+        self.assertIsNotNone(dispatch.element_time)
+        self.assertLessEqual(max(dispatch.sizes), 20)  # ~5 elements take 0.05 seconds.
+
+    def test_bounds(self):
+        dispatch = AdaptiveDispatch(max_size=8)
+        ParallelStream(range(1000), worker=2, multiprocessing=False).batch_processor(square, dispatch).done()
+
+        self.assertTrue(all(1 <= size <= 8 for size in dispatch.sizes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+from unittest import TestCase, main
+
+from streamAPI.stream.parallelStream import ParallelStream
+
+unpickled = [0]  # number of records unpickled in this process
+
+
+class Record:
+    def __init__(self, key):
+        self.key = key
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        unpickled[0] += 1
+
+
+def is_even(record: Record):
+    return record.key % 2 == 0
+
+
+def truthy(x):
+    return [x] * 1000 if x % 3 == 0 else []
+
+
+class FilterTest(TestCase):
+    def test_elements_not_sent_back(self):
+        for chunk_size in (None, 4):
+            records = [Record(i) for i in range(40)]
+            unpickled[0] = 0
+
+            out = ParallelStream(records, worker=2).filter_concurrent(is_even, chunk_size=chunk_size).as_seq()
+
+            self.assertListEqual([r.key for r in out], list(range(0, 40, 2)))
+            self.assertTrue(all(a is b for a, b in zip(out, records[::2])))  # elements of parent
+            self.assertEqual(unpickled[0], 0)
+
+    def test_chunks(self):
+        for multiprocessing in (True, False):
+            for ordered in (True, False):
+                out = (ParallelStream(range(100), worker=3, multiprocessing=multiprocessing)
+                       .filter_concurrent(truthy, ordered=ordered, chunk_size=7)
+                       .as_seq())
+
+                if not ordered:
+                    out = sorted(out)
+
+                self.assertListEqual(out, list(range(0, 100, 3)))
+
+    def test_unordered(self):
+        out = ParallelStream(range(50), worker=3).filter_concurrent(truthy, ordered=False).as_seq()
+
+        self.assertListEqual(sorted(out), list(range(0, 50, 3)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+from functools import partial
+from operator import itemgetter
+from unittest import TestCase, main
+
+from streamAPI.stream.aggregator import Custom, Max
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.stream import Stream
+
+events = [{'user': 'u%d' % (i % 7), 'ts': i} for i in range(100)]
+user = itemgetter('user')
+
+
+def latest(events: Stream) -> Stream:
+    return events.sort(itemgetter('ts'), reverse=True).limit(1)
+
+
+def total(n, window):
+    return sum(e['ts'] for e in window)
+
+
+def timestamps(events: Stream) -> Stream:
+    return events.map(itemgetter('ts'))
+
+
+def pair_sum(window):
+    return sum(v for _, v in window)
+
+
+class PartitionTest(TestCase):
+    def test_group_by(self):
+        for multiprocessing in (True, False):
+            out = ParallelStream(events, worker=3, multiprocessing=multiprocessing).partition_by(user).group_by()
+
+            self.assertDictEqual(out, Stream(events).group_by(user))
+
+    def test_mapping_and_aggregate(self):
+        out = ParallelStream(events, worker=3).partition_by(user, shards=5).mapping(itemgetter('ts'), max)
+        self.assertDictEqual(out, {'u%d' % i: max(range(i, 100, 7)) for i in range(7)})
+
+        out = ParallelStream(events, worker=3).partition_by(user).aggregate_by(n='count', first='first')
+        self.assertDictEqual(out, Stream(events).aggregate_by(user, n='count', first='first'))
+
+    def test_distinct(self):
+        out = ParallelStream([3, 1, 3, 2, 1, 5] * 10, worker=2).partition_by(int, shards=4).distinct().as_seq()
+
+        self.assertListEqual(sorted(out), [1, 2, 3, 5])
+
+    def test_apply(self):
+        out = ParallelStream(events, worker=3).partition_by(user).apply(latest, per_key=True).as_seq()
+
+        self.assertCountEqual([e['ts'] for e in out], range(93, 100))
+
+    def test_shard_in_one_worker(self):
+        # state of a shard is kept by one worker, across chunks.
+        data = [3, 1, 3, 2, 1, 5] * 10
+
+        for multiprocessing in (True, False):
+            out = (ParallelStream(data, worker=3, multiprocessing=multiprocessing)
+                   .partition_by(int, shards=4, chunk_size=1)
+                   .distinct()
+                   .as_seq())
+
+            self.assertCountEqual(out, [1, 2, 3, 5])  # parent does not remove duplicates.
+
+        out = (ParallelStream(events, worker=3)
+               .partition_by(user, shards=5, chunk_size=2)
+               .apply(latest, per_key=True)
+               .as_seq())
+
+        self.assertCountEqual([e['ts'] for e in out], range(93, 100))
+
+    def test_window_function(self):
+        out = (ParallelStream(events, worker=3)
+               .partition_by(user)
+               .window_function(partial(total, 2), 2)
+               .as_seq())
+
+        expected = [a + a + 7 for i in range(7) for a in range(i, 93, 7)]  # sums of consecutive events of user
+
+        self.assertCountEqual(out, expected)
+
+    def test_window_function_small_key(self):
+        data = [('a', 1), ('b', 2), ('a', 3), ('c', 4), ('a', 5)]  # "b" and "c" have less than 2 elements
+
+        for multiprocessing in (True, False):
+            out = (ParallelStream(data, worker=2, multiprocessing=multiprocessing)
+                   .partition_by(itemgetter(0))
+                   .window_function(pair_sum, 2)
+                   .as_seq())
+
+            self.assertListEqual(out, [4, 8])
+
+        out = ParallelStream(data, worker=2).partition_by(itemgetter(0)).window_function(pair_sum, 4).as_seq()
+        self.assertListEqual(out, [])
+
+    def test_chunks(self):
+        # keys span many chunks of their shard.
+        def stream():
+            return ParallelStream(events, worker=3).partition_by(user, shards=2, chunk_size=4)
+
+        self.assertDictEqual(stream().group_by(), Stream(events).group_by(user))
+        self.assertDictEqual(stream().mapping(itemgetter('ts'), max),
+                             {'u%d' % i: max(range(i, 100, 7)) for i in range(7)})
+        self.assertDictEqual(stream().aggregate_by(n='count', first='first', last='last'),
+                             Stream(events).aggregate_by(user, n='count', first='first', last='last'))
+        self.assertCountEqual(stream().window_function(partial(total, 2), 2).as_seq(),
+                              [a + a + 7 for i in range(7) for a in range(i, 93, 7)])
+        self.assertCountEqual(stream().apply(timestamps, chunked=True).as_seq(), range(100))
+
+        out = ParallelStream([3, 1, 3, 2, 1, 5] * 10, worker=2).partition_by(int, 2, chunk_size=3).distinct()
+        self.assertListEqual(sorted(out.as_seq()), [1, 2, 3, 5])
+
+    def test_bounded(self):
+        consumed, seen = [], []
+
+        def record(s: Stream) -> Stream:
+            seen.append(len(consumed))
+            return s
+
+        data = Stream(range(1000)).peek(consumed.append)
+
+        with ParallelStream(data, worker=2, multiprocessing=False) as stream:
+            out = stream.partition_by(lambda x: x % 2, chunk_size=10).apply(record, chunked=True).as_seq()
+
+        self.assertCountEqual(out, range(1000))
+        self.assertLess(min(seen), 1000)  # chunks are sent before stream is exhausted.
+
+    def test_aggregate_names(self):
+        # same arguments as Stream.aggregate_by, key_hasher being partition key.
+        latest = Max(itemgetter('ts'))
+        target = Stream(events).aggregate_by(user, timeout=latest, aggs='count')
+
+        out = ParallelStream(events, worker=2).partition_by(user, timeout=10).aggregate_by(timeout=latest, aggs='count')
+        self.assertDictEqual(out, target)
+
+    def test_aggregate_requires_merge(self):
+        with self.assertRaises(ValueError):
+            ParallelStream(events, worker=2).partition_by(user).aggregate_by(s=Custom(init=set, update=set.union))
+
+    def test_lazy(self):
+        consumed = []
+        stream = ParallelStream(Stream(range(10)).peek(consumed.append), worker=2, multiprocessing=False)
+        out = stream.partition_by(lambda x: x % 2).apply(lambda s: s.map(lambda x: -x))
+
+        self.assertListEqual(consumed, [])
+        self.assertCountEqual(out.as_seq(), [-x for x in range(10)])
+
+
+if __name__ == '__main__':
+    main()
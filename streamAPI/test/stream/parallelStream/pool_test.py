@@ -0,0 +1,88 @@
+import sys
+from unittest import TestCase, main
+
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.pool import WorkerPool, get_pool, shutdown_pools
+
+
+def square(x):
+    return x * x
+
+
+def is_loaded(module):
+    return module in sys.modules
+
+
+class PoolTest(TestCase):
+    def test_borrowed_pool(self):
+        with WorkerPool(2, multiprocessing=False) as pool:
+            for _ in range(3):
+                out = ParallelStream(range(10), pool=pool).map_concurrent(square).as_seq()
+                self.assertListEqual(out, [x * x for x in range(10)])
+
+            self.assertFalse(pool.closed)  # stream does not shut down borrowed pool.
+
+        self.assertTrue(pool.closed)
+
+        with self.assertRaises(RuntimeError):
+            ParallelStream(range(10), pool=pool)
+
+    def test_owned_executor_shutdown(self):
+        stream = ParallelStream(range(10), worker=2, multiprocessing=False)
+        self.assertEqual(stream.map_concurrent(square).count(), 10)
+
+        with self.assertRaises(RuntimeError):
+            stream._exec.submit(square, 1)
+
+    def test_iteration_shutdown(self):
+        # executor created by stream is shut down once iteration is over, or is closed.
+        stream = ParallelStream(range(10), worker=2)
+        self.assertListEqual(list(stream.map_concurrent(square)), [x * x for x in range(10)])
+
+        with self.assertRaises(RuntimeError):
+            stream._exec.submit(square, 1)
+
+        stream = ParallelStream(range(100), worker=2, multiprocessing=False)
+        itr = iter(stream.map_concurrent(square))
+        self.assertEqual(next(itr), 0)
+        itr.close()
+
+        with self.assertRaises(RuntimeError):
+            stream._exec.submit(square, 1)
+
+    def test_process_pool(self):
+        # colorsys is not imported by worker, unless it is preloaded.
+        with WorkerPool(2, start_method='spawn') as pool:
+            self.assertFalse(any(ParallelStream(['colorsys'] * 2, pool=pool).map_concurrent(is_loaded)))
+
+        with WorkerPool(2, start_method='spawn', preload=('colorsys',)) as pool:
+            self.assertTrue(all(ParallelStream(['colorsys'] * 2, pool=pool).map_concurrent(is_loaded)))
+
+            out = ParallelStream(range(20), pool=pool).batch_processor(square, 5).as_seq()
+            self.assertListEqual(out, [x * x for x in range(20)])
+
+    def test_warm_up(self):
+        with WorkerPool(8, multiprocessing=False) as pool:
+            self.assertEqual(len(pool.executor._threads), 8)
+
+        with WorkerPool(2, start_method='spawn') as pool:
+            self.assertEqual(len(pool.executor._processes), 2)
+
+    def test_registry(self):
+        try:
+            with self.assertRaises(ValueError):
+                get_pool('test')
+
+            pool = get_pool('test', worker=2, multiprocessing=False)
+            self.assertIs(get_pool('test'), pool)
+
+            shutdown_pools(['test'])
+            self.assertTrue(pool.closed)
+
+            self.assertIsNot(get_pool('test', worker=2, multiprocessing=False), pool)
+        finally:
+            shutdown_pools(['test'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+import os
+import subprocess
+import sys
+from multiprocessing import AuthenticationError
+from tempfile import mkdtemp
+from threading import Thread
+from time import sleep, time
+from unittest import TestCase, main
+
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.remote import RemoteExecutor, parse_address
+from streamAPI.worker.server import WorkerServer
+
+
+def square(x):
+    return x * x
+
+
+def pid(x):
+    sleep(0.01)
+    return os.getpid()
+
+
+def is_odd(x):
+    return x % 2 == 1
+
+
+def fail(x):
+    if x == 3:
+        raise ValueError(x)
+
+    return x
+
+
+class MyErr(Exception):
+    def __init__(self, a, b):  # can not be unpickled, as args are (message,) only
+        super().__init__('{} {}'.format(a, b))
+
+
+def fail_oddly(x):
+    if x == 2:
+        raise MyErr(x, x)
+
+    return x
+
+
+def start(address, **kwargs) -> WorkerServer:
+    server = WorkerServer(address, **kwargs)
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+class RemoteTest(TestCase):
+    def test_address(self):
+        self.assertTupleEqual(parse_address('127.0.0.1:7000'), ('127.0.0.1', 7000))
+        self.assertEqual(parse_address('unix:/tmp/w.sock'), '/tmp/w.sock')
+
+    def test_tcp(self):
+        for multiprocessing in (True, False):
+            with start('127.0.0.1:0', worker=2, multiprocessing=multiprocessing) as server:
+                with RemoteExecutor([server.address]) as executor:
+                    self.assertEqual(executor.worker, 2)
+
+                    out = ParallelStream(range(200), executor=executor).map_concurrent(square).as_seq()
+                    self.assertListEqual(out, [x * x for x in range(200)])
+
+                    # executor is borrowed, so it can be used by next stream.
+                    out = ParallelStream(range(100), executor=executor).batch_processor(square, 7).as_seq()
+                    self.assertListEqual(out, [x * x for x in range(100)])
+
+    def test_unix(self):
+        address = 'unix:' + os.path.join(mkdtemp(), 'worker.sock')
+
+        with start(address, worker=2, multiprocessing=False):
+            with RemoteExecutor([address]) as executor:
+                out = ParallelStream(range(50), executor=executor).filter_concurrent(is_odd).as_seq()
+
+        self.assertListEqual(out, list(range(1, 50, 2)))
+
+    def test_exception(self):
+        with start('127.0.0.1:0', worker=2, multiprocessing=False) as server:
+            with RemoteExecutor([server.address]) as executor:
+                with self.assertRaises(ValueError):
+                    ParallelStream(range(10), executor=executor).map_concurrent(fail).as_seq()
+
+                with self.assertRaises(Exception):
+                    executor.submit(lambda: 1)  # not picklable
+
+    def test_unpicklable_outcome(self):
+        with start('127.0.0.1:0', worker=1, multiprocessing=False) as server:
+            with RemoteExecutor([server.address]) as executor:
+                jobs = [executor.submit(fail_oddly, x) for x in range(6)]
+
+                with self.assertRaises(RuntimeError):
+                    jobs[2].result(timeout=5)
+
+                # later jobs on same connection are still resolved.
+                self.assertListEqual([jobs[x].result(timeout=5) for x in (0, 1, 3, 4, 5)], [0, 1, 3, 4, 5])
+
+    def test_many_daemons(self):
+        with start('127.0.0.1:0', worker=2) as a, start('127.0.0.1:0', worker=2) as b:
+            with RemoteExecutor([a.address, b.address]) as executor:
+                self.assertEqual(executor.worker, 4)
+
+                pids = ParallelStream(range(100), executor=executor).map_concurrent(pid).as_seq()
+
+        self.assertGreaterEqual(len(set(pids)), 3)  # jobs are spread on workers of both daemons
+
+    def test_authkey(self):
+        with start('127.0.0.1:0', worker=1, multiprocessing=False, authkey=b'secret') as server:
+            with self.assertRaises(AuthenticationError):
+                RemoteExecutor([server.address], authkey=b'wrong')
+
+            with RemoteExecutor([server.address], authkey=b'secret') as executor:
+                self.assertEqual(executor.submit(square, 3).result(), 9)
+
+    def test_insecure(self):
+        with self.assertRaises(ValueError):  # anyone on network could run code
+            WorkerServer('0.0.0.0:0', worker=1, multiprocessing=False)
+
+        WorkerServer('0.0.0.0:0', worker=1, multiprocessing=False, authkey=b'secret').close()
+        WorkerServer('0.0.0.0:0', worker=1, multiprocessing=False, insecure=True).close()
+        WorkerServer('localhost:0', worker=1, multiprocessing=False).close()
+
+        daemon = subprocess.run([sys.executable, '-m', 'streamAPI.worker', '--bind', '0.0.0.0:0'],
+                                stderr=subprocess.PIPE, env=dict(os.environ, STREAMAPI_AUTHKEY=''))
+
+        self.assertNotEqual(daemon.returncode, 0)
+        self.assertIn(b'authkey is required', daemon.stderr)
+
+    def test_entry_point(self):
+        address = 'unix:' + os.path.join(mkdtemp(), 'worker.sock')
+        daemon = subprocess.Popen([sys.executable, '-m', 'streamAPI.worker', '--bind', address,
+                                   '--worker', '2', '--threads'])
+
+        try:
+            start_time = time()
+
+            while not os.path.exists(parse_address(address)) and time() - start_time < 10:
+                sleep(0.05)
+
+            executor = RemoteExecutor([address])
+            self.assertEqual(executor.submit(square, 4).result(timeout=5), 16)
+
+            job = executor.submit(sleep, 5)
+            sleep(0.1)
+            daemon.kill()
+
+            with self.assertRaises(ConnectionError):  # daemon is lost
+                job.result(timeout=5)
+
+            executor.shutdown()
+        finally:
+            daemon.kill()
+            daemon.wait()
+
+
+if __name__ == '__main__':
+    main()
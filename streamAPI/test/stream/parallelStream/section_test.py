@@ -0,0 +1,47 @@
+from unittest import TestCase, main
+
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.stream import Stream
+
+
+def square(x):
+    return x * x
+
+
+def is_odd(x):
+    return x % 2 == 1
+
+
+def negate(x):
+    return -x
+
+
+def section(s: Stream) -> Stream:
+    return s.map(square).batch(2).flat_map().filter(is_odd)
+
+
+class ParallelSectionTest(TestCase):
+    def test_element_wise(self):
+        expected = [-x * x for x in range(100) if x % 2]
+
+        for multiprocessing in (True, False):
+            for ordered in (True, False):
+                out = (ParallelStream(range(100), worker=2, multiprocessing=multiprocessing)
+                       .parallel_section(lambda s: s.map(square).filter(is_odd).map(negate),
+                                         chunk_size=7, ordered=ordered)
+                       .as_seq())
+
+                self.assertListEqual(out if ordered else sorted(out, reverse=True), expected)
+
+    def test_recorded_stages(self):
+        self.assertTupleEqual(ParallelStream._section(lambda s: s.map(square).filter(is_odd)),
+                              (('map', square), ('filter', is_odd)))
+        self.assertIs(ParallelStream._section(section), section)
+
+    def test_builder(self):
+        out = ParallelStream(range(20), worker=2).parallel_section(section, chunk_size=5).map(negate).as_seq()
+        self.assertListEqual(out, [-x * x for x in range(20) if x % 2])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+from concurrent.futures import Future
+from threading import Event, Lock
+from time import sleep
+from unittest import TestCase, main
+
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.speculation import Speculation, speculative_window
+
+
+class SpeculationTest(TestCase):
+    def test_straggler(self):
+        attempts = {}
+        lock = Lock()
+        duplicate_done = Event()
+
+        def f(x):
+            with lock:
+                attempts[x] = attempts.get(x, 0) + 1
+                first = attempts[x] == 1
+
+            if x == 25 and first:
+                # first attempt of 25 hits a "noisy neighbour" till its duplicate is done.
+                self.assertTrue(duplicate_done.wait(5), 'straggler was not duplicated')
+                return x * 2
+
+            sleep(0.01)
+
+            if x == 25:
+                duplicate_done.set()
+
+            return x * 2
+
+        spec = Speculation(percentile=90, min_samples=10)
+        out = ParallelStream(range(40), worker=8, multiprocessing=False).map_concurrent(f, speculation=spec).as_seq()
+
+        self.assertListEqual(out, [2 * x for x in range(40)])
+        self.assertGreaterEqual(spec.duplicates, 1)
+        self.assertEqual(attempts[25], 2)
+
+    def test_retries(self):
+        attempts = {}
+
+        def flaky(x):
+            attempts[x] = attempts.get(x, 0) + 1
+
+            if x % 5 == 0 and attempts[x] <= 2:
+                raise ValueError(x)
+
+            if x == 7:
+                raise KeyError(x)
+
+            return x
+
+        failures = []
+        spec = Speculation(percentile=None, retries=2, backoff=0.01, on_failure=lambda g, e: failures.append(g))
+
+        for ordered in (True, False):
+            attempts.clear()
+            spec.failed.clear()
+
+            out = (ParallelStream(range(20), worker=4, multiprocessing=False)
+                   .map_concurrent(flaky, ordered=ordered, speculation=spec)
+                   .as_seq())
+
+            self.assertListEqual(sorted(out), [x for x in range(20) if x != 7])
+            self.assertEqual(attempts[7], 3)
+            self.assertEqual(attempts[5], 3)
+            self.assertEqual([g for g, _ in spec.failed], [7])
+            self.assertIsInstance(spec.failed[0][1], KeyError)
+
+        self.assertListEqual(failures, [7, 7])
+
+    def test_duplicate_done_with_original(self):
+        jobs = []
+
+        def submit(g):
+            job = Future()
+            job.set_running_or_notify_cancel()
+            jobs.append(job)
+
+            if len(jobs) == 2:  # duplicate is submitted; both complete before next wait.
+                for j in jobs:
+                    j.set_result(g * 2)
+
+            return job
+
+        spec = Speculation(percentile=50, min_samples=1)
+        spec.observe(0)  # every running job is a straggler
+
+        for ordered in (True, False):
+            jobs.clear()
+            registered = set()
+
+            out = list(speculative_window(submit, [3], 1, None, ordered, spec, registered))
+
+            self.assertListEqual(out, [6])
+            self.assertEqual(len(jobs), 2)
+            self.assertSetEqual(registered, set())
+
+    def test_backoff(self):
+        spec = Speculation(backoff=0.5, max_backoff=1.5)
+        self.assertListEqual([spec.backoff(a) for a in (1, 2, 3, 4)], [0.5, 1, 1.5, 1.5])
+
+    def test_threshold(self):
+        spec = Speculation(percentile=50, min_samples=4)
+
+        for d in (4, 1, 3):
+            spec.observe(d)
+
+        self.assertIsNone(spec.threshold)
+        spec.observe(2)
+        self.assertEqual(spec.threshold, 2)
+
+
+if __name__ == '__main__':
+    main()
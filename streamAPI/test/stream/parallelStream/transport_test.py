@@ -0,0 +1,84 @@
+from collections import namedtuple
+from unittest import TestCase, main, skipIf
+
+from streamAPI.stream.parallelStream import ParallelStream
+from streamAPI.stream.transport import Handle, SharedMemory, SharedMemoryTransport, decode, encode, release
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Tile = namedtuple('Tile', 'id data')
+
+
+def size(blob):
+    return len(blob)
+
+
+def double(tile: Tile):
+    return Tile(tile.id, tile.data * 2)
+
+
+def reverse(blob):
+    return blob[::-1]
+
+
+@skipIf(SharedMemory is None, 'shared memory is not available.')
+class TransportTest(TestCase):
+    def test_encode_decode(self):
+        handles = []
+        blob = bytes(range(256)) * 4
+        obj = (1, [blob, b'small'], dict(x=bytearray(blob)), Tile(2, blob))
+        encoded = encode(obj, threshold=1000, handles=handles)
+
+        try:
+            self.assertEqual(len(handles), 3)
+            self.assertIsInstance(encoded[1][0], Handle)
+            self.assertEqual(encoded[1][1], b'small')
+            self.assertIsInstance(encoded[3], Tile)
+
+            segments = []
+            decoded = decode(encoded, segments)
+
+            for shm in segments:
+                shm.close()
+
+            self.assertEqual(decoded, obj)
+            self.assertIsInstance(decoded[2]['x'], bytearray)
+        finally:
+            release(handles)
+
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=handles[0].name)
+
+    def test_stream(self):
+        blobs = [bytes([i]) * 100000 for i in range(10)]
+
+        out = (ParallelStream(blobs, worker=2, transport=SharedMemoryTransport())
+               .map_concurrent(reverse)
+               .as_seq())
+        self.assertListEqual(out, blobs)
+
+        out = (ParallelStream(blobs, worker=2, transport=SharedMemoryTransport())
+               .batch_processor(size, 3)
+               .as_seq())
+        self.assertListEqual(out, [100000] * 10)
+
+    @skipIf(np is None, 'numpy is not installed.')
+    def test_numpy(self):
+        tiles = [Tile(i, np.full((100, 100), i, dtype=np.float64)) for i in range(8)]
+
+        out = (ParallelStream(tiles, worker=2, transport=SharedMemoryTransport(threshold=1024))
+               .batch_processor(double, 2)
+               .as_seq())
+
+        self.assertListEqual([t.id for t in out], list(range(8)))
+
+        for i, t in enumerate(out):
+            self.assertIsInstance(t, Tile)
+            self.assertTrue((t.data == 2 * i).all())
+
+
+if __name__ == '__main__':
+    main()
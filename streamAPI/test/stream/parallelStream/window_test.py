@@ -0,0 +1,93 @@
+from concurrent.futures import TimeoutError
+from threading import Event, Lock
+from time import sleep
+from unittest import TestCase, main
+
+from streamAPI.stream.parallelStream import ParallelStream
+
+
+def square(x):
+    return x * x
+
+
+class SlidingWindowTest(TestCase):
+    def test_ordered(self):
+        out = ParallelStream(range(100), worker=4, multiprocessing=False).map_concurrent(square).as_seq()
+        self.assertListEqual(out, [x * x for x in range(100)])
+
+        out = (ParallelStream(range(100), worker=4, multiprocessing=False)
+               .filter_concurrent(lambda x: x % 3 == 0, batch_size=7)
+               .as_seq())
+        self.assertListEqual(out, list(range(0, 100, 3)))
+
+    def test_unordered(self):
+        def f(x):
+            sleep(0.05 if x == 0 else 0.001)
+            return x
+
+        out = ParallelStream(range(20), worker=4, multiprocessing=False).map_concurrent(f, ordered=False).as_seq()
+
+        self.assertEqual(sorted(out), list(range(20)))
+        self.assertNotEqual(out[0], 0)  # straggler comes out late.
+
+    def test_no_barrier(self):
+        # one straggler must not stall rest of the workers: straggler waits
+        # till 20 other elements are done, which can not happen if elements
+        # are processed in batches of 4.
+        lock = Lock()
+
+        for ordered in (True, False):
+            done, released = [], Event()
+
+            def f(x):
+                if x == 0:
+                    self.assertTrue(released.wait(5), 'straggler stalled other workers')
+                else:
+                    sleep(0.001)
+
+                with lock:
+                    done.append(x)
+
+                    if len(done) == 20:
+                        released.set()
+
+                return x
+
+            out = (ParallelStream(range(100), worker=4, multiprocessing=False)
+                   .map_concurrent(f, ordered=ordered)
+                   .as_seq())
+
+            self.assertEqual(out if ordered else sorted(out), list(range(100)))
+            self.assertGreaterEqual(done.index(0), 20)
+
+    def test_in_flight(self):
+        lock, state = Lock(), dict(running=0, max=0)
+
+        def f(x):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+
+            sleep(0.005)
+
+            with lock:
+                state['running'] -= 1
+
+            return x
+
+        ParallelStream(range(50), worker=8, multiprocessing=False).map_concurrent(f, batch_size=3).done()
+        self.assertLessEqual(state['max'], 3)
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            (ParallelStream(range(4), worker=2, multiprocessing=False)
+             .map_concurrent(lambda x: sleep(0.5), timeout=0.05)
+             .as_seq())
+
+    def test_process(self):
+        out = ParallelStream(range(50), worker=2).batch_processor(square, 8).as_seq()
+        self.assertListEqual(out, [x * x for x in range(50)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+from statistics import mean
+from unittest import TestCase, main
+
+from streamAPI.stream.aggregator import Count, Custom, First, Last, Max, Mean, Min, Sum
+from streamAPI.stream.stream import Stream
+from streamAPI.test.testHelper import random
+
+
+class AggregateByTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(1, 1000, size=1000)
+
+    def test_builtin(self):
+        data = self.data
+        key = lambda x: x % 7
+
+        out = Stream(data).aggregate_by(key, n=Count(), total=Sum(), avg=Mean(), lo=Min(), hi=Max(),
+                                        first=First(), last=Last())
+
+        groups = Stream(data).group_by(key)
+
+        target = {k: dict(n=len(v), total=sum(v), avg=mean(v), lo=min(v), hi=max(v), first=v[0], last=v[-1])
+                  for k, v in groups.items()}
+
+        self.assertDictEqual(out, target)
+
+    def test_names_and_values(self):
+        out = Stream(range(10)).aggregate_by(lambda x: x % 2, n='count', total=Sum(lambda x: x ** 2))
+        self.assertDictEqual(out, {0: dict(n=5, total=120), 1: dict(n=5, total=165)})
+
+        with self.assertRaises(ValueError):
+            Stream(range(10)).aggregate_by(lambda x: x % 2, n='median')
+
+    def test_custom(self):
+        distinct = Custom(init=set, update=lambda s, v: s | {v}, merge=set.union, result=sorted,
+                          value=lambda x: x % 3)
+
+        out = Stream(range(10)).aggregate_by(lambda x: x % 2, d=distinct)
+        self.assertDictEqual(out, {0: dict(d=[0, 1, 2]), 1: dict(d=[0, 1, 2])})
+
+        self.assertEqual(distinct.merge({1}, {2}), {1, 2})
+
+    def test_merge(self):
+        data = self.data
+
+        for agg in (Count(), Sum(), Mean(), Min(), Max(), First(), Last()):
+            a, b = agg.init(), agg.init()
+
+            for e in data[:400]:
+                a = agg.update(a, e)
+
+            for e in data[400:]:
+                b = agg.update(b, e)
+
+            c = agg.init()
+
+            for e in data:
+                c = agg.update(c, e)
+
+            self.assertEqual(agg.result(agg.merge(a, b)), agg.result(c))
+
+
+if __name__ == '__main__':
+    main()
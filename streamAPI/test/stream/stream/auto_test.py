@@ -0,0 +1,141 @@
+import os
+from tempfile import mkdtemp
+from threading import get_ident
+from time import sleep
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from streamAPI.stream.auto import PROCESSES, SERIAL, THREADS, Profile, choose_plan, cpu_count, profile
+from streamAPI.stream.stream import Stream
+
+
+def cgroup(files: dict) -> str:
+    root = mkdtemp()
+
+    for path, content in files.items():
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'w') as f:
+            f.write(content)
+
+    return root
+
+
+def busy(x):
+    return sum(range(20000)) + x
+
+
+def nap(x):
+    sleep(0.01)
+    return x
+
+
+class AutoTest(TestCase):
+    def test_cpu_count(self):
+        cpus = cpu_count(cgroup({}))
+
+        self.assertGreaterEqual(cpus, 1)
+        self.assertEqual(cpu_count(cgroup({'cpu.max': 'max 100000\n'})), cpus)
+        self.assertEqual(cpu_count(cgroup({'cpu.max': '50000 100000\n'})), 1)
+        self.assertEqual(cpu_count(cgroup({'cpu/cpu.cfs_quota_us': '-1', 'cpu/cpu.cfs_period_us': '100000'})), cpus)
+        self.assertEqual(cpu_count(cgroup({'cpu/cpu.cfs_quota_us': '50000', 'cpu/cpu.cfs_period_us': '100000'})), 1)
+
+    def test_profile(self):
+        prof, out = profile(nap, [1, 2, 3])
+
+        self.assertListEqual(out, [1, 2, 3])
+        self.assertGreaterEqual(prof.wall, 0.01)
+        self.assertLess(prof.cpu, prof.wall / 2)  # sleeping does not take cpu
+        self.assertTrue(prof.picklable)
+
+        prof, _ = profile(busy, [1, 2, 3])
+        self.assertGreater(prof.cpu, prof.wall / 2)
+
+        prof, _ = profile(lambda x: lambda: x, [1])  # output can not be pickled
+        self.assertIsNone(prof.out_size)
+        self.assertFalse(prof.picklable)
+
+        prof, _ = profile(lambda x: x, [1])  # function can not be sent to process workers
+        self.assertIsNone(prof.func_size)
+        self.assertFalse(prof.picklable)
+
+    def test_choose_plan(self):
+        io = choose_plan(Profile(wall=0.01, cpu=0.0001, in_size=50, out_size=2000, samples=32), cpus=4)
+        self.assertEqual(io.mode, THREADS)
+        self.assertEqual(io.worker, 64)
+
+        cpu_bound = choose_plan(Profile(wall=0.01, cpu=0.01, in_size=50, out_size=50, samples=32), cpus=4)
+        self.assertEqual(cpu_bound.mode, PROCESSES)
+        self.assertEqual(cpu_bound.worker, 4)
+
+        tiny = choose_plan(Profile(wall=1e-5, cpu=1e-5, in_size=50, out_size=50, samples=32), cpus=4)
+        self.assertEqual(tiny.mode, PROCESSES)
+        self.assertGreater(tiny.batch_size, 100)  # dispatch overhead is amortized
+
+        trivial = choose_plan(Profile(wall=1e-7, cpu=1e-7, in_size=50, out_size=50, samples=32), cpus=4)
+        self.assertEqual(trivial.mode, SERIAL)
+
+        big_data = choose_plan(Profile(wall=0.001, cpu=0.001, in_size=10 ** 7, out_size=10 ** 7, samples=32), cpus=4)
+        self.assertEqual(big_data.mode, SERIAL)
+
+        unpicklable = choose_plan(Profile(wall=0.01, cpu=0.01, in_size=None, out_size=50, samples=32), cpus=4)
+        self.assertEqual(unpicklable.mode, SERIAL)
+
+        lambda_func = choose_plan(Profile(wall=0.01, cpu=0.01, in_size=50, out_size=50, samples=32,
+                                          func_size=None), cpus=4)
+        self.assertEqual(lambda_func.mode, SERIAL)
+
+        single_cpu = choose_plan(Profile(wall=0.01, cpu=0.01, in_size=50, out_size=50, samples=32), cpus=1)
+        self.assertEqual(single_cpu.mode, SERIAL)
+
+    def test_auto_parallel(self):
+        plans, threads = [], set()
+
+        def fetch(x):
+            threads.add(get_ident())
+            sleep(0.01)
+            return x * 2
+
+        out = Stream(range(100)).auto_parallel(fetch, sample_size=5, on_plan=plans.append).as_seq()
+
+        self.assertListEqual(out, [x * 2 for x in range(100)])
+        self.assertEqual(plans[0].mode, THREADS)
+        self.assertGreater(len(threads), 2)
+
+        out = Stream(range(10)).auto_parallel(str, on_plan=plans.append).as_seq()
+
+        self.assertListEqual(out, [str(x) for x in range(10)])
+        self.assertEqual(plans[1].mode, SERIAL)
+
+        self.assertListEqual(Stream([]).auto_parallel(str).as_seq(), [])
+
+    def test_lambda_on_many_cpu(self):
+        plans = []
+
+        with patch('streamAPI.stream.auto.cpu_count', return_value=4):
+            out = Stream(range(100)).auto_parallel(lambda x: sum(range(20000)) + x, sample_size=4,
+                                                   on_plan=plans.append).as_seq()
+
+        self.assertListEqual(out, [sum(range(20000)) + x for x in range(100)])
+        self.assertNotEqual(plans[0].mode, PROCESSES)
+
+        with patch('streamAPI.stream.auto.cpu_count', return_value=4):
+            Stream(range(20)).auto_parallel(busy, sample_size=4, on_plan=plans.append).done()
+
+        self.assertEqual(plans[1].mode, PROCESSES)  # picklable function
+
+    def test_worker(self):
+        plans = []
+
+        def fetch(x):
+            sleep(0.01)
+            return x
+
+        Stream(range(20)).auto_parallel(fetch, sample_size=2, worker=3, on_plan=plans.append).done()
+
+        self.assertEqual(plans[0].worker, 3)
+
+
+if __name__ == '__main__':
+    main()
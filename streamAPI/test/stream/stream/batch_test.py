@@ -0,0 +1,80 @@
+from unittest import TestCase, main, skipIf
+
+from streamAPI.stream.batchStream import BatchStream
+from streamAPI.stream.optional import EMPTY
+from streamAPI.stream.stream import Stream
+from streamAPI.test.testHelper import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@skipIf(np is None, 'numpy is not installed')
+class MapBatchesTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(-100, 100, size=1000)
+
+    def test_map_batches(self):
+        data = self.data
+
+        out = Stream(data).map_batches(lambda a: a * 2, 64).rows().as_seq()
+        self.assertListEqual(out, [2 * e for e in data])
+
+        out = Stream(data).map_batches(lambda a: a[a > 0], 64).map_batches(np.sqrt).rows().as_seq()
+        self.assertListEqual(out, [e ** 0.5 for e in data if e > 0])
+
+    def test_terminals(self):
+        data = self.data
+        square = lambda a: a ** 2
+
+        self.assertEqual(Stream(data).map_batches(square, 37).sum(), sum(e ** 2 for e in data))
+        self.assertAlmostEqual(Stream(data).map_batches(square, 37).mean().get(),
+                               sum(e ** 2 for e in data) / len(data))
+        self.assertEqual(Stream(data).map_batches(np.negative, 37).min().get(), -max(data))
+        self.assertEqual(Stream(data).map_batches(np.negative, 37).max().get(), -min(data))
+
+        self.assertEqual(Stream([]).map_batches(square, 5).sum(), 0)
+        self.assertIs(Stream([]).map_batches(square, 5).mean(), EMPTY)
+        self.assertIs(Stream([1]).map_batches(lambda a: a[a > 1], 5).max(), EMPTY)
+
+    def test_columns(self):
+        rows = [dict(x=i, y=float(i % 7)) for i in range(100)]
+
+        def add_z(b):
+            return dict(b, z=b['x'] * b['y'])
+
+        out = Stream(rows).map_batches(add_z, 8, dtype=dict(x=np.int64)).sum()
+        self.assertDictEqual(out, dict(x=sum(range(100)),
+                                       y=sum(r['y'] for r in rows),
+                                       z=sum(r['x'] * r['y'] for r in rows)))
+
+        out = Stream(rows).map_batches(add_z, 8).rows().limit(2).as_seq()
+        self.assertListEqual(out, [dict(x=0, y=0.0, z=0.0), dict(x=1, y=1.0, z=1.0)])
+
+        self.assertEqual(Stream(rows).map_batches(add_z, 8).max().get()['z'], max(r['x'] * r['y'] for r in rows))
+
+    def test_rows_is_plain_stream(self):
+        data = self.data
+
+        out = Stream(data).map_batches(lambda a: a * 2, 64).rows()
+        self.assertNotIsInstance(out, BatchStream)
+        self.assertEqual(out.max().get(), 2 * max(data))
+
+        self.assertEqual(Stream(data).map_batches(lambda a: a * 2, 64).rows().map(str).count(), len(data))
+
+    def test_comp(self):
+        rows = [dict(x=i, y=float(i % 7)) for i in range(100)]
+
+        out = Stream(rows).map_batches(lambda b: b, 8).min(comp=lambda r: (r['y'], -r['x'])).get()
+        self.assertDictEqual(out, dict(x=98, y=0.0))
+
+        out = Stream(rows).map_batches(lambda b: b, 8).max(lambda r: (r['y'], r['x'])).get()
+        self.assertDictEqual(out, dict(x=97, y=6.0))
+
+        self.assertIs(Stream([1]).map_batches(lambda a: a[a > 1], 5).min(abs), EMPTY)
+
+
+if __name__ == '__main__':
+    main()
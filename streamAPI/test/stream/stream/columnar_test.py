@@ -0,0 +1,168 @@
+from csv import DictWriter
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from streamAPI.stream.aggregator import Count, Custom, Max
+from streamAPI.stream.columnarStream import ColumnarStream
+from streamAPI.stream.stream import Stream
+from streamAPI.test.testHelper import random
+from streamAPI.utility.utils import csv_itr
+
+
+class ColumnarTest(TestCase):
+    def setUp(self):
+        rnd = random()
+
+        self.rows = [dict(city=rnd.choice('abcd'), amount=rnd.randrange(100), qty=rnd.randrange(5))
+                     for _ in range(300)]
+
+    def test_ops(self):
+        rows = self.rows
+
+        out = (ColumnarStream.from_rows(rows, batch_size=32)
+               .where(lambda amount, qty: amount > qty * 10, 'amount', 'qty')
+               .with_column('total', lambda amount, qty: amount * qty, 'amount', 'qty')
+               .select('city', 'total')
+               .rows()
+               .as_seq())
+
+        target = [dict(city=r['city'], total=r['amount'] * r['qty'])
+                  for r in rows if r['amount'] > r['qty'] * 10]
+
+        self.assertListEqual(out, target)
+
+    def test_count_and_columns(self):
+        self.assertEqual(ColumnarStream.from_rows(self.rows, batch_size=7).count(), len(self.rows))
+
+        out = ColumnarStream.from_rows(self.rows, batch_size=7).select('qty').as_columns()
+        self.assertDictEqual(out, dict(qty=[r['qty'] for r in self.rows]))
+
+        self.assertEqual(ColumnarStream.from_rows([]).count(), 0)
+
+    def test_group_by(self):
+        rows = self.rows
+
+        out = ColumnarStream.from_rows(rows, batch_size=32).group_by_columns('city', columns='amount')
+        target = Stream(rows).group_by(lambda r: r['city'], lambda r: r['amount'])
+
+        self.assertDictEqual({k: v['amount'] for k, v in out.items()}, target)
+
+        out = ColumnarStream.from_rows(rows, batch_size=32).aggregate(('city', 'qty'),
+                                                                      total=('amount', sum),
+                                                                      n=('amount', len))
+        target = Stream(rows).group_by(lambda r: (r['city'], r['qty']), lambda r: r['amount'])
+
+        self.assertDictEqual(out, {k: dict(total=sum(v), n=len(v)) for k, v in target.items()})
+
+    def test_batch_ops(self):
+        # inherited operations keep contract of Stream, acting on record batches.
+        stream = ColumnarStream.from_rows([dict(a=i) for i in range(10)], batch_size=4)
+        out = stream.partition(lambda batch: len(batch['a']) == 4)
+
+        self.assertDictEqual(out, {True: [dict(a=[0, 1, 2, 3]), dict(a=[4, 5, 6, 7])], False: [dict(a=[8, 9])]})
+
+        for op in ('distinct', 'sort', 'min', 'max'):
+            with self.subTest(op=op), self.assertRaises(TypeError):
+                getattr(ColumnarStream.from_rows(self.rows), op)()
+
+        self.assertEqual(ColumnarStream.from_rows(self.rows).rows().max(lambda r: r['amount']).get()['amount'],
+                         max(r['amount'] for r in self.rows))
+
+    def test_aggregate(self):
+        rows = self.rows
+
+        out = ColumnarStream.from_rows(rows, batch_size=32).aggregate('city',
+                                                                      total=('amount', 'sum'),
+                                                                      n=('amount', Count()),
+                                                                      avg=('qty', 'mean'),
+                                                                      top=('amount', Max(lambda a: -a)),
+                                                                      qty=('qty', sorted))
+        target = Stream(rows).group_by(lambda r: r['city'])
+
+        self.assertDictEqual(out, {k: dict(total=sum(r['amount'] for r in v),
+                                           n=len(v),
+                                           avg=sum(r['qty'] for r in v) / len(v),
+                                           top=max(-r['amount'] for r in v),
+                                           qty=sorted(r['qty'] for r in v))
+                                   for k, v in target.items()})
+
+    def test_aggregate_folds(self):
+        # values are folded into a state per group, batch by batch.
+        states = []
+
+        def update(state, v):
+            states.append(state)
+            return state + v
+
+        rows = [dict(a=i % 2, b=i) for i in range(10)]
+        out = ColumnarStream.from_rows(rows, batch_size=3).aggregate('a', total=('b', Custom(int, update)))
+
+        self.assertDictEqual(out, {0: dict(total=20), 1: dict(total=25)})
+        self.assertEqual(len(states), 10)  # one update per row
+        self.assertTrue(all(isinstance(state, int) for state in states))
+
+    def test_rows_is_plain_stream(self):
+        rows = [{'name': 'alice', 'a': 1}, {'name': 'bob', 'a': 2}, {'name': 'carol', 'a': 1}]
+
+        self.assertEqual(ColumnarStream.from_rows(rows).rows().count(), 3)
+        self.assertDictEqual(ColumnarStream.from_rows(rows).rows().group_by(lambda r: r['a'], lambda r: r['name']),
+                             {1: ['alice', 'carol'], 2: ['bob']})
+        self.assertNotIsInstance(ColumnarStream.from_rows(rows).rows(), ColumnarStream)
+
+    def test_csv(self):
+        with TemporaryDirectory() as d:
+            file = join(d, 'data.csv')
+
+            with open(file, 'w') as f:
+                writer = DictWriter(f, fieldnames=('city', 'amount', 'qty'))
+                writer.writeheader()
+                writer.writerows(self.rows)
+
+            out = ColumnarStream.from_csv(file, batch_size=50).rows().as_seq()
+            self.assertListEqual(out, list(csv_itr(file)))
+
+            out = (ColumnarStream.from_csv(file, batch_size=50, columns=('qty', 'amount'))
+                   .with_column('amount', int, 'amount')
+                   .aggregate('qty', total=('amount', sum)))
+
+            target = Stream(self.rows).mapping(lambda r: str(r['qty']), lambda r: r['amount'],
+                                               resolve=lambda a, b: a + b)
+
+            self.assertDictEqual(out, {k: dict(total=v) for k, v in target.items()})
+
+    def write(self, directory: str, text: str) -> str:
+        file = join(directory, 'data.csv')
+
+        with open(file, 'w') as f:
+            f.write(text)
+
+        return file
+
+    def test_csv_blank_rows(self):
+        with TemporaryDirectory() as d:
+            file = self.write(d, 'city,amount\na,1\n\nb,2\n\n')
+
+            out = ColumnarStream.from_csv(file, batch_size=2).rows().as_seq()
+
+            self.assertListEqual(out, [dict(city='a', amount='1'), dict(city='b', amount='2')])
+            self.assertListEqual(out, list(csv_itr(file)))
+
+    def test_csv_short_rows(self):
+        with TemporaryDirectory() as d:
+            file = self.write(d, 'city,amount,qty\na,1,5\nb\nc,3\n')
+
+            out = ColumnarStream.from_csv(file, batch_size=2).rows().as_seq()
+
+            self.assertListEqual(out, [dict(city='a', amount='1', qty='5'),
+                                       dict(city='b', amount=None, qty=None),
+                                       dict(city='c', amount='3', qty=None)])
+            self.assertListEqual(out, list(csv_itr(file)))
+
+            # batch made only of short rows.
+            self.assertListEqual(ColumnarStream.from_csv(file, batch_size=1, columns='qty').rows().as_seq(),
+                                 [dict(qty='5'), dict(qty=None), dict(qty=None)])
+
+
+if __name__ == '__main__':
+    main()
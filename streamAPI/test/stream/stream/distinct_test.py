@@ -0,0 +1,59 @@
+from unittest import TestCase, main
+
+from streamAPI.stream.stream import Stream
+from streamAPI.stream.streamHelper import BloomFilter
+from streamAPI.test.testHelper import random
+
+
+class DistinctTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(1, 50, size=1000)
+
+    def test_distinct(self):
+        data = self.data
+
+        self.assertListEqual(Stream(data).distinct().as_seq(), list(dict.fromkeys(data)))
+        self.assertListEqual(Stream(['a', 'bb', 'c', 'dd', 'eee']).distinct(key=len).as_seq(),
+                             ['a', 'bb', 'eee'])
+
+    def test_window(self):
+        self.assertListEqual(Stream([1, 2, 3, 1, 2, 1]).distinct(window=2).as_seq(), [1, 2, 3, 1, 2])
+        self.assertListEqual(Stream([1, 2, 1, 3, 1, 4, 1]).distinct(window=2).as_seq(), [1, 2, 3, 4])
+
+        # window large enough to hold every key behaves like distinct.
+        data = self.data
+        self.assertListEqual(Stream(data).distinct(window=100).as_seq(), list(dict.fromkeys(data)))
+
+        out = Stream(data).distinct(key=lambda x: x % 7, window=7).as_seq()
+        self.assertListEqual(out, Stream(data).distinct(key=lambda x: x % 7).as_seq())
+
+    def test_approximate(self):
+        data = range(10000)
+
+        out = Stream(data).map(lambda x: x % 5000).distinct(approximate=True, capacity=5000).as_seq()
+
+        self.assertEqual(len(out), len(set(out)))
+        self.assertGreater(len(out), 4800)
+
+    def test_bloom_filter(self):
+        bf = BloomFilter(1000, 0.01)
+
+        self.assertFalse(bf.add('a'))
+        self.assertTrue(bf.add('a'))
+        self.assertIn('a', bf)
+
+        for i in range(1000):
+            bf.add(i)
+
+        self.assertTrue(all(i in bf for i in range(1000)))
+
+        false_positive = sum(i in bf for i in range(1000, 11000))
+        self.assertLess(false_positive, 300)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Stream(self.data).distinct(window=10, approximate=True)
+
+
+if __name__ == '__main__':
+    main()
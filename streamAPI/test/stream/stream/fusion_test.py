@@ -0,0 +1,58 @@
+from unittest import TestCase, main
+
+from streamAPI.stream.fusion import FILTER, MAP, PEEK, fuse
+from streamAPI.stream.stream import Stream
+
+
+class FusionTest(TestCase):
+    def test_fuse(self):
+        peeked = []
+
+        out = list(fuse(range(10), [(MAP, lambda x: x + 1),
+                                    (FILTER, lambda x: x % 2 == 0),
+                                    (PEEK, peeked.append),
+                                    (MAP, lambda x: x * 10)]))
+
+        self.assertListEqual(out, [20, 40, 60, 80, 100])
+        self.assertListEqual(peeked, [2, 4, 6, 8, 10])
+
+    def test_single_stage(self):
+        self.assertListEqual(list(fuse(range(4), [(MAP, str)])), ['0', '1', '2', '3'])
+        self.assertListEqual(list(fuse(range(4), [(FILTER, bool)])), [1, 2, 3])
+        self.assertListEqual(list(fuse(range(4), [])), [0, 1, 2, 3])
+
+    def test_stream(self):
+        peeked = []
+
+        out = (Stream(range(20))
+               .map(lambda x: x * 3)
+               .peek(peeked.append)
+               .filter(lambda x: x % 2)
+               .limit(3)
+               .map(lambda x: -x)
+               .as_seq())
+
+        self.assertListEqual(out, [-3, -9, -15])
+        self.assertListEqual(peeked, [0, 3, 6, 9, 12, 15])
+
+    def test_filter_none(self):
+        out = list(fuse([0, 1, '', 'a', None, 2], [(MAP, lambda x: x), (FILTER, None), (PEEK, id)]))
+        self.assertListEqual(out, [1, 'a', 2])
+
+        self.assertListEqual(Stream(range(-3, 4)).map(lambda x: x * 2).filter(None).as_seq(), [-6, -4, -2, 2, 4, 6])
+        self.assertListEqual(Stream([0, 1, 2]).filter(None).map(str).as_seq(), ['1', '2'])
+        self.assertListEqual(Stream([0, 1, 2]).filter(None).as_seq(), [1, 2])
+
+    def test_laziness(self):
+        called = []
+
+        stream = Stream(range(5)).peek(called.append).map(lambda x: x + 1)
+        self.assertListEqual(called, [])
+
+        self.assertEqual(next(stream), 1)
+        self.assertEqual(next(stream), 2)
+        self.assertListEqual(called, [0, 1])
+
+
+if __name__ == '__main__':
+    main()
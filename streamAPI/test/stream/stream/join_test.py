@@ -0,0 +1,111 @@
+from collections import Counter
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from streamAPI.stream import join
+from streamAPI.stream.join import hash_join
+from streamAPI.stream.spill import size_of
+from streamAPI.stream.stream import Stream
+from streamAPI.test.testHelper import random
+
+
+class JoinTest(TestCase):
+    def setUp(self):
+        rnd = random()
+
+        self.left = [(rnd.randrange(50), i) for i in range(300)]
+        self.right = [(rnd.randrange(40), -i) for i in range(100)]
+
+    def target(self, how):
+        left, right = self.left, self.right
+
+        if how == 'inner':
+            return [(l, r) for l in left for r in right if l[0] == r[0]]
+
+        if how == 'left':
+            out = []
+
+            for l in left:
+                matches = [(l, r) for r in right if l[0] == r[0]]
+                out.extend(matches or [(l, None)])
+
+            return out
+
+        keys = {r[0] for r in right}
+
+        if how == 'semi':
+            return [l for l in left if l[0] in keys]
+
+        return [l for l in left if l[0] not in keys]
+
+    def test_join(self):
+        key = lambda x: x[0]
+
+        for how in ('left', 'semi', 'anti'):
+            out = Stream(self.left).join(self.right, key, how=how).as_seq()
+            self.assertListEqual(out, self.target(how))
+
+        # for inner join, order depends on build side.
+        out = Stream(self.left).join(self.right, key).as_seq()
+        self.assertEqual(Counter(out), Counter(self.target('inner')))
+
+        out = Stream(self.right[:3]).join(self.left, key).map(lambda x: (x[1], x[0])).as_seq()
+        self.assertEqual(Counter(out), Counter((l, r) for l, r in self.target('inner') if r in self.right[:3]))
+
+    def test_spill(self):
+        key = lambda x: x[0]
+
+        for how in ('inner', 'left', 'semi', 'anti'):
+            out = list(hash_join(self.left, self.right, key, key, how=how, memory_limit=500, partitions=3))
+            self.assertEqual(Counter(out), Counter(self.target(how)))
+
+    def test_spill_large_build(self):
+        # build side is far larger than PARTITIONS times memory limit.
+        key = lambda x: x[0]
+        left = [(i % 3000, i) for i in range(0, 6000, 7)]
+        right = [(i, -i) for i in range(3000)]
+        limit = 2000
+        tables = []
+
+        def build(*args):
+            table, overflow = _build(*args)
+            tables.append(sum(size_of(e) for values in table.values() for e in values or ()))
+            return table, overflow
+
+        _build = join._build
+
+        with patch.object(join, '_build', build):
+            out = list(hash_join(left, right, key, key, how='inner', memory_limit=limit))
+
+        self.assertGreater(size_of(right[0]) * len(right), 16 * limit)
+        self.assertEqual(Counter(out), Counter((l, (l[0], -l[0])) for l in left))
+        self.assertLessEqual(max(tables), limit + size_of(right[0]))
+
+        self.left, self.right = left, right[::2]
+
+        for how in ('left', 'semi', 'anti'):
+            out = list(hash_join(self.left, self.right, key, key, how=how, memory_limit=limit))
+            self.assertEqual(Counter(out), Counter(self.target(how)))
+
+    def test_spill_single_key(self):
+        # elements of a key can not be split; they are joined in memory eventually.
+        key = lambda x: x[0]
+        right = [(1, i) for i in range(500)]
+
+        out = list(hash_join([(1, 'a'), (2, 'b')], right, key, key, how='left', memory_limit=200, partitions=2))
+        self.assertEqual(Counter(out), Counter([((1, 'a'), r) for r in right] + [((2, 'b'), None)]))
+
+    def test_empty(self):
+        key = lambda x: x
+
+        self.assertListEqual(Stream([]).join([1, 2], key).as_seq(), [])
+        self.assertListEqual(Stream([1, 2]).join([], key).as_seq(), [])
+        self.assertListEqual(Stream([1, 2]).join([], key, how='left').as_seq(), [(1, None), (2, None)])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Stream([1]).join([1], lambda x: x, how='outer')
+
+
+if __name__ == '__main__':
+    main()
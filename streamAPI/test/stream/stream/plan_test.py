@@ -0,0 +1,58 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import TestCase, main
+
+from streamAPI.stream.plan import LIMIT, SKIP, TOP_K, optimize
+from streamAPI.stream.stream import Stream
+from streamAPI.test.testHelper import random
+
+
+class PlanTest(TestCase):
+    def test_sort_limit(self):
+        data = random().int_range(1, 1000, size=500)
+
+        out = Stream(data).sort().limit(10).as_seq()
+        self.assertListEqual(out, sorted(data)[:10])
+
+        out = Stream(data).sort(comp=lambda x: x % 7, reverse=True).limit(10).as_seq()
+        self.assertListEqual(out, sorted(data, key=lambda x: x % 7, reverse=True)[:10])
+
+        stream = Stream(data).sort().limit(5)
+        self.assertListEqual([node.kind for node in optimize(stream._plan)], [TOP_K])
+
+    def test_skip_before_pure_map(self):
+        mapped = []
+
+        def f(x):
+            mapped.append(x)
+            return x * 2
+
+        out = Stream(range(10)).map(f, pure=True).skip(7).as_seq()
+
+        self.assertListEqual(out, [14, 16, 18])
+        self.assertListEqual(mapped, [7, 8, 9])
+
+        # impure map is not reordered.
+        stream = Stream(range(10)).map(f).skip(7)
+        self.assertEqual(optimize(stream._plan)[-1].kind, SKIP)
+
+        stream = Stream(range(10)).map(f, pure=True).limit(3)
+        self.assertEqual(optimize(stream._plan)[0].kind, LIMIT)
+
+    def test_distinct_count(self):
+        self.assertEqual(Stream([1, 2, 1, 3, 2]).distinct().count(), 3)
+        self.assertEqual(Stream([1, 2, 1, 3, 2]).distinct().map(str).count(), 3)
+        self.assertEqual(Stream([]).distinct().count(), 0)
+
+    def test_explain(self):
+        out = StringIO()
+
+        with redirect_stdout(out):
+            stream = Stream(range(10)).sort().limit(3).explain('as_seq')
+
+        self.assertIn('top_k(k=3, comp=None, reverse=False)', out.getvalue())
+        self.assertListEqual(stream.as_seq(), [0, 1, 2])
+
+
+if __name__ == '__main__':
+    main()
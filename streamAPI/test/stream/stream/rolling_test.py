@@ -0,0 +1,69 @@
+from unittest import TestCase, main
+
+from streamAPI.stream.stream import Stream
+from streamAPI.stream.streamHelper import SlidingWindow
+from streamAPI.test.testHelper import random
+
+
+class RollingTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(-100, 100, size=500)
+
+    def windows(self, n):
+        data = self.data
+        return [data[i:i + n] for i in range(len(data) - n + 1)]
+
+    def test_window_function(self):
+        for n in (1, 3, 17):
+            out = Stream(self.data).window_function(tuple, n).as_seq()
+            self.assertListEqual(out, [tuple(w) for w in self.windows(n)])
+
+            out = Stream(self.data).window_function(tuple, n, view=True).as_seq()
+            self.assertListEqual(out, [tuple(w) for w in self.windows(n)])
+
+    def test_window_is_copied(self):
+        # windows can be kept, unless they are views.
+        out = Stream([1, 2, 3, 4]).window_function(lambda w: w, 2).as_seq()
+        self.assertListEqual(out, [(1, 2), (2, 3), (3, 4)])
+
+        out = Stream([1, 2, 3, 4]).window_function(lambda w: w, 2, view=True).as_seq()
+        self.assertIsInstance(out[0], SlidingWindow)
+        self.assertTrue(all(w is out[0] for w in out))
+
+    def test_rolling_sum(self):
+        for n in (1, 4, 50):
+            self.assertListEqual(Stream(self.data).rolling_sum(n).as_seq(), [sum(w) for w in self.windows(n)])
+            self.assertListEqual(Stream(self.data).rolling_mean(n).as_seq(),
+                                 [sum(w) / n for w in self.windows(n)])
+
+    def test_rolling_min_max(self):
+        for n in (1, 4, 50):
+            self.assertListEqual(Stream(self.data).rolling_min(n).as_seq(), [min(w) for w in self.windows(n)])
+            self.assertListEqual(Stream(self.data).rolling_max(n).as_seq(), [max(w) for w in self.windows(n)])
+
+        comp = abs
+        out = Stream(self.data).rolling_max(5, comp=comp).map(comp).as_seq()
+        self.assertListEqual(out, [max(map(comp, w)) for w in self.windows(5)])
+
+    def test_short_stream(self):
+        for op in ('rolling_sum', 'rolling_mean', 'rolling_min', 'rolling_max'):
+            with self.assertRaises(ValueError):
+                getattr(Stream([1, 2]), op)(3).as_seq()
+
+    def test_sliding_window(self):
+        window = SlidingWindow([1, 2, 3])
+        window.push(4)
+        window.push(5)
+
+        self.assertTupleEqual(tuple(window), (3, 4, 5))
+        self.assertEqual(window[0], 3)
+        self.assertEqual(window[-1], 5)
+        self.assertTupleEqual(window[1:], (4, 5))
+        self.assertEqual(len(window), 3)
+
+        with self.assertRaises(IndexError):
+            window[3]
+
+
+if __name__ == '__main__':
+    main()
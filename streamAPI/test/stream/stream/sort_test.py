@@ -0,0 +1,48 @@
+from operator import itemgetter
+from unittest import TestCase, main
+
+from streamAPI.stream.spill import SpillFile, external_sort
+from streamAPI.stream.stream import Stream
+from streamAPI.test.testHelper import random
+
+
+class SortTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(1, 1000, size=5000)
+
+    def test_sort(self):
+        data = self.data
+
+        self.assertListEqual(Stream(data).sort(memory_limit=4096).as_seq(), sorted(data))
+        self.assertListEqual(Stream(data).sort(reverse=True, memory_limit=4096).as_seq(),
+                             sorted(data, reverse=True))
+        self.assertListEqual(Stream([]).sort(memory_limit=4096).as_seq(), [])
+
+    def test_stability(self):
+        data = list(enumerate(self.data))
+        key = lambda x: x[1] % 10
+
+        out = list(external_sort(data, key=key, memory_limit=2048, frame_size=7))
+        self.assertListEqual(out, sorted(data, key=key))
+
+        out = list(external_sort(data, key=key, reverse=True, memory_limit=2048))
+        self.assertListEqual(out, sorted(data, key=key, reverse=True))
+
+    def test_sort_limit(self):
+        data = [dict(id=e) for e in self.data]
+
+        out = Stream(data).sort(comp=itemgetter('id'), memory_limit=1024).limit(5).as_seq()
+        self.assertListEqual(out, sorted(data, key=itemgetter('id'))[:5])
+
+    def test_spill_file(self):
+        with SpillFile(frame_size=3) as f:
+            f.write(range(10))
+            f.write(range(2))
+
+            self.assertEqual(len(f), 12)
+            self.assertListEqual(list(f), list(range(10)) + [0, 1])
+            self.assertListEqual(list(f), list(range(10)) + [0, 1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+from unittest import TestCase, main
+
+from streamAPI.stream.stream import Stream
+from streamAPI.stream.streamHelper import TopKType
+from streamAPI.test.testHelper import random
+
+
+class TopKTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(1, 100, size=1000)
+
+    def test_intermediate(self):
+        data = self.data
+
+        self.assertListEqual(Stream(data).top_k(10).as_seq(), sorted(data)[:10])
+        self.assertListEqual(Stream(data).top_k(10, reverse=True).map(str).as_seq(),
+                             [str(e) for e in sorted(data, reverse=True)[:10]])
+        self.assertListEqual(Stream(data).top_k(0).as_seq(), [])
+
+    def test_terminal(self):
+        data = self.data
+        comp = lambda x: x % 10
+
+        self.assertListEqual(Stream(data).nsmallest(7, comp=comp), sorted(data, key=comp)[:7])
+        self.assertListEqual(Stream(data).nlargest(7, comp=comp),
+                             sorted(data, key=comp, reverse=True)[:7])
+        self.assertListEqual(Stream([]).nlargest(3), [])
+
+    def test_group_by(self):
+        data = self.data
+        comp = lambda x: -x
+
+        for k, reverse in ((1, False), (3, True), (5, False)):
+            out = Stream(data).group_by(lambda x: x % 3,
+                                        value_container_clazz=TopKType.of(k, comp=comp, reverse=reverse))
+
+            target = Stream(data).group_by(lambda x: x % 3)
+
+            for key, values in target.items():
+                self.assertListEqual(out[key], sorted(values, key=comp, reverse=reverse)[:k])
+
+    def test_stability(self):
+        data = [(1, 'a'), (0, 'b'), (1, 'c'), (0, 'd'), (1, 'e')]
+        first = lambda x: x[0]
+
+        container = TopKType.of(3, comp=first)()
+
+        for e in data:
+            container.add(e)
+
+        self.assertListEqual(container, sorted(data, key=first)[:3])
+
+        container = TopKType.of(3, comp=first, reverse=True)()
+
+        for e in data:
+            container.add(e)
+
+        self.assertListEqual(container, sorted(data, key=first, reverse=True)[:3])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+from streamAPI.worker.server import *
+
+del server
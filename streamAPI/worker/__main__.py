@@ -0,0 +1,40 @@
+"""
+Runs a worker daemon for RemoteExecutor.
+
+    STREAMAPI_AUTHKEY=secret python -m streamAPI.worker --bind 0.0.0.0:7000 --worker 16
+    python -m streamAPI.worker --bind unix:/tmp/streamAPI.sock --threads
+
+Shared secret for authentication of clients is read from environment
+variable STREAMAPI_AUTHKEY. Jobs run arbitrary code, so it is required
+unless daemon listens on a Unix socket or a loopback address, or
+--insecure is given.
+"""
+
+import os
+from argparse import ArgumentParser
+
+from streamAPI.worker.server import serve
+
+
+def main(args=None):
+    parser = ArgumentParser(prog='python -m streamAPI.worker', description='worker daemon for RemoteExecutor')
+    parser.add_argument('--bind', required=True, help='host:port or unix:path')
+    parser.add_argument('--worker', type=int, default=None, help='number of worker (default: number of cpu)')
+    parser.add_argument('--threads', action='store_true', help='use threads instead of processes')
+    parser.add_argument('--preload', nargs='*', default=(), help='modules to be imported in each worker')
+    parser.add_argument('--insecure', action='store_true',
+                        help='listen on a non loopback address without STREAMAPI_AUTHKEY')
+    args = parser.parse_args(args)
+
+    authkey = os.environ.get('STREAMAPI_AUTHKEY')
+
+    try:
+        serve(args.bind, worker=args.worker, multiprocessing=not args.threads,
+              authkey=authkey.encode() if authkey else None, preload=args.preload,
+              insecure=args.insecure)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
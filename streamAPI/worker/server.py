@@ -0,0 +1,222 @@
+import os
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener
+from pickle import loads
+from queue import Empty, SimpleQueue
+from ipaddress import ip_address
+from socket import SHUT_RDWR, gaierror, gethostbyname, socket
+from threading import Thread
+from typing import Sequence
+
+from streamAPI.stream.pool import WorkerPool
+from streamAPI.stream.remote import BATCH_SIZE, Address, _dump, execute, parse_address
+from streamAPI.utility.utils import get_functions_clazz
+
+_STOP = object()
+
+
+def _hang_up(conn: Connection):
+    """
+    closes connection; socket is shut down first, so that client sees
+    end of connection even if a copy of socket is held by a forked process.
+    """
+
+    try:
+        with socket(fileno=os.dup(conn.fileno())) as s:
+            s.shutdown(SHUT_RDWR)
+    except OSError:
+        pass
+
+    conn.close()
+
+
+def _is_loopback(address) -> bool:
+    """
+    :return: True if "address" (as parsed by parse_address) is a Unix socket
+             or a TCP address reachable from local host only.
+    """
+
+    if isinstance(address, str):
+        return True
+
+    try:
+        return ip_address(gethostbyname(address[0] or '0.0.0.0')).is_loopback
+    except (gaierror, ValueError):
+        return False
+
+
+class WorkerServer:
+    """
+    Worker daemon serving RemoteExecutor: jobs received on a connection are
+    run by a pool of "worker" processes (or threads) and results are sent
+    back, as many as are ready in a frame.
+
+    Example:
+        with WorkerServer('127.0.0.1:0', worker=4) as server:
+            Thread(target=server.serve_forever, daemon=True).start()
+
+            with RemoteExecutor([server.address]) as executor:
+                ParallelStream(range(10), executor=executor).map_concurrent(abs).as_seq()
+    """
+
+    def __init__(self, address: Address, worker: int = None, multiprocessing: bool = True,
+                 authkey: bytes = None, preload: Sequence[str] = (), batch_size: int = BATCH_SIZE,
+                 insecure: bool = False):
+        """
+        Jobs are arbitrary pickled code, so "authkey" is required unless daemon
+        listens on a Unix socket or a loopback address, or "insecure" is True.
+
+        :param address: "host:port" (port 0 for a free port), "unix:path" or (host, port).
+        :param worker: number of worker; if None then number of cpu is used.
+        :param multiprocessing: it True then multiprocessing is used else multiThreading.
+        :param authkey: if given, clients have to authenticate with it.
+        :param preload: name of modules to be imported in each worker on its start.
+        :param batch_size: maximum number of results in a frame.
+        :param insecure: if True, daemon listens on any address without "authkey".
+        """
+
+        address = parse_address(address)
+
+        if authkey is None and not insecure and not _is_loopback(address):
+            raise ValueError('authkey is required to listen on {}, as jobs run arbitrary code; '
+                             'pass insecure=True to listen without it.'.format(address))
+
+        self._worker = worker or os.cpu_count()
+        # workers are started before accepting connections, so that they do not inherit them.
+        self._pool = WorkerPool(self._worker, multiprocessing=multiprocessing, preload=preload)
+        self._listener = Listener(address, authkey=authkey)
+        self._batch_size = batch_size
+        self._closed = False
+
+    @property
+    def address(self) -> Address:
+        """
+        address on which daemon listens.
+        """
+
+        address = self._listener.address
+
+        return address if isinstance(address, tuple) else 'unix:' + address
+
+    @property
+    def worker(self) -> int:
+        return self._worker
+
+    def serve_forever(self):
+        """
+        accepts connections till daemon is closed.
+        """
+
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:  # listener is closed
+                break
+
+            Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: Connection):
+        """
+        serves a client till it says goodbye or disconnects.
+        """
+
+        results = SimpleQueue()
+        sender = Thread(target=self._send, args=(conn, results), daemon=True)
+
+        try:
+            conn.send_bytes(_dump(self._worker))
+            sender.start()
+
+            while True:
+                frame = loads(conn.recv_bytes())
+
+                if frame is None:
+                    break
+
+                for job_id, payload in frame:
+                    self._submit(job_id, payload, results)
+        except (EOFError, OSError):
+            pass
+        finally:
+            results.put(_STOP)
+
+            if sender.is_alive():
+                sender.join()
+
+            _hang_up(conn)
+
+    def _submit(self, job_id: int, payload: bytes, results: SimpleQueue):
+        def done(job: Future):
+            e = job.exception()
+            results.put((job_id, job.result() if e is None else _dump((False, e))))
+
+        try:
+            self._pool.executor.submit(execute, payload).add_done_callback(done)
+        except RuntimeError as e:  # executor is shut down
+            results.put((job_id, _dump((False, e))))
+
+    def _send(self, conn: Connection, results: SimpleQueue):
+        while True:
+            frame = [results.get()]
+
+            while len(frame) < self._batch_size:
+                try:
+                    frame.append(results.get_nowait())
+                except Empty:
+                    break
+
+            stop = _STOP in frame
+            frame = [result for result in frame if result is not _STOP]
+
+            try:
+                if frame:
+                    conn.send_bytes(_dump(frame))
+            except (OSError, ValueError):
+                return
+
+            if stop:
+                return
+
+    def close(self):
+        """
+        stops accepting connections and shuts down workers.
+        """
+
+        if not self._closed:
+            self._closed = True
+            self._listener.close()
+            self._pool.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def serve(address: Address, worker: int = None, multiprocessing: bool = True,
+          authkey: bytes = None, preload: Sequence[str] = (), insecure: bool = False):
+    """
+    runs worker daemon at "address" till interrupted (see WorkerServer).
+
+    :param address:
+    :param worker:
+    :param multiprocessing:
+    :param authkey:
+    :param preload:
+    :param insecure:
+    """
+
+    with WorkerServer(address, worker=worker, multiprocessing=multiprocessing, authkey=authkey,
+                      preload=preload, insecure=insecure) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == 'streamAPI.worker.server':
+    __all__ = get_functions_clazz(__name__, __file__)